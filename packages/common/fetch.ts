@@ -1,6 +1,9 @@
 /* eslint-disable @typescript-eslint/no-explicit-any */
 
+import { formSchemas } from "./formSchemas";
 import { Metadata } from "./metadata";
+import { PatchOperation } from "./patch";
+import { ViewAssets } from "./preload";
 
 export type MessageLevel = "info" | "success" | "warning" | "error";
 
@@ -30,7 +33,24 @@ interface RenderResponse {
   overlay: boolean;
   metadata: Metadata;
   view: string;
-  props: Record<string, unknown>;
+  // If the server has a props diff cache, props is null when the response
+  // contains a patch against the version of the props sent by the client
+  props: Record<string, unknown> | null;
+  propsPatch?: PatchOperation[];
+  propsVersion?: string;
+  // True if the response only contains the props requested with "only"
+  partial?: boolean;
+  // The names of props that weren't sent, these are fetched separately
+  deferred?: string[];
+  // The code of the view, if the server knows which chunk implements it
+  assets?: ViewAssets;
+  // Number of seconds the frame can be shown from the client's cache on
+  // back/forward navigation, from the X-DjangoBridge-Frame-Cache-Max-Age header
+  frameCacheMaxAge?: number;
+  // The path of the view, if the server followed a redirect to it
+  path?: string;
+  // The URL of a stream of server-sent events about changes to the props
+  live?: string;
   context: Record<string, unknown>;
   messages: Message[];
 }
@@ -56,25 +76,34 @@ export type DjangoBridgeResponse =
   | ServerErrorResponse
   | NetworkErrorResponse;
 
-export async function djangoGet(
-  url: string,
-  overlay: boolean
-): Promise<DjangoBridgeResponse> {
-  let response: Response;
-
-  const headers: HeadersInit = { "X-Requested-With": "DjangoBridge" };
+function buildHeaders(
+  overlay: boolean,
+  loadedContext: string[],
+  extraHeaders: Record<string, string>
+): HeadersInit {
+  const headers: HeadersInit = {
+    "X-Requested-With": "DjangoBridge",
+    ...extraHeaders,
+  };
   if (overlay) {
     headers["X-DjangoBridge-Overlay"] = "true";
   }
-
-  try {
-    response = await fetch(url, { headers });
-  } catch (e) {
-    return {
-      action: "network-error",
-    };
+  if (loadedContext.length > 0) {
+    // Lets the server skip lazy context providers that we already have values for
+    headers["X-DjangoBridge-Context-Loaded"] = loadedContext.join(",");
+  }
+  if (formSchemas.size > 0) {
+    headers["X-DjangoBridge-Form-Schemas"] = Array.from(formSchemas.keys()).join(
+      ","
+    );
   }
 
+  return headers;
+}
+
+async function parseResponse(
+  response: Response
+): Promise<DjangoBridgeResponse> {
   if (response.status === 500) {
     return {
       action: "server-error",
@@ -85,26 +114,33 @@ export async function djangoGet(
       action: "reload",
     };
   }
-  return response.json() as Promise<DjangoBridgeResponse>;
+
+  const data = (await response.json()) as DjangoBridgeResponse;
+  const frameCacheMaxAge = response.headers.get(
+    "X-DjangoBridge-Frame-Cache-Max-Age"
+  );
+  if (data.action === "render" && frameCacheMaxAge) {
+    data.frameCacheMaxAge = Number(frameCacheMaxAge);
+  }
+  const path = response.headers.get("X-DjangoBridge-Path");
+  if (data.action === "render" && path) {
+    data.path = path;
+  }
+
+  return data;
 }
 
-export async function djangoPost(
+export async function djangoGet(
   url: string,
-  data: FormData,
-  overlay: boolean
+  overlay: boolean,
+  loadedContext: string[] = [],
+  extraHeaders: Record<string, string> = {}
 ): Promise<DjangoBridgeResponse> {
   let response: Response;
 
-  const headers: HeadersInit = { "X-Requested-With": "DjangoBridge" };
-  if (overlay) {
-    headers["X-DjangoBridge-Overlay"] = "true";
-  }
-
   try {
     response = await fetch(url, {
-      method: "post",
-      headers,
-      body: data,
+      headers: buildHeaders(overlay, loadedContext, extraHeaders),
     });
   } catch (e) {
     return {
@@ -112,15 +148,135 @@ export async function djangoPost(
     };
   }
 
-  if (response.status === 500) {
+  return parseResponse(response);
+}
+
+export interface PrefetchedResponse {
+  response: DjangoBridgeResponse;
+  // Number of seconds the response can be used for
+  ttl: number;
+  // True if the server has messages to show on the next page. These are left
+  // out of prefetched responses, so the page must be fetched again to get them
+  pendingMessages: boolean;
+}
+
+export async function djangoPrefetch(
+  url: string,
+  overlay: boolean,
+  loadedContext: string[] = []
+): Promise<PrefetchedResponse> {
+  let response: Response;
+
+  try {
+    response = await fetch(url, {
+      headers: buildHeaders(overlay, loadedContext, {
+        "X-DjangoBridge-Purpose": "prefetch",
+      }),
+    });
+  } catch (e) {
     return {
-      action: "server-error",
+      response: {
+        action: "network-error",
+      },
+      ttl: 0,
+      pendingMessages: false,
     };
   }
-  if (!response.headers.get("X-DjangoBridge-Action")) {
+
+  return {
+    response: await parseResponse(response),
+    ttl: Number(response.headers.get("X-DjangoBridge-Prefetch-TTL") || 0),
+    pendingMessages:
+      response.headers.get("X-DjangoBridge-Pending-Messages") === "1",
+  };
+}
+
+export interface BatchRequest {
+  url: string;
+  extraHeaders?: Record<string, string>;
+}
+
+interface BatchedResponse {
+  status: number;
+  headers: Record<string, string>;
+  body: unknown;
+}
+
+// Makes several GET requests in one round trip, using a BatchView at batchUrl
+// Only X-DjangoBridge-* headers can be sent with each request
+// BatchView is CSRF protected, so csrfToken must be the current CSRF token
+export async function djangoBatch(
+  batchUrl: string,
+  requests: BatchRequest[],
+  overlay: boolean,
+  csrfToken: string,
+  loadedContext: string[] = []
+): Promise<DjangoBridgeResponse[]> {
+  let response: Response;
+
+  try {
+    response = await fetch(batchUrl, {
+      method: "post",
+      headers: {
+        ...buildHeaders(overlay, loadedContext, {}),
+        "Content-Type": "application/json",
+        "X-CSRFToken": csrfToken,
+      },
+      body: JSON.stringify({
+        requests: requests.map(({ url, extraHeaders = {} }) => ({
+          path: url,
+          headers: extraHeaders,
+        })),
+      }),
+    });
+  } catch (e) {
+    return requests.map(() => ({
+      action: "network-error",
+    }));
+  }
+
+  if (!response.ok) {
+    return requests.map(() => ({
+      action: "server-error",
+    }));
+  }
+
+  const { responses } = (await response.json()) as {
+    responses: BatchedResponse[];
+  };
+
+  // Handle each response as if it had been fetched separately
+  return Promise.all(
+    responses.map(({ status, headers, body }) =>
+      parseResponse(
+        new Response(body === null ? null : JSON.stringify(body), {
+          status,
+          headers,
+        })
+      )
+    )
+  );
+}
+
+export async function djangoPost(
+  url: string,
+  data: FormData,
+  overlay: boolean,
+  loadedContext: string[] = []
+): Promise<DjangoBridgeResponse> {
+  let response: Response;
+
+  try {
+    response = await fetch(url, {
+      method: "post",
+      headers: buildHeaders(overlay, loadedContext, {}),
+      body: data,
+    });
+  } catch (e) {
     return {
-      action: "reload",
+      action: "network-error",
     };
   }
-  return response.json() as Promise<DjangoBridgeResponse>;
+
+  return parseResponse(response);
 }
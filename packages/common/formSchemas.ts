@@ -0,0 +1,4 @@
+// Form schemas that have been received from the server, keyed by their hash.
+// The server only sends the schema of a form if its hash isn't in here.
+// See CompiledFormMixin in django_bridge/adapters/forms.py
+export const formSchemas = new Map<string, unknown[]>();
@@ -3,7 +3,14 @@ export {
   type Message,
   djangoPost,
   djangoGet,
+  djangoPrefetch,
+  djangoBatch,
+  type BatchRequest,
   type DjangoBridgeResponse,
+  type PrefetchedResponse,
 } from "./fetch";
 export { type ShouldReloadCallback, type Frame } from "./frame";
+export { formSchemas } from "./formSchemas";
 export { type Metadata } from "./metadata";
+export { applyPatch, type PatchOperation } from "./patch";
+export { preloadAssets, type ViewAssets } from "./preload";
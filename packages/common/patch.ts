@@ -0,0 +1,50 @@
+/* eslint-disable @typescript-eslint/no-explicit-any */
+
+// Applies JSON patches generated by django_bridge/patch.py
+// Only the "add", "remove" and "replace" operations are supported
+
+export interface PatchOperation {
+  op: "add" | "remove" | "replace";
+  path: string;
+  value?: unknown;
+}
+
+function parsePointer(pointer: string): string[] {
+  return pointer
+    .split("/")
+    .slice(1)
+    .map((key) => key.replace(/~1/g, "/").replace(/~0/g, "~"));
+}
+
+export function applyPatch<T>(document: T, patch: PatchOperation[]): T {
+  // Don't modify the original document
+  let result: any = JSON.parse(JSON.stringify(document));
+
+  patch.forEach(({ op, path, value }) => {
+    const keys = parsePointer(path);
+    if (keys.length === 0) {
+      result = value;
+      return;
+    }
+
+    const key = keys.pop() as string;
+    const parent = keys.reduce((current, k) => current[k], result);
+
+    if (Array.isArray(parent)) {
+      const index = parseInt(key, 10);
+      if (op === "add") {
+        parent.splice(index, 0, value);
+      } else if (op === "remove") {
+        parent.splice(index, 1);
+      } else {
+        parent[index] = value;
+      }
+    } else if (op === "remove") {
+      delete parent[key];
+    } else {
+      parent[key] = value;
+    }
+  });
+
+  return result as T;
+}
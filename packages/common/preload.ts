@@ -0,0 +1,29 @@
+// Starts fetching the code of a view before it's rendered
+// The server sends the URLs of the view's chunks when VIEW_CHUNKS is set
+
+export interface ViewAssets {
+  js: string[];
+  css: string[];
+}
+
+const preloaded = new Set<string>();
+
+function addPreloadLink(href: string, rel: string, as?: string) {
+  if (preloaded.has(href)) {
+    return;
+  }
+  preloaded.add(href);
+
+  const link = document.createElement("link");
+  link.rel = rel;
+  link.href = href;
+  if (as) {
+    link.as = as;
+  }
+  document.head.appendChild(link);
+}
+
+export function preloadAssets(assets: ViewAssets) {
+  assets.js.forEach((href) => addPreloadLink(href, "modulepreload"));
+  assets.css.forEach((href) => addPreloadLink(href, "preload", "style"));
+}
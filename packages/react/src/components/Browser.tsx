@@ -32,6 +32,7 @@ function Browser({
     replacePath,
     submitForm,
     refreshProps,
+    prefetch,
     isNavigating,
   } = navigationController;
 
@@ -61,6 +62,7 @@ function Browser({
       submitForm,
       openOverlay,
       refreshProps,
+      prefetch,
       isNavigating,
       setShouldReloadCallback: (callback: ShouldReloadCallback) => {
         currentFrame.shouldReloadCallback = callback;
@@ -76,6 +78,7 @@ function Browser({
       cancelUnload,
       navigate,
       refreshProps,
+      prefetch,
       isNavigating,
     ]
   );
@@ -3,11 +3,20 @@ import { Navigation, NavigationContext } from "../contexts";
 
 export interface LinkProps extends React.HTMLProps<HTMLAnchorElement> {
   skipDirtyFormCheck?: boolean;
+  // Fetch the page before the link is clicked, either when the user hovers
+  // over (or focuses) the link, or when the link is scrolled into view
+  prefetch?: "hover" | "viewport";
 }
 
 export function buildLinkElement(
-  { children, href, skipDirtyFormCheck = false, ...props }: LinkProps,
-  { navigate }: Navigation,
+  {
+    children,
+    href,
+    skipDirtyFormCheck = false,
+    prefetch: prefetchOn,
+    ...props
+  }: LinkProps,
+  { navigate, prefetch }: Navigation,
   ref:
     | ((instance: HTMLAnchorElement | null) => void)
     | React.MutableRefObject<HTMLAnchorElement | null>
@@ -21,9 +30,22 @@ export function buildLinkElement(
     }
   };
 
+  const onIntent = () => {
+    if (href && prefetchOn === "hover") {
+      prefetch(href);
+    }
+  };
+
   return (
     // eslint-disable-next-line jsx-a11y/click-events-have-key-events, jsx-a11y/interactive-supports-focus
-    <a onClick={onClick} href={href || "#"} ref={ref} {...props}>
+    <a
+      onClick={onClick}
+      onMouseEnter={onIntent}
+      onFocus={onIntent}
+      href={href || "#"}
+      ref={ref}
+      {...props}
+    >
       {children}
     </a>
   );
@@ -37,12 +59,47 @@ const Link = React.forwardRef<
   React.AnchorHTMLAttributes<HTMLAnchorElement> & {
     // eslint-disable-next-line react/no-unused-prop-types
     skipDirtyFormCheck?: boolean;
+    // eslint-disable-next-line react/no-unused-prop-types
+    prefetch?: "hover" | "viewport";
   }
 >((props: LinkProps, ref): ReactElement => {
   const navigationContext = React.useContext(NavigationContext);
   const build = React.useContext(BuildLinkElement);
+  const { href, prefetch } = props;
+  const { prefetch: prefetchPath } = navigationContext;
+
+  // Keep our own reference to the element for prefetching on viewport
+  const element = React.useRef<HTMLAnchorElement | null>(null);
+  const setRef = React.useCallback(
+    (instance: HTMLAnchorElement | null) => {
+      element.current = instance;
+      if (typeof ref === "function") {
+        ref(instance);
+      } else if (ref) {
+        // eslint-disable-next-line no-param-reassign
+        ref.current = instance;
+      }
+    },
+    [ref]
+  );
+
+  React.useEffect(() => {
+    if (prefetch !== "viewport" || !href || !element.current) {
+      return () => {};
+    }
+
+    const observer = new IntersectionObserver((entries) => {
+      if (entries.some((entry) => entry.isIntersecting)) {
+        prefetchPath(href);
+        observer.disconnect();
+      }
+    });
+    observer.observe(element.current);
+
+    return () => observer.disconnect();
+  }, [href, prefetch, prefetchPath]);
 
-  return build(props, navigationContext, ref);
+  return build(props, navigationContext, setRef);
 });
 
 export default Link;
@@ -6,6 +6,11 @@ export interface NavigateOptions {
   skipDirtyFormCheck?: boolean;
 }
 
+export interface RefreshPropsOptions {
+  // Only fetch these props, the rest are kept as-is
+  only?: string[];
+}
+
 export interface OpenOverlayOptions {
   onClose?: () => void;
 }
@@ -48,7 +53,8 @@ export interface Navigation {
     render: (content: ReactNode) => ReactNode,
     options?: OpenOverlayOptions
   ) => void;
-  refreshProps: () => Promise<void>;
+  refreshProps: (options?: RefreshPropsOptions) => Promise<void>;
+  prefetch: (path: string) => void;
   isNavigating: boolean;
   setShouldReloadCallback: (callback: ShouldReloadCallback) => void;
 }
@@ -87,6 +93,10 @@ export const NavigationContext = React.createContext<Navigation>({
 
     return Promise.resolve();
   },
+  prefetch: () => {
+    // eslint-disable-next-line no-console
+    console.error("prefetch() called from outside a Django Bridge Browser");
+  },
   isNavigating: false,
   setShouldReloadCallback: () => {},
 });
@@ -4,9 +4,16 @@ import { NavigationContext } from "./contexts";
 
 export type Timer = ReturnType<typeof setTimeout>;
 
-export function useAutoRefresh(enabled: boolean, interval: number) {
+export function useAutoRefresh(
+  enabled: boolean,
+  interval: number,
+  only?: string[]
+) {
   const { refreshProps } = React.useContext(NavigationContext);
 
+  // Compare by value, so callers can pass a new array on every render
+  const onlyKey = only?.join(",");
+
   React.useEffect(() => {
     if (!enabled) {
       return () => {};
@@ -17,7 +24,7 @@ export function useAutoRefresh(enabled: boolean, interval: number) {
     const scheduleRefreshProps = () => {
       timeout = setTimeout(() => {
         // eslint-disable-next-line no-void
-        void refreshProps();
+        void refreshProps({ only: onlyKey?.split(",") });
 
         scheduleRefreshProps();
       }, interval);
@@ -30,7 +37,7 @@ export function useAutoRefresh(enabled: boolean, interval: number) {
         clearTimeout(timeout);
       }
     };
-  }, [enabled, interval, refreshProps]);
+  }, [enabled, interval, onlyKey, refreshProps]);
 }
 
 export function useShouldReloadCallback(
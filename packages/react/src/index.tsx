@@ -3,7 +3,9 @@ import React, { ReactElement, ReactNode } from "react";
 import {
   Message,
   DjangoBridgeResponse,
+  djangoBatch,
   djangoGet,
+  formSchemas,
   Metadata,
   Frame,
 } from "@common";
@@ -230,5 +232,7 @@ export { type NavigationController } from "./navigation";
 export type { Frame, Message, DjangoBridgeResponse as Response, Metadata };
 export { Link, BuildLinkElement, buildLinkElement };
 export { Config };
+export { formSchemas };
+export { djangoBatch };
 export { Form };
 export { RenderFrame };
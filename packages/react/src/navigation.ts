@@ -2,16 +2,53 @@
 
 import { useCallback, useEffect, useRef, useState } from "react";
 import {
+  applyPatch,
   djangoGet,
   djangoPost,
+  djangoPrefetch,
   DjangoBridgeResponse,
   Message,
   Frame,
   Metadata,
+  preloadAssets,
+  PrefetchedResponse,
 } from "@common";
+import { RefreshPropsOptions } from "./contexts";
 
 let nextFrameId = 1;
 
+// The number of frames kept for back/forward navigation
+const FRAME_CACHE_SIZE = 10;
+
+interface CachedFrame {
+  expiresAt: number;
+  metadata: Metadata;
+  view: string;
+  props: Record<string, unknown>;
+  context: Record<string, unknown>;
+}
+
+// Converts a URL to a path on this site, or null if it's on another site
+function toPath(url: string): string | null {
+  if (url.startsWith("/")) {
+    return url;
+  }
+
+  const urlObj = new URL(url);
+  if (urlObj.origin !== window.location.origin) {
+    return null;
+  }
+
+  return urlObj.pathname + urlObj.search;
+}
+
+// A message published to one of the channels of the current view
+interface LiveMessage {
+  channel: string;
+  // The packed props that have changed, if the server sent them
+  props?: Record<string, unknown>;
+}
+
 interface HistoryState {
   prevPath?: string;
   prevScrollPosition?: number;
@@ -30,7 +67,8 @@ export interface NavigationController {
   navigate: (url: string, pushState?: boolean) => Promise<void>;
   replacePath: (frameId: number, path: string) => void;
   submitForm: (url: string, data: FormData) => Promise<void>;
-  refreshProps: () => Promise<void>;
+  refreshProps: (options?: RefreshPropsOptions) => Promise<void>;
+  prefetch: (url: string) => void;
   isNavigating: boolean;
   setIsNavigating: (isNavigating: boolean) => void;
 }
@@ -132,6 +170,23 @@ export function useNavigationController(
   );
 
   const [redirectTo, setRedirectTo] = useState<null | string>(null);
+  const [deferredProps, setDeferredProps] = useState<null | string[]>(null);
+
+  // The packed props of the current frame and their version
+  // refreshProps() sends the version so the server can reply with a patch
+  const packedProps = useRef<{
+    version: string;
+    props: Record<string, unknown>;
+  } | null>(null);
+
+  // Recently rendered frames that the server allows us to keep, keyed by path
+  // The least recently used frame is first
+  const frameCache = useRef(new Map<string, CachedFrame>());
+  const [revalidateFrame, setRevalidateFrame] = useState(false);
+
+  // The stream of changes to the props of the current view, if it has one
+  const [liveUrl, setLiveUrl] = useState<string | null>(null);
+  const [liveMessages, setLiveMessages] = useState<LiveMessage[]>([]);
 
   const handleResponse = useCallback(
     (
@@ -154,6 +209,35 @@ export function useNavigationController(
         setRedirectTo(response.path);
         return Promise.resolve();
       } else if (response.action === "render") {
+        if (response.assets) {
+          // Start fetching the view's code while we unpack the response
+          preloadAssets(response.assets);
+        }
+
+        // The server replies with an empty patch if the props haven't changed
+        // Keep the existing props so views don't re-render unnecessarily
+        const propsUnchanged =
+          response.propsPatch?.length === 0 &&
+          response.view === currentFrame.view;
+
+        if (response.propsPatch) {
+          if (!packedProps.current) {
+            // We no longer have the props the patch applies to (for example,
+            // we navigated while the refresh was in flight), so refetch the
+            // full props instead
+            setRevalidateFrame(true);
+            return Promise.resolve();
+          }
+
+          // Reconstruct the full response so it can be escalated
+          // eslint-disable-next-line no-param-reassign
+          response = {
+            ...response,
+            props: applyPatch(packedProps.current.props, response.propsPatch),
+            propsPatch: undefined,
+          };
+        }
+
         // If this navigation controller is handling an overlay, make sure the response can be
         // loaded in a overlay. Otherwise, escalate it to parent
         if (parent && !response.overlay) {
@@ -171,9 +255,38 @@ export function useNavigationController(
           return r;
         }
 
+        // Partial responses are merged into the current props below, so the
+        // packed props we have are still the latest full version
+        if (response.propsVersion) {
+          packedProps.current = {
+            version: response.propsVersion,
+            props: response.props as Record<string, unknown>,
+          };
+        } else if (!response.partial) {
+          packedProps.current = null;
+        }
+
         // Unpack props and context
-        const props = unpack(response.props);
-        const context = unpack(response.context);
+        // Lazy context providers are omitted by the server if we already have
+        // their values, so keep the existing values for those
+        let props = propsUnchanged
+          ? currentFrame.props
+          : unpack(response.props as Record<string, unknown>);
+        if (response.partial) {
+          props = { ...currentFrame.props, ...props };
+        } else if (response.deferred && response.view === currentFrame.view) {
+          // Keep showing the previous values of deferred props until the new
+          // ones have been fetched
+          response.deferred.forEach((name) => {
+            if (name in currentFrame.props) {
+              props[name] = currentFrame.props[name];
+            }
+          });
+        }
+        const context = {
+          ...currentFrame.context,
+          ...unpack(response.context),
+        };
 
         // If the view is the same as the current frame, check if the frame has a shouldReloadCallback registered.
         // If it does, call it to see if we should reload the view or just update its props
@@ -186,6 +299,30 @@ export function useNavigationController(
           reload = currentFrame.shouldReloadCallback(path, props);
         }
 
+        if (!response.partial) {
+          setLiveUrl(response.live ?? null);
+        }
+
+        if (!parent) {
+          // Remember the frame for back/forward navigation
+          frameCache.current.delete(path);
+          if (response.frameCacheMaxAge) {
+            frameCache.current.set(path, {
+              expiresAt: Date.now() + response.frameCacheMaxAge * 1000,
+              metadata: response.metadata,
+              view: response.view,
+              props,
+              context,
+            });
+
+            if (frameCache.current.size > FRAME_CACHE_SIZE) {
+              frameCache.current.delete(
+                frameCache.current.keys().next().value as string
+              );
+            }
+          }
+        }
+
         pushFrame(
           path,
           response.metadata,
@@ -196,6 +333,11 @@ export function useNavigationController(
           pushState,
           reload
         );
+
+        if (response.deferred && response.deferred.length > 0) {
+          // HACK: Fetched by an effect, as refreshProps() needs the new frame
+          setDeferredProps(response.deferred);
+        }
       } else if (response.action === "close-overlay") {
         // Call overlay close callback
         if (callbacks.onOverlayClose) {
@@ -236,51 +378,145 @@ export function useNavigationController(
       const thisFetchId = nextFetchId.current;
       isFetchInProgress.current = true;
 
-      const response = await fetcher();
+      try {
+        const response = await fetcher();
 
-      if (thisFetchId < lastReceivedFetchId.current) {
-        // A subsequent fetch was made but its response came in before this one
-        // So ignore this response
-        return;
+        if (thisFetchId < lastReceivedFetchId.current) {
+          // A subsequent fetch was made but its response came in before this
+          // one, so ignore this response
+          return;
+        }
+
+        lastReceivedFetchId.current = thisFetchId;
+
+        if (response === null) {
+          return;
+        }
+
+        // If the server followed a redirect, the response is for another path
+        await handleResponse(
+          response,
+          response.action === "render" && response.path ? response.path : url,
+          pushState,
+          neverReload
+        );
+      } finally {
+        // Leave the flag set if a newer fetch is still in progress
+        if (thisFetchId === nextFetchId.current) {
+          isFetchInProgress.current = false;
+        }
       }
+    },
+    [handleResponse]
+  );
 
-      lastReceivedFetchId.current = thisFetchId;
+  // Responses fetched by prefetch(), keyed by path
+  const prefetched = useRef(
+    new Map<
+      string,
+      { requestedAt: number; response: Promise<PrefetchedResponse> }
+    >()
+  );
 
-      if (response === null) {
+  const prefetch = useCallback(
+    (url: string) => {
+      const path = toPath(url);
+      if (!path || prefetched.current.has(path)) {
         return;
       }
 
-      await handleResponse(response, url, pushState, neverReload);
+      const entry = {
+        requestedAt: Date.now(),
+        response: djangoPrefetch(
+          path,
+          !!parent,
+          Object.keys(currentFrame.context)
+        ),
+      };
+      prefetched.current.set(path, entry);
 
-      isFetchInProgress.current = false;
+      // Forget the response once it has expired, so it can be prefetched again
+      // eslint-disable-next-line no-void
+      void entry.response.then(({ ttl }) => {
+        setTimeout(() => {
+          if (prefetched.current.get(path) === entry) {
+            prefetched.current.delete(path);
+          }
+        }, ttl * 1000);
+      });
     },
-    [handleResponse]
+    [currentFrame.context, parent]
   );
 
   const navigate = useCallback(
     (url: string, pushState = true): Promise<void> => {
-      let path = url;
+      const path = toPath(url);
+      if (!path) {
+        window.location.href = url;
+        return Promise.resolve();
+      }
 
-      if (!url.startsWith("/")) {
-        const urlObj = new URL(url);
+      // On back/forward navigation, show the frame from the cache straight
+      // away and then fetch the latest version of it in the background
+      const cached = pushState ? undefined : frameCache.current.get(path);
+      if (cached) {
+        frameCache.current.delete(path);
+      }
+      if (cached && cached.expiresAt > Date.now()) {
+        // Mark the frame as the most recently used
+        frameCache.current.set(path, cached);
 
-        if (urlObj.origin !== window.location.origin) {
-          window.location.href = url;
-          return Promise.resolve();
-        }
+        // Ignore the responses of any fetches that are still in progress
+        nextFetchId.current += 1;
+        lastReceivedFetchId.current = nextFetchId.current;
 
-        path = urlObj.pathname + urlObj.search;
+        packedProps.current = null;
+        pushFrame(
+          path,
+          cached.metadata,
+          cached.view,
+          cached.props,
+          cached.context,
+          [],
+          false
+        );
+
+        // HACK: Fetched by an effect, as the fetch needs the new frame
+        setRevalidateFrame(true);
+        return Promise.resolve();
       }
 
       setIsNavigating(true);
 
-      return fetch(() => djangoGet(path, !!parent), path, pushState).finally(
+      // Use the prefetched response for this path, if there is one
+      // Prefetched responses are only used once
+      const entry = prefetched.current.get(path);
+      prefetched.current.delete(path);
+
+      const fetcher = () =>
+        djangoGet(path, !!parent, Object.keys(currentFrame.context));
+
+      return fetch(
+        entry
+          ? () =>
+              entry.response.then(({ response, ttl, pendingMessages }) =>
+                Date.now() - entry.requestedAt < ttl * 1000 &&
+                !pendingMessages &&
+                response.action !== "server-error" &&
+                response.action !== "network-error"
+                  ? response
+                  : fetcher()
+              )
+          : fetcher,
+        path,
+        pushState
+      ).finally(
         () => {
           setIsNavigating(false);
         }
       );
     },
-    [fetch, parent]
+    [currentFrame.context, fetch, parent, pushFrame]
   );
 
   const replacePath = useCallback(
@@ -300,24 +536,56 @@ export function useNavigationController(
   );
 
   const submitForm = useCallback(
-    (url: string, data: FormData): Promise<void> =>
-      fetch(() => djangoPost(url, data, !!parent), url, true),
-    [fetch, parent]
+    (url: string, data: FormData): Promise<void> => {
+      // The data of prefetched and cached pages may be changed by this
+      prefetched.current.clear();
+      frameCache.current.clear();
+
+      return fetch(
+        () =>
+          djangoPost(url, data, !!parent, Object.keys(currentFrame.context)),
+        url,
+        true
+      );
+    },
+    [currentFrame.context, fetch, parent]
   );
 
-  const refreshProps = useCallback((): Promise<void> => {
-    // Only make a new fetch request if there is not a fetch request currently in progress
-    if (isFetchInProgress.current) {
-      return Promise.resolve();
-    }
+  const refreshProps = useCallback(
+    ({ only }: RefreshPropsOptions = {}): Promise<void> => {
+      // Only make a new fetch request if there is not a fetch request currently in progress
+      if (isFetchInProgress.current) {
+        return Promise.resolve();
+      }
 
-    return fetch(
-      () => djangoGet(currentFrame.path, !!parent),
-      currentFrame.path,
-      false,
-      true
-    );
-  }, [currentFrame.path, fetch, parent]);
+      let headers: Record<string, string> = {};
+      if (only) {
+        // The server only sends these props if we're still on the same view
+        headers = {
+          "X-DjangoBridge-Only": only.join(","),
+          "X-DjangoBridge-View": currentFrame.view,
+        };
+      } else if (packedProps.current) {
+        headers = {
+          "X-DjangoBridge-Props-Version": packedProps.current.version,
+        };
+      }
+
+      return fetch(
+        () =>
+          djangoGet(
+            currentFrame.path,
+            !!parent,
+            Object.keys(currentFrame.context),
+            headers
+          ),
+        currentFrame.path,
+        false,
+        true
+      );
+    },
+    [currentFrame.context, currentFrame.path, currentFrame.view, fetch, parent]
+  );
 
   useEffect(() => {
     // Load initial response
@@ -325,6 +593,92 @@ export function useNavigationController(
     void handleResponse(initialResponse, initialPath, false, false, true);
   }, []); // eslint-disable-line react-hooks/exhaustive-deps
 
+  useEffect(() => {
+    if (deferredProps) {
+      setDeferredProps(null);
+      // eslint-disable-next-line no-void
+      void refreshProps({ only: deferredProps });
+    }
+  }, [deferredProps, refreshProps]);
+
+  useEffect(() => {
+    if (revalidateFrame) {
+      setRevalidateFrame(false);
+      // eslint-disable-next-line no-void
+      void fetch(
+        () =>
+          djangoGet(
+            currentFrame.path,
+            !!parent,
+            Object.keys(currentFrame.context)
+          ),
+        currentFrame.path,
+        false,
+        true
+      );
+    }
+  }, [currentFrame.context, currentFrame.path, fetch, parent, revalidateFrame]);
+
+  useEffect(() => {
+    if (!liveUrl) {
+      return undefined;
+    }
+
+    const source = new EventSource(liveUrl);
+    source.onmessage = (event: MessageEvent<string>) => {
+      // HACK: Handled by an effect, as this needs the current frame
+      const message = JSON.parse(event.data) as LiveMessage;
+      setLiveMessages((messages) => [...messages, message]);
+    };
+
+    return () => {
+      source.close();
+    };
+  }, [liveUrl]);
+
+  useEffect(() => {
+    if (liveMessages.length === 0) {
+      return;
+    }
+    setLiveMessages([]);
+
+    // Messages without props only tell us that the props have changed
+    // Props are packed separately for each message, so if several messages
+    // arrived at once, fetch all of the props again instead of merging them
+    const [message] = liveMessages;
+    if (liveMessages.length > 1 || !message.props) {
+      // eslint-disable-next-line no-void
+      void refreshProps();
+      return;
+    }
+
+    // Merge the props that were sent into the current ones
+    // eslint-disable-next-line no-void
+    void handleResponse(
+      {
+        action: "render",
+        overlay: !!parent,
+        metadata: currentFrame.metadata,
+        view: currentFrame.view,
+        props: message.props,
+        partial: true,
+        context: {},
+        messages: [],
+      },
+      currentFrame.path,
+      false,
+      true
+    );
+  }, [
+    currentFrame.metadata,
+    currentFrame.path,
+    currentFrame.view,
+    handleResponse,
+    liveMessages,
+    parent,
+    refreshProps,
+  ]);
+
   useEffect(() => {
     if (redirectTo) {
       setRedirectTo(null);
@@ -342,6 +696,7 @@ export function useNavigationController(
     replacePath,
     submitForm,
     refreshProps,
+    prefetch,
     isNavigating,
     setIsNavigating,
   };
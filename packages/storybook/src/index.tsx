@@ -71,6 +71,7 @@ export function OverrideLinks({
       submitForm: navigate,
       openOverlay: navigate,
       refreshProps: () => Promise.resolve(),
+      prefetch: () => {},
       isNavigating: false,
       setShouldReloadCallback: () => {},
     }),
@@ -1,10 +1,17 @@
+import hashlib
+import json
+import weakref
 from datetime import date, datetime, time
 
 from django import forms
 
 from django.core.files import File
+from django.forms.models import ModelChoiceIterator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.translation import get_language
 
-from .registry import Adapter, register, registry
+from ..packing import get_packing_request
+from .registry import Adapter, Prepacked, register, registry
 
 
 class FieldWithName:
@@ -13,9 +20,32 @@ class FieldWithName:
         self.field = field
 
 
+def is_client_rendered(field):
+    """
+    Returns True if the widget of the given bound field can be rendered on the client.
+    """
+    return registry.find_adapter(field.field.widget.__class__) is not None
+
+
+def get_field_value(field):
+    """
+    Returns the value of the given bound field, ready to be packed.
+    """
+    value = field.value()
+
+    if isinstance(value, (datetime, date, time)):
+        value = value.isoformat()
+
+    # Pack any file simply as a string that contains its path
+    if isinstance(value, File):
+        value = str(value)
+
+    return value
+
+
 class FieldAdapter(Adapter):
     def pack(self, field, context):
-        if registry.find_adapter(field.field.field.widget.__class__) is None:
+        if not is_client_rendered(field.field):
             # Field widget is not adaptable, render the widget on the server
             return (
                 "forms.ServerRenderedField",
@@ -30,15 +60,6 @@ class FieldAdapter(Adapter):
             )
 
         # Render widget on the client
-        value = field.field.value()
-
-        if isinstance(value, (datetime, date, time)):
-            value = value.isoformat()
-
-        # Pack any file simply as a string that contains its path
-        if isinstance(value, File):
-            value = str(value)
-
         return (
             "forms.Field",
             [
@@ -48,7 +69,7 @@ class FieldAdapter(Adapter):
                 field.field.field.disabled,
                 field.field.field.widget,
                 field.field.help_text,
-                value,
+                get_field_value(field.field),
             ],
         )
 
@@ -69,3 +90,204 @@ class FormAdapter(Adapter):
 
 
 register(FormAdapter(), forms.BaseForm)
+
+
+class RemoteSelect(forms.Select):
+    """
+    A select widget that loads its choices from a URL (usually a
+    RemoteChoicesView) as the user searches, rather than including all of
+    them in the response.
+
+    Only the selected value is packed, this makes it suitable for choice
+    fields over large tables, such as a ModelChoiceField.
+    """
+
+    def __init__(self, url, attrs=None):
+        super().__init__(attrs)
+        self.url = url
+
+
+class RemoteSelectMultiple(RemoteSelect, forms.SelectMultiple):
+    """
+    A multiple select version of RemoteSelect.
+    """
+
+
+class RemoteSelectAdapter(Adapter):
+    js_constructor = "forms.RemoteSelect"
+
+    def js_args(self, widget):
+        # Note: widget.choices must not be accessed here
+        return [
+            str(widget.url),
+            widget.allow_multiple_selected,
+            widget.attrs.get("class", ""),
+        ]
+
+
+register(RemoteSelectAdapter(), RemoteSelect)
+
+
+class CompiledFormMixin:
+    """
+    A mixin for forms that packs the static parts of the form (field order,
+    labels, widgets, choices, etc) into a schema that's compiled once per
+    form class.
+
+    The schema is only sent to clients that don't have it yet, all other
+    responses only contain the schema's hash, the field values and errors.
+
+    Fields with choices that are fetched from the database (such as
+    ModelChoiceField) are left out of the schema and sent in full with the
+    values, so their choices are always up to date.
+
+    Fields must not be changed on form instances (for example, by setting a
+    queryset or label in ``__init__``), as those changes would not be
+    reflected in the schema.
+    """
+
+
+def has_queryset_choices(field):
+    """
+    Returns True if the widget of the given bound field packs choices that
+    are fetched from a queryset, so they may be different on every request.
+    """
+    widget = field.field.widget
+    if isinstance(widget, RemoteSelect):
+        # The choices are fetched by the client
+        return False
+
+    return isinstance(getattr(widget, "choices", None), ModelChoiceIterator)
+
+
+def is_in_schema(field):
+    """
+    Returns True if the given bound field is packed into the schema of a
+    compiled form. Other fields are sent in full with the values.
+    """
+    return is_client_rendered(field) and not has_queryset_choices(field)
+
+
+class FieldSchema(FieldWithName):
+    pass
+
+
+class FieldSchemaAdapter(Adapter):
+    js_constructor = "forms.Field"
+
+    def js_args(self, field):
+        return [
+            field.name,
+            field.field.label,
+            field.field.field.required,
+            field.field.field.disabled,
+            field.field.field.widget,
+            field.field.help_text,
+            None,
+        ]
+
+
+register(FieldSchemaAdapter(), FieldSchema)
+
+
+def namespace_ids(data, namespace):
+    """
+    Prefixes all telepath IDs and references in the given packed data so
+    they can't clash with the IDs used by the rest of the response.
+    """
+    if isinstance(data, list):
+        return [namespace_ids(item, namespace) for item in data]
+
+    if isinstance(data, dict):
+        if "_val" in data:
+            # Values are sent as-is, but they may still be given an ID if
+            # they're repeated (for example, a long help text)
+            if "_id" in data:
+                return {**data, "_id": f"{namespace}:{data['_id']}"}
+
+            return data
+
+        return {
+            key: (
+                f"{namespace}:{value}"
+                if key in ("_id", "_ref")
+                else namespace_ids(value, namespace)
+            )
+            for key, value in data.items()
+        }
+
+    return data
+
+
+def get_known_form_schemas():
+    """
+    Returns the hashes of the form schemas the client already has.
+    """
+    request = get_packing_request()
+    if request is None:
+        return set()
+
+    header = request.headers.get("X-DjangoBridge-Form-Schemas", "")
+    return {schema_hash.strip() for schema_hash in header.split(",")}
+
+
+class CompiledFormAdapter(Adapter):
+    js_constructor = "forms.CompiledForm"
+
+    def __init__(self):
+        # Form class -> {(prefix, language): (schema_hash, schema)}
+        self.schemas = weakref.WeakKeyDictionary()
+
+    def compile_schema(self, form):
+        """
+        Packs the static parts of the form's fields.
+
+        Server-rendered fields are represented with None, as the HTML of
+        their widgets includes the value. These are sent in full with the
+        values instead, along with fields that have choices from a queryset.
+        """
+        schema = registry.js_context_class().pack(
+            [
+                FieldSchema(form[name].html_name, form[name])
+                if is_in_schema(form[name])
+                else None
+                for name in form.fields.keys()
+            ]
+        )
+
+        schema_hash = hashlib.sha256(
+            json.dumps(schema, cls=DjangoJSONEncoder, sort_keys=True).encode()
+        ).hexdigest()[:16]
+
+        return schema_hash, Prepacked(namespace_ids(schema, schema_hash))
+
+    def get_schema(self, form):
+        class_schemas = self.schemas.setdefault(type(form), {})
+        key = (form.prefix, get_language())
+
+        try:
+            return class_schemas[key]
+        except KeyError:
+            schema = class_schemas[key] = self.compile_schema(form)
+            return schema
+
+    def js_args(self, form):
+        schema_hash, schema = self.get_schema(form)
+
+        values = []
+        for name in form.fields.keys():
+            field = form[name]
+            if is_in_schema(field):
+                values.append(get_field_value(field))
+            else:
+                values.append(FieldWithName(field.html_name, field))
+
+        return [
+            schema_hash,
+            None if schema_hash in get_known_form_schemas() else schema,
+            values,
+            form.errors,
+        ]
+
+
+register(CompiledFormAdapter(), CompiledFormMixin)
@@ -1,7 +1,8 @@
+import weakref
 from datetime import datetime
 
 from django import forms
-from telepath import Adapter, AdapterRegistry, JSContextBase
+from telepath import Adapter, AdapterRegistry, BaseAdapter, JSContextBase, Node
 
 
 class CustomJSContextBase(JSContextBase):
@@ -11,9 +12,46 @@ class CustomJSContextBase(JSContextBase):
         return forms.Media()
 
 
+class AdapterMapping(dict):
+    """
+    The mapping of classes to adapters in a registry.
+
+    Clears the registry's lookup cache whenever an adapter is registered.
+    """
+
+    def __init__(self, adapters, cache):
+        super().__init__(adapters)
+        self.cache = cache
+
+    def __setitem__(self, cls, adapter):
+        super().__setitem__(cls, adapter)
+        self.cache.clear()
+
+    def __delitem__(self, cls):
+        super().__delitem__(cls)
+        self.cache.clear()
+
+
 class CustomAdapterRegistry(AdapterRegistry):
     js_context_base_class = CustomJSContextBase
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Caches the result of find_adapter() for each class, including
+        # classes that don't have an adapter. Weak keys make sure that classes
+        # that are created dynamically (eg, by modelform_factory) can still be
+        # garbage collected
+        self.find_adapter_cache = weakref.WeakKeyDictionary()
+        self.adapters = AdapterMapping(self.adapters, self.find_adapter_cache)
+
+    def find_adapter(self, cls):
+        try:
+            return self.find_adapter_cache[cls]
+        except KeyError:
+            adapter = self.find_adapter_cache[cls] = super().find_adapter(cls)
+            return adapter
+
 
 registry = CustomAdapterRegistry()
 
@@ -30,3 +68,33 @@ class DateTimeAdapter(Adapter):
 
 
 register(DateTimeAdapter(), datetime)
+
+
+class Prepacked:
+    """
+    Wraps a value that has already been packed, so it's sent to the client as-is.
+
+    The value must not contain any telepath IDs that could clash with the IDs
+    in the rest of the response.
+    """
+
+    def __init__(self, value):
+        self.value = value
+
+
+class PrepackedNode(Node):
+    def __init__(self, value):
+        super().__init__()
+        self.value = value
+        self.use_id = False
+
+    def emit_compact(self):
+        return self.value
+
+
+class PrepackedAdapter(BaseAdapter):
+    def build_node(self, obj, context):
+        return PrepackedNode(obj.value)
+
+
+register(PrepackedAdapter(), Prepacked)
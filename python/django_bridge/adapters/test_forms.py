@@ -1,6 +1,17 @@
-from django.forms import Form, CharField
-from .forms import FormAdapter
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.forms import (
+    Form,
+    CharField,
+    ModelChoiceField,
+    ModelMultipleChoiceField,
+    PasswordInput,
+    Select,
+    TextInput,
+)
+from .forms import CompiledFormMixin, FormAdapter, RemoteSelect, RemoteSelectMultiple
+from .registry import Adapter, register, registry
+from ..packing import packing_request
+from django.test import RequestFactory, TestCase
 
 
 class TestForm(Form):
@@ -30,3 +41,178 @@ class TestFormAdapter(TestCase):
         self.assertEqual(fields[1].name, "test_prefix-test_field_b")
         self.assertEqual(fields[2].name, "test_prefix-test_field_c")
         self.assertEqual(errors, {})
+
+
+class ClientRenderedInput(TextInput):
+    pass
+
+
+class ClientRenderedInputAdapter(Adapter):
+    js_constructor = "forms.TextInput"
+
+    def js_args(self, widget):
+        return []
+
+
+class ClientRenderedSelect(Select):
+    pass
+
+
+class ClientRenderedSelectAdapter(Adapter):
+    js_constructor = "forms.Select"
+
+    def js_args(self, widget):
+        return [[[str(value), str(label)] for value, label in widget.choices]]
+
+
+class TestCompiledForm(CompiledFormMixin, Form):
+    name = CharField(label="Name", initial="foo", widget=ClientRenderedInput)
+    secret = CharField(widget=PasswordInput)
+
+
+SHARED_HELP_TEXT = "Enter the value exactly as it appears on your statement."
+
+
+class TestCompiledSharedHelpTextForm(CompiledFormMixin, Form):
+    account = CharField(help_text=SHARED_HELP_TEXT, widget=ClientRenderedInput)
+    reference = CharField(help_text=SHARED_HELP_TEXT, widget=ClientRenderedInput)
+
+
+def unpack(data, ids=None):
+    """
+    Resolves the telepath IDs and references in packed data, like the
+    client's unpacker does.
+    """
+    if ids is None:
+        ids = {}
+
+    if isinstance(data, list):
+        return [unpack(item, ids) for item in data]
+
+    if isinstance(data, dict):
+        if "_ref" in data:
+            return ids[data["_ref"]]
+
+        if "_val" in data:
+            value = data["_val"]
+        else:
+            value = {
+                key: unpack(item, ids) for key, item in data.items() if key != "_id"
+            }
+
+        if "_id" in data:
+            ids[data["_id"]] = value
+
+        return value
+
+    return data
+
+
+class TestCompiledModelChoiceForm(CompiledFormMixin, Form):
+    user = ModelChoiceField(
+        User.objects.all(), required=False, widget=ClientRenderedSelect
+    )
+
+
+class TestCompiledFormAdapter(TestCase):
+    def setUp(self):
+        for adapter, cls in [
+            (ClientRenderedInputAdapter(), ClientRenderedInput),
+            (ClientRenderedSelectAdapter(), ClientRenderedSelect),
+        ]:
+            register(adapter, cls)
+            self.addCleanup(registry.adapters.__delitem__, cls)
+
+        # Schemas depend on which widgets have adapters
+        adapter = registry.find_adapter(TestCompiledForm)
+        adapter.schemas.clear()
+        self.addCleanup(adapter.schemas.clear)
+
+    def pack(self, form, known_schemas=""):
+        request = RequestFactory().get(
+            "/", HTTP_X_DJANGOBRIDGE_FORM_SCHEMAS=known_schemas
+        )
+        with packing_request(request):
+            return registry.js_context_class().pack(form)
+
+    def test_compiled_form(self):
+        packed = self.pack(TestCompiledForm(prefix="test"))
+        self.assertEqual(packed["_type"], "forms.CompiledForm")
+
+        schema_hash, schema, values, errors = packed["_args"]
+        self.assertEqual(len(schema), 2)
+        self.assertEqual(schema[0]["_type"], "forms.Field")
+        self.assertEqual(schema[0]["_args"][0], "test-name")
+        self.assertEqual(schema[0]["_args"][1], "Name")
+        self.assertIsNone(schema[0]["_args"][6])
+
+        # PasswordInput has no adapter, so it's rendered on the server
+        self.assertIsNone(schema[1])
+        self.assertEqual(values[0], "foo")
+        self.assertEqual(values[1]["_type"], "forms.ServerRenderedField")
+        self.assertEqual(errors, {})
+
+    def test_schema_is_compiled_once(self):
+        adapter = registry.find_adapter(TestCompiledForm)
+        schema = adapter.get_schema(TestCompiledForm())
+        self.assertIs(adapter.get_schema(TestCompiledForm()), schema)
+
+    def test_schema_is_omitted_if_known(self):
+        schema_hash = self.pack(TestCompiledForm())["_args"][0]
+
+        packed = self.pack(TestCompiledForm(data={"name": ""}), schema_hash)
+        self.assertEqual(packed["_args"][0], schema_hash)
+        self.assertIsNone(packed["_args"][1])
+        self.assertEqual(packed["_args"][2][0], "")
+        self.assertIn("name", packed["_args"][3])
+
+    def test_repeated_values_are_namespaced(self):
+        schema = self.pack(TestCompiledSharedHelpTextForm())["_args"][1]
+
+        fields = unpack(schema)
+        self.assertEqual(fields[0]["_args"][5], SHARED_HELP_TEXT)
+        self.assertEqual(fields[1]["_args"][5], SHARED_HELP_TEXT)
+
+    def test_queryset_choices_are_sent_with_values(self):
+        schema_hash, schema, values, errors = self.pack(
+            TestCompiledModelChoiceForm()
+        )["_args"]
+        self.assertEqual(schema, [None])
+        self.assertEqual(values[0]["_type"], "forms.Field")
+        self.assertEqual(values[0]["_args"][4]["_args"][0], [["", "---------"]])
+
+        user = User.objects.create(username="admin")
+
+        values = self.pack(TestCompiledModelChoiceForm(), schema_hash)["_args"][2]
+        self.assertEqual(
+            values[0]["_args"][4]["_args"][0],
+            [["", "---------"], [str(user.pk), "admin"]],
+        )
+
+
+class TestRemoteSelectAdapter(TestCase):
+    def test_choices_are_not_packed(self):
+        class UserForm(Form):
+            user = ModelChoiceField(
+                User.objects.all(), widget=RemoteSelect("/users/choices/")
+            )
+            users = ModelMultipleChoiceField(
+                User.objects.all(), widget=RemoteSelectMultiple("/users/choices/")
+            )
+
+        form = UserForm(initial={"user": 1, "users": [1, 2]})
+
+        with self.assertNumQueries(0):
+            packed = registry.js_context_class().pack(form)
+
+        user_field, users_field = packed["_args"][0]
+        self.assertEqual(
+            user_field["_args"][4],
+            {"_type": "forms.RemoteSelect", "_args": ["/users/choices/", False, ""]},
+        )
+        self.assertEqual(user_field["_args"][6], 1)
+        self.assertEqual(
+            users_field["_args"][4],
+            {"_type": "forms.RemoteSelect", "_args": ["/users/choices/", True, ""]},
+        )
+        self.assertEqual(users_field["_args"][6], [1, 2])
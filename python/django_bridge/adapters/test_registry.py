@@ -0,0 +1,48 @@
+from django.test import SimpleTestCase
+
+from .registry import Adapter, CustomAdapterRegistry
+
+
+class Animal:
+    pass
+
+
+class Dog(Animal):
+    pass
+
+
+class AnimalAdapter(Adapter):
+    js_constructor = "Animal"
+
+    def js_args(self, animal):
+        return []
+
+
+class DogAdapter(AnimalAdapter):
+    js_constructor = "Dog"
+
+
+class TestCustomAdapterRegistry(SimpleTestCase):
+    def setUp(self):
+        self.registry = CustomAdapterRegistry()
+
+    def test_find_adapter(self):
+        adapter = AnimalAdapter()
+        self.registry.register(adapter, Animal)
+
+        self.assertIs(self.registry.find_adapter(Dog), adapter)
+        self.assertIs(self.registry.find_adapter_cache[Dog], adapter)
+        self.assertIsNone(self.registry.find_adapter(object))
+        self.assertIn(object, self.registry.find_adapter_cache)
+
+    def test_register_invalidates_cache(self):
+        self.assertIsNone(self.registry.find_adapter(Dog))
+
+        animal_adapter = AnimalAdapter()
+        self.registry.register(animal_adapter, Animal)
+        self.assertIs(self.registry.find_adapter(Dog), animal_adapter)
+
+        # Class decorator form
+        dog_adapter = DogAdapter()
+        self.registry.register(adapter=dog_adapter)(Dog)
+        self.assertIs(self.registry.find_adapter(Dog), dog_adapter)
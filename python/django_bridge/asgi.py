@@ -0,0 +1,94 @@
+from asgiref.sync import sync_to_async
+from django.urls import Resolver404, resolve
+
+from .conf import get_config
+from .response import get_early_hint_links
+from .views import DjangoBridgeMixin
+
+EARLY_HINT_EXTENSION = "http.response.early_hint"
+
+
+def is_page_load(scope):
+    """
+    Returns True if the request is likely to be a full page load.
+    """
+    if scope["method"] != "GET":
+        return False
+
+    headers = dict(scope["headers"])
+    return (
+        headers.get(b"x-requested-with") != b"DjangoBridge"
+        and b"text/html" in headers.get(b"accept", b"")
+    )
+
+
+def get_path_info(scope):
+    path = scope["path"]
+    root_path = scope.get("root_path", "")
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path) :]
+
+    return path or "/"
+
+
+class EarlyHintsMiddleware:
+    """
+    ASGI middleware that sends a 103 Early Hints response with links to the
+    frontend assets before a full page load is handled by Django.
+
+    This only has an effect when EARLY_HINTS is set and the server supports
+    the "http.response.early_hint" extension (for example, Hypercorn).
+
+    Hints are only sent for paths that resolve to a DjangoBridgeView, or
+    that start with one of ``path_prefixes`` (for function-based views).
+
+    Wrap the ASGI application with this in your project's asgi.py:
+
+        application = EarlyHintsMiddleware(
+            get_asgi_application(), path_prefixes=["/app/"]
+        )
+    """
+
+    def __init__(self, app, path_prefixes=()):
+        self.app = app
+        self.path_prefixes = tuple(path_prefixes)
+
+    def get_view(self, path_info):
+        """
+        Returns a tuple of whether to send hints for the given path, and the
+        name of its view if it's known.
+        """
+        try:
+            match = resolve(path_info)
+        except Resolver404:
+            return False, None
+
+        view_class = getattr(match.func, "view_class", None)
+        if view_class is not None and issubclass(view_class, DjangoBridgeMixin):
+            return True, view_class.view_name
+
+        return path_info.startswith(self.path_prefixes), None
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] == "http"
+            and EARLY_HINT_EXTENSION in scope.get("extensions", {})
+            and is_page_load(scope)
+        ):
+            config = get_config()
+            if config.early_hints:
+                send_hints, view = self.get_view(get_path_info(scope))
+                if send_hints:
+                    # Loading the manifest reads a file, so keep it off the
+                    # event loop
+                    links = await sync_to_async(
+                        get_early_hint_links, thread_sensitive=False
+                    )(config, view)
+                    await send(
+                        {
+                            "type": EARLY_HINT_EXTENSION,
+                            "links": [link.encode() for link in links],
+                        }
+                    )
+
+        return await self.app(scope, receive, send)
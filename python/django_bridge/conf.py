@@ -1,10 +1,18 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.utils.module_loading import import_string
 
 from .adapters.registry import registry
+from .context_providers import BoundedExecutor, ContextProvider
+from .json_backends import JSONBackend
+from .live_backends import LocMemLiveBackend
+from .shell import BootstrapShellCache
 
 
 class DjangoBridgeConfig:
@@ -13,18 +21,56 @@ class DjangoBridgeConfig:
         *,
         framework="react",
         entry_point=None,
+        view_chunks=None,
         vite_bundle_dir=None,
         vite_devserver_url=None,
         bootstrap_template="django_bridge/bootstrap.html",
         context_providers=None,
+        context_provider_threads=0,
+        json_backend=None,
+        server_timing=False,
+        server_timing_header=True,
+        cacheable_responses=False,
+        props_diff_cache=None,
+        props_diff_timeout=300,
+        precompile_bootstrap_template=False,
+        stream_html=False,
+        early_hints=False,
+        prefetch_ttl=30,
+        frame_cache_max_age=0,
+        follow_redirects=False,
+        live_stream_url=None,
+        live_backend=None,
+        live_token_max_age=86400,
         adapter_registry=registry
     ):
         self.framework = framework
         self.entry_point = entry_point
+        self.view_chunks = view_chunks
         self.vite_bundle_dir = Path(vite_bundle_dir) if vite_bundle_dir else None
         self.vite_devserver_url = vite_devserver_url
         self.bootstrap_template = bootstrap_template
-        self.context_providers = context_providers or {}
+        self.context_providers = {
+            name: ContextProvider.wrap(provider)
+            for name, provider in (context_providers or {}).items()
+        }
+        self.context_provider_threads = context_provider_threads
+        self.json_backend = json_backend or JSONBackend()
+        self.server_timing = server_timing
+        self.server_timing_header = server_timing_header
+        self.cacheable_responses = cacheable_responses
+        self.props_diff_cache = props_diff_cache
+        self.props_diff_timeout = props_diff_timeout
+        self.precompile_bootstrap_template = precompile_bootstrap_template
+        self.stream_html = stream_html
+        self.early_hints = early_hints
+        self.prefetch_ttl = prefetch_ttl
+        self.frame_cache_max_age = frame_cache_max_age
+        self.follow_redirects = follow_redirects
+        self.live_stream_url = live_stream_url
+        self.live_backend = live_backend or LocMemLiveBackend()
+        self.live_token_max_age = live_token_max_age
+        self.bootstrap_shells = BootstrapShellCache()
         self.adapter_registry = adapter_registry
 
     @classmethod
@@ -32,6 +78,7 @@ class DjangoBridgeConfig:
         config = cls(
             framework=settings.DJANGO_BRIDGE.get("FRAMEWORK", "react"),
             entry_point=settings.DJANGO_BRIDGE.get("ENTRY_POINT", "src/main.tsx"),
+            view_chunks=settings.DJANGO_BRIDGE.get("VIEW_CHUNKS"),
             vite_bundle_dir=settings.DJANGO_BRIDGE.get("VITE_BUNDLE_DIR"),
             vite_devserver_url=settings.DJANGO_BRIDGE.get("VITE_DEVSERVER_URL"),
             context_providers=(
@@ -42,6 +89,40 @@ class DjangoBridgeConfig:
                     ).items()
                 }
             ),
+            context_provider_threads=settings.DJANGO_BRIDGE.get(
+                "CONTEXT_PROVIDER_THREADS", 0
+            ),
+            json_backend=import_string(
+                settings.DJANGO_BRIDGE.get(
+                    "JSON_BACKEND", "django_bridge.json_backends.JSONBackend"
+                )
+            )(),
+            server_timing=settings.DJANGO_BRIDGE.get("SERVER_TIMING", False),
+            server_timing_header=settings.DJANGO_BRIDGE.get(
+                "SERVER_TIMING_HEADER", True
+            ),
+            cacheable_responses=settings.DJANGO_BRIDGE.get(
+                "CACHEABLE_RESPONSES", False
+            ),
+            props_diff_cache=settings.DJANGO_BRIDGE.get("PROPS_DIFF_CACHE"),
+            props_diff_timeout=settings.DJANGO_BRIDGE.get("PROPS_DIFF_TIMEOUT", 300),
+            precompile_bootstrap_template=settings.DJANGO_BRIDGE.get(
+                "PRECOMPILE_BOOTSTRAP_TEMPLATE", False
+            ),
+            stream_html=settings.DJANGO_BRIDGE.get("STREAM_HTML", False),
+            early_hints=settings.DJANGO_BRIDGE.get("EARLY_HINTS", False),
+            prefetch_ttl=settings.DJANGO_BRIDGE.get("PREFETCH_TTL", 30),
+            frame_cache_max_age=settings.DJANGO_BRIDGE.get("FRAME_CACHE_MAX_AGE", 0),
+            follow_redirects=settings.DJANGO_BRIDGE.get("FOLLOW_REDIRECTS", False),
+            live_stream_url=settings.DJANGO_BRIDGE.get("LIVE_STREAM_URL"),
+            live_backend=import_string(
+                settings.DJANGO_BRIDGE.get(
+                    "LIVE_BACKEND", "django_bridge.live_backends.LocMemLiveBackend"
+                )
+            )(),
+            live_token_max_age=settings.DJANGO_BRIDGE.get(
+                "LIVE_TOKEN_MAX_AGE", 86400
+            ),
         )
 
         if not config.vite_bundle_dir and not config.vite_devserver_url:
@@ -51,6 +132,97 @@ class DjangoBridgeConfig:
 
         return config
 
+    def get_view_chunk(self, view):
+        """
+        Returns the name of the chunk in the Vite manifest that implements
+        the given view, if VIEW_CHUNKS is set.
+
+        VIEW_CHUNKS can either be a dict of view names to chunk names, or a
+        format string such as "src/views/{view}.tsx".
+        """
+        if isinstance(self.view_chunks, str):
+            return self.view_chunks.format(view=view)
+
+        if self.view_chunks is not None:
+            return self.view_chunks.get(view)
+
+        return None
+
+    @cached_property
+    def context_provider_executor(self):
+        """
+        The thread pool used to call sync context providers concurrently.
+
+        This is None unless CONTEXT_PROVIDER_THREADS is set.
+        """
+        if not self.context_provider_threads:
+            return None
+
+        return ThreadPoolExecutor(
+            max_workers=self.context_provider_threads,
+            thread_name_prefix="django-bridge-context",
+        )
+
+    @cached_property
+    def context_provider_timeout_executor(self):
+        """
+        The thread pool used to call sync context providers with a timeout.
+
+        This is separate from context_provider_executor, as providers that
+        time out keep their threads until they finish. It has the same number
+        of threads, and is None unless CONTEXT_PROVIDER_THREADS is set.
+        """
+        if not self.context_provider_threads:
+            return None
+
+        return BoundedExecutor(
+            max_workers=self.context_provider_threads,
+            thread_name_prefix="django-bridge-context-timeout",
+        )
+
     def pack(self, data):
         js_context = self.adapter_registry.js_context_class()
         return js_context.pack(data)
+
+    def pack_json(self, data, *, html_safe=False):
+        """
+        Packs the given data and serializes it to JSON bytes.
+
+        This is left to the JSON backend, so backends can serialize values as
+        they are packed rather than building the packed data first.
+        """
+        js_context = self.adapter_registry.js_context_class()
+        return self.json_backend.pack_and_dumps(data, js_context, html_safe=html_safe)
+
+
+_config = None
+
+
+def get_config():
+    """
+    Returns the DjangoBridgeConfig for the current settings.
+
+    The config is built once per process and reused, as building it imports
+    every context provider. It's reset whenever DJANGO_BRIDGE is changed
+    (for example, by override_settings in tests).
+    """
+    global _config
+
+    if _config is None:
+        _config = DjangoBridgeConfig.from_settings()
+
+    return _config
+
+
+@receiver(setting_changed)
+def reset_config(*, setting, **kwargs):
+    global _config
+
+    if setting == "DJANGO_BRIDGE":
+        # Only shut down the executors if they have been created
+        for name in ["context_provider_executor", "context_provider_timeout_executor"]:
+            executor = _config.__dict__.get(name) if _config is not None else None
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+        _config = None
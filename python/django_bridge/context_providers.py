@@ -0,0 +1,243 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import threading
+import time
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.db import close_old_connections
+
+from .timing import measure
+
+
+class ContextProvider:
+    """
+    Wraps a global context provider function with its execution options.
+
+    lazy: Only call the provider if the client doesn't already have its value.
+        The value is always sent on full page loads.
+    timeout: Number of seconds to wait for the value before using ``fallback``
+        instead. This only applies to async providers and to sync providers
+        when CONTEXT_PROVIDER_THREADS is set.
+    fallback: The value to use if the provider times out.
+    """
+
+    def __init__(self, func, *, lazy=False, timeout=None, fallback=None):
+        self.func = func
+        self.lazy = lazy
+        self.timeout = timeout
+        self.fallback = fallback
+
+    @classmethod
+    def wrap(cls, provider):
+        if isinstance(provider, cls):
+            return provider
+
+        return cls(provider)
+
+    @property
+    def is_async(self):
+        return iscoroutinefunction(self.func)
+
+    def __call__(self, request):
+        return self.func(request)
+
+
+def context_provider(func=None, *, lazy=False, timeout=None, fallback=None):
+    """
+    Decorator for setting execution options on a context provider function.
+
+    For example:
+
+        @context_provider(lazy=True)
+        def user(request):
+            ...
+    """
+
+    def decorator(func):
+        return ContextProvider(func, lazy=lazy, timeout=timeout, fallback=fallback)
+
+    if func is not None:
+        return decorator(func)
+
+    return decorator
+
+
+def get_loaded_context(request):
+    """
+    Returns the names of the context values the client already has.
+    """
+    header = request.headers.get("X-DjangoBridge-Context-Loaded", "")
+    return {name.strip() for name in header.split(",") if name.strip()}
+
+
+def select_providers(request, providers):
+    """
+    Returns the context providers that need to be called for the given request.
+
+    Lazy providers are skipped when the client already has their value.
+    """
+    loaded = get_loaded_context(request)
+    if not loaded:
+        return providers
+
+    return {
+        name: provider
+        for name, provider in providers.items()
+        if not (provider.lazy and name in loaded)
+    }
+
+
+def _measure_provider(name):
+    return measure(f"context-{name}", f"Context provider: {name}")
+
+
+async def _acall_provider(name, provider, request):
+    with _measure_provider(name):
+        if provider.timeout is None:
+            return await provider(request)
+
+        try:
+            return await asyncio.wait_for(provider(request), provider.timeout)
+        except asyncio.TimeoutError:
+            return provider.fallback
+
+
+async def acall_async_providers(request, providers):
+    """
+    Calls all async context providers concurrently and returns their values.
+
+    Sync providers are skipped, these are called by call_providers() instead.
+    """
+    async_providers = {
+        name: provider for name, provider in providers.items() if provider.is_async
+    }
+
+    values = await asyncio.gather(
+        *(
+            _acall_provider(name, provider, request)
+            for name, provider in async_providers.items()
+        )
+    )
+    return dict(zip(async_providers.keys(), values))
+
+
+def _call_provider(name, provider, request):
+    with _measure_provider(name):
+        return provider(request)
+
+
+def _call_provider_in_thread(name, provider, request):
+    # Each worker thread has its own database connections, make sure they
+    # are cleaned up the same way Django does at the start/end of requests
+    close_old_connections()
+    try:
+        return _call_provider(name, provider, request)
+    finally:
+        close_old_connections()
+
+
+class BoundedExecutor:
+    """
+    A thread pool that refuses new calls while all of its threads are busy,
+    rather than queueing them.
+
+    Used for sync providers with a timeout. A provider that times out can't
+    be stopped, so it keeps its thread until it finishes. If a dependency
+    hangs, at most ``max_workers`` threads are stuck on it, and further calls
+    get their fallback straight away.
+    """
+
+    def __init__(self, max_workers, thread_name_prefix=""):
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=thread_name_prefix
+        )
+        self.slots = threading.BoundedSemaphore(max_workers)
+
+    def try_submit(self, func, *args):
+        """
+        Calls the given function on a free thread, returning a Future for its
+        result. Returns None if all of the threads are busy.
+        """
+        if not self.slots.acquire(blocking=False):
+            return None
+
+        try:
+            future = self.executor.submit(func, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+
+        future.add_done_callback(lambda future: self.slots.release())
+        return future
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)
+
+
+def call_providers(
+    request, providers, resolved=None, *, executor=None, timeout_executor=None
+):
+    """
+    Returns the value of each context provider for the given request.
+
+    Values in ``resolved`` (usually the result of acall_async_providers())
+    are used as-is. Any remaining async providers are awaited concurrently.
+
+    If an ``executor`` is given, sync providers are run on it concurrently
+    and their timeouts are enforced. Otherwise, they are called one after
+    another in the current thread.
+
+    Providers with a timeout are run on ``timeout_executor`` (a
+    BoundedExecutor) if it's given, so any that time out (and carry on
+    running in the background) don't hold the executor's threads. If all of
+    its threads are busy, the provider's fallback is used straight away.
+    """
+    resolved = dict(resolved or {})
+    pending = {
+        name: provider for name, provider in providers.items() if name not in resolved
+    }
+    sync_pending = {
+        name: provider for name, provider in pending.items() if not provider.is_async
+    }
+
+    futures = {}
+    if executor is not None and (
+        len(sync_pending) > 1
+        or any(provider.timeout is not None for provider in sync_pending.values())
+    ):
+        started_at = time.monotonic()
+        for name, provider in sync_pending.items():
+            args = (
+                contextvars.copy_context().run,
+                _call_provider_in_thread,
+                name,
+                provider,
+                request,
+            )
+            if provider.timeout is None or timeout_executor is None:
+                futures[name] = executor.submit(*args)
+            else:
+                # None if the timeout executor is saturated
+                futures[name] = timeout_executor.try_submit(*args)
+
+    # Await async providers while any sync providers are running in threads
+    if len(sync_pending) < len(pending):
+        resolved.update(async_to_sync(acall_async_providers)(request, pending))
+
+    for name, provider in sync_pending.items():
+        if name not in futures:
+            resolved[name] = _call_provider(name, provider, request)
+        elif futures[name] is None:
+            resolved[name] = provider.fallback
+        elif provider.timeout is None:
+            resolved[name] = futures[name].result()
+        else:
+            remaining = started_at + provider.timeout - time.monotonic()
+            try:
+                resolved[name] = futures[name].result(timeout=max(remaining, 0))
+            except concurrent.futures.TimeoutError:
+                futures[name].cancel()
+                resolved[name] = provider.fallback
+
+    return {name: resolved[name] for name in providers}
@@ -0,0 +1,141 @@
+import json
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.functional import Promise
+from telepath import ValueContext
+
+from .packing import PackingWriter
+from .timing import measure
+
+# Same escapes as Django's json_script filter, applied to encoded bytes.
+# These characters can only appear inside JSON strings, so replacing them with
+# their unicode escapes doesn't change the decoded value.
+HTML_ESCAPES = [
+    (b"&", b"\\u0026"),
+    (b"<", b"\\u003C"),
+    (b">", b"\\u003E"),
+]
+
+
+def default(obj):
+    """
+    Fallback for values that the JSON encoder doesn't support natively.
+    """
+    if isinstance(obj, str):
+        # Subclasses of str such as SafeString. Note that str() would return
+        # SafeString instances unchanged
+        return str.__str__(obj)
+
+    if isinstance(obj, Promise):
+        # Lazy translation strings
+        return str(obj)
+
+    return DjangoJSONEncoder().default(obj)
+
+
+class BaseJSONBackend:
+    """
+    Serializes packed response data into JSON.
+
+    Subclasses must implement dumps().
+    """
+
+    def dumps(self, data):
+        """
+        Returns the given data serialized as JSON bytes.
+        """
+        raise NotImplementedError
+
+    def dumps_html_safe(self, data):
+        """
+        Returns the given data serialized as JSON bytes that are safe to embed
+        in a <script> tag.
+        """
+        content = self.dumps(data)
+        for char, escape in HTML_ESCAPES:
+            content = content.replace(char, escape)
+
+        return content
+
+    def pack_and_dumps(self, data, js_context, *, html_safe=False):
+        """
+        Packs the given data with telepath and returns it serialized as JSON bytes.
+        """
+        with measure("pack", "Pack"):
+            data = ValueContext(js_context).build_node(data).emit()
+
+        with measure("json", "JSON encoding"):
+            if html_safe:
+                return self.dumps_html_safe(data)
+
+            return self.dumps(data)
+
+
+class JSONBackend(BaseJSONBackend):
+    """
+    Serializes JSON with Python's built-in json module.
+    """
+
+    def dumps(self, data):
+        return json.dumps(data, cls=DjangoJSONEncoder, separators=(",", ":")).encode()
+
+
+class StreamingJSONBackend(JSONBackend):
+    """
+    Serializes JSON with Python's built-in json module, writing packed values
+    directly to bytes.
+
+    The packed data (and telepath's node tree) is never built in memory, only
+    the JSON bytes. This greatly reduces peak memory for very large responses
+    at the cost of some CPU time compared to the other backends. Note that the
+    response is still built in full before it's sent.
+    """
+
+    chunk_size = 65536
+
+    def pack_and_dumps(self, data, js_context, *, html_safe=False):
+        writer = PackingWriter(
+            js_context, self, html_safe=html_safe, chunk_size=self.chunk_size
+        )
+        with measure("pack", "Pack and JSON encoding"):
+            writer.pack(data)
+            return writer.getvalue()
+
+
+class OrjsonJSONBackend(BaseJSONBackend):
+    """
+    Serializes JSON with orjson.
+    """
+
+    def __init__(self):
+        try:
+            import orjson
+        except ImportError:
+            raise ImproperlyConfigured(
+                "The orjson package must be installed to use OrjsonJSONBackend"
+            )
+
+        self.orjson = orjson
+
+    def dumps(self, data):
+        return self.orjson.dumps(data, default=default)
+
+
+class MsgspecJSONBackend(BaseJSONBackend):
+    """
+    Serializes JSON with msgspec.
+    """
+
+    def __init__(self):
+        try:
+            import msgspec
+        except ImportError:
+            raise ImproperlyConfigured(
+                "The msgspec package must be installed to use MsgspecJSONBackend"
+            )
+
+        self.encoder = msgspec.json.Encoder(enc_hook=default)
+
+    def dumps(self, data):
+        return self.encoder.encode(data)
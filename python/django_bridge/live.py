@@ -0,0 +1,72 @@
+from urllib.parse import urlencode
+
+from django.core import signing
+from django.core.exceptions import ImproperlyConfigured
+
+from .conf import get_config
+
+TOKEN_SALT = "django_bridge.live"
+
+
+def get_user_key(user):
+    if user is None or not user.is_authenticated:
+        return None
+
+    return str(user.pk)
+
+
+def get_live_token(channels, user=None):
+    """
+    Returns a token that allows the given user to subscribe to the given
+    channels.
+    """
+    return signing.dumps(
+        {"channels": sorted(channels), "user": get_user_key(user)},
+        salt=TOKEN_SALT,
+        compress=True,
+    )
+
+
+def get_live_channels(token, user=None, max_age=None):
+    """
+    Returns the channels of a token created by get_live_token().
+
+    Raises django.core.signing.BadSignature if the token is invalid, is older
+    than max_age seconds, or was created for a different user.
+    """
+    data = signing.loads(token, salt=TOKEN_SALT, max_age=max_age)
+    if data["user"] != get_user_key(user):
+        raise signing.BadSignature("The token was created for a different user")
+
+    return data["channels"]
+
+
+def get_live_url(config, channels, user=None):
+    """
+    Returns the URL of the stream of messages published to the given channels.
+    """
+    if config.live_stream_url is None:
+        raise ImproperlyConfigured(
+            "DJANGO_BRIDGE['LIVE_STREAM_URL'] must be set to the URL of a "
+            "LiveStreamView to use channels"
+        )
+
+    query = urlencode({"token": get_live_token(channels, user)})
+    return f"{config.live_stream_url}?{query}"
+
+
+def publish(channel, props=None):
+    """
+    Notifies the clients that are showing a view with the given channel that
+    its data has changed.
+
+    If props are given, they are sent to the clients and merged into the
+    props of the view. Otherwise, the clients refresh the props of the view.
+    """
+    config = get_config()
+
+    message = {"channel": channel}
+    if props is not None:
+        message["props"] = config.pack(props)
+
+    config.live_backend.publish(channel, config.json_backend.dumps(message).decode())
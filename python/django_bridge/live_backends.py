@@ -0,0 +1,106 @@
+import asyncio
+import threading
+
+
+class BaseLiveBackend:
+    """
+    Delivers messages published to live channels to the clients that are
+    subscribed to them.
+
+    Subclasses must implement publish() and subscribe().
+    """
+
+    def publish(self, channel, message):
+        """
+        Sends the given message (a JSON string) to all subscribers of the
+        given channel.
+
+        This may be called from any thread, and from sync or async code.
+        """
+        raise NotImplementedError
+
+    def subscribe(self, channels):
+        """
+        Subscribes to the given channels, returning a subscription.
+
+        Subscriptions are async iterators of the messages published to any of
+        their channels after they were created. They must have a close()
+        method that unsubscribes them.
+
+        This is called from the event loop that the subscription is used in.
+        """
+        raise NotImplementedError
+
+
+class LocMemSubscription:
+    def __init__(self, backend, channels, max_size):
+        self.backend = backend
+        self.channels = channels
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(max_size)
+
+    def put(self, message):
+        try:
+            self.loop.call_soon_threadsafe(self.put_nowait, message)
+        except RuntimeError:
+            # The event loop has been closed
+            pass
+
+    def put_nowait(self, message):
+        # Drop the oldest message if the client isn't keeping up, so a slow
+        # client can't use an unbounded amount of memory
+        if self.queue.full():
+            self.queue.get_nowait()
+
+        self.queue.put_nowait(message)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.queue.get()
+
+    def close(self):
+        self.backend.unsubscribe(self)
+
+
+class LocMemLiveBackend(BaseLiveBackend):
+    """
+    Delivers messages to subscribers in the current process.
+
+    This is useful for development and tests. Sites served by more than one
+    process need a backend that shares messages between processes instead.
+
+    Each subscription keeps up to ``max_queue_size`` messages that haven't
+    been sent to the client yet, after which the oldest are dropped.
+    """
+
+    max_queue_size = 100
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Channel -> subscriptions
+        self.subscriptions = {}
+
+    def publish(self, channel, message):
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(channel, ()))
+
+        for subscription in subscriptions:
+            subscription.put(message)
+
+    def subscribe(self, channels):
+        subscription = LocMemSubscription(self, channels, self.max_queue_size)
+        with self.lock:
+            for channel in channels:
+                self.subscriptions.setdefault(channel, set()).add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            for channel in subscription.channels:
+                subscriptions = self.subscriptions.get(channel, set())
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    self.subscriptions.pop(channel, None)
@@ -0,0 +1,117 @@
+import json
+import threading
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class ChunkAssets:
+    """
+    The assets that need to be loaded for a chunk in the Vite manifest.
+
+    All paths are relative to the bundle directory, so they should be passed
+    through Django's ``static()`` before being sent to the browser.
+    """
+
+    js: list[str] = field(default_factory=list)
+    css: list[str] = field(default_factory=list)
+    preload: list[str] = field(default_factory=list)
+
+
+class ViteManifest:
+    """
+    A parsed ``.vite/manifest.json`` file.
+
+    Use ``ViteManifest.load()`` rather than constructing this directly, so
+    the manifest is only read from disk when the file has changed.
+    """
+
+    def __init__(self, data, *, version=None):
+        self.data = data
+        self.version = version
+        self._chunk_assets = {}
+
+    @classmethod
+    def load(cls, bundle_dir):
+        return _manifest_cache.get(bundle_dir / ".vite/manifest.json")
+
+    def get_chunk_assets(self, name, *, include_dynamic_imports=False):
+        """
+        Returns the JS, CSS and modulepreload files required to load the given chunk.
+
+        Walks the ``imports`` graph of the chunk so that every statically
+        imported chunk is preloaded and all of their CSS is included. Dynamic
+        imports are only followed if ``include_dynamic_imports`` is set.
+        """
+        cache_key = (name, include_dynamic_imports)
+        try:
+            return self._chunk_assets[cache_key]
+        except KeyError:
+            pass
+
+        chunk = self.data[name]
+        css = []
+        preload = []
+        seen = {name}
+
+        def visit(chunk_name, chunk):
+            for css_file in chunk.get("css", []):
+                if css_file not in css:
+                    css.append(css_file)
+
+            imports = list(chunk.get("imports", []))
+            if include_dynamic_imports:
+                imports += chunk.get("dynamicImports", [])
+
+            for import_name in imports:
+                if import_name in seen or import_name not in self.data:
+                    continue
+
+                seen.add(import_name)
+                imported_chunk = self.data[import_name]
+                preload.append(imported_chunk["file"])
+                visit(import_name, imported_chunk)
+
+        visit(name, chunk)
+
+        assets = ChunkAssets(js=[chunk["file"]], css=css, preload=preload)
+        self._chunk_assets[cache_key] = assets
+        return assets
+
+
+class ManifestCache:
+    """
+    Process-wide cache of parsed Vite manifests.
+
+    Manifests are keyed by path and reloaded whenever the modification time or
+    size of the file changes, so a new bundle can be deployed without
+    restarting the server.
+    """
+
+    def __init__(self):
+        self._manifests = {}
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        stat = path.stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        manifest = self._manifests.get(path)
+        if manifest is not None and manifest.version == version:
+            return manifest
+
+        with self._lock:
+            manifest = self._manifests.get(path)
+            if manifest is None or manifest.version != version:
+                manifest = ViteManifest(
+                    json.loads(path.read_text()), version=version
+                )
+                self._manifests[path] = manifest
+
+        return manifest
+
+    def clear(self):
+        with self._lock:
+            self._manifests.clear()
+
+
+_manifest_cache = ManifestCache()
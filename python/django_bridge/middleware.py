@@ -1,10 +1,61 @@
-from .response import process_response
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from .conf import get_config
+from .response import aprocess_response, process_response
+from .signals import response_timed
+from .timing import collect_timings, measure
 
 
 class DjangoBridgeMiddleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+        # Build the config up front so misconfiguration is reported on startup
+        get_config()
 
     def __call__(self, request):
-        response = self.get_response(request)
-        return process_response(request, response)
+        if self.async_mode:
+            return self.__acall__(request)
+
+        config = get_config()
+        if not config.server_timing:
+            response = self.get_response(request)
+            return process_response(request, response, config)
+
+        with collect_timings() as timings:
+            with measure("view", "View"):
+                response = self.get_response(request)
+
+            response = process_response(request, response, config)
+
+        self.send_timings(request, response, timings, config)
+        return response
+
+    async def __acall__(self, request):
+        config = get_config()
+        if not config.server_timing:
+            response = await self.get_response(request)
+            return await aprocess_response(request, response, config)
+
+        with collect_timings() as timings:
+            with measure("view", "View"):
+                response = await self.get_response(request)
+
+            response = await aprocess_response(request, response, config)
+
+        self.send_timings(request, response, timings, config)
+        return response
+
+    def send_timings(self, request, response, timings, config):
+        if config.server_timing_header:
+            response["Server-Timing"] = timings.as_header()
+
+        response_timed.send(
+            sender=self.__class__, request=request, response=response, timings=timings
+        )
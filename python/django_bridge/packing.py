@@ -0,0 +1,346 @@
+import math
+from contextlib import contextmanager
+from contextvars import ContextVar
+from json.encoder import encode_basestring_ascii
+
+from django.utils.functional import Promise
+from telepath import (
+    DICT_RESERVED_KEYS,
+    STRING_REF_MIN_LENGTH,
+    Adapter,
+    BaseAdapter,
+    DictAdapter,
+    DictNode,
+    ListNode,
+    ObjectNode,
+    StringAdapter,
+    StringNode,
+    UnpackableTypeError,
+    ValueContext,
+    ValueNode,
+)
+
+_packing_request = ContextVar("django_bridge_packing_request", default=None)
+
+
+@contextmanager
+def packing_request(request):
+    """
+    Sets the request that values are currently being packed for.
+
+    This allows adapters to vary what they pack on the request (see
+    get_packing_request()).
+    """
+    token = _packing_request.set(request)
+    try:
+        yield
+    finally:
+        _packing_request.reset(token)
+
+
+def get_packing_request():
+    """
+    Returns the request that values are currently being packed for, if any.
+    """
+    return _packing_request.get()
+
+
+class NodeWriter:
+    """
+    Writes telepath-packed values as JSON into a list of byte chunks.
+
+    The output is built up in small string parts which are encoded and moved
+    into chunks every ``chunk_size`` characters, so the JSON document is only
+    held in memory as bytes, and not also as a string.
+    """
+
+    def __init__(self, backend, *, html_safe=False, chunk_size=65536):
+        self.backend = backend
+        self.html_safe = html_safe
+        self.chunk_size = chunk_size
+        self.chunks = []
+        self.parts = []
+        self.parts_size = 0
+
+    def write(self, part):
+        self.parts.append(part)
+        self.parts_size += len(part)
+
+        if self.parts_size >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self.parts:
+            self.chunks.append("".join(self.parts).encode())
+            self.parts = []
+            self.parts_size = 0
+
+    def getvalue(self):
+        self.flush()
+        content = b"".join(self.chunks)
+        self.chunks = []
+        return content
+
+    def write_string(self, value):
+        encoded = encode_basestring_ascii(value)
+        if self.html_safe:
+            encoded = (
+                encoded.replace("&", "\\u0026")
+                .replace("<", "\\u003C")
+                .replace(">", "\\u003E")
+            )
+
+        self.write(encoded)
+
+    def write_value(self, value):
+        if value is None:
+            self.write("null")
+        elif value is True:
+            self.write("true")
+        elif value is False:
+            self.write("false")
+        elif isinstance(value, str):
+            self.write_string(value)
+        elif isinstance(value, int):
+            self.write(int.__repr__(value))
+        elif isinstance(value, float) and math.isfinite(value):
+            self.write(float.__repr__(value))
+        elif self.html_safe:
+            self.write(self.backend.dumps_html_safe(value).decode())
+        else:
+            self.write(self.backend.dumps(value).decode())
+
+    def write_node(self, node):
+        """
+        Writes a telepath node, producing the same output as ``node.emit()``.
+        """
+        if not isinstance(node, (ValueNode, StringNode, ListNode, DictNode, ObjectNode)):
+            # Unknown node type, fall back to emitting it
+            self.write_value(node.emit())
+            return
+
+        if node.use_id and node.seen and node.id is not None:
+            self.write('{"_ref":%d}' % node.id)
+            return
+
+        node.seen = True
+        node_id = node.id if node.use_id else None
+
+        if isinstance(node, (ValueNode, StringNode)):
+            self.write_wrapped("_val", node_id, self.write_value, node.value)
+        elif isinstance(node, ListNode):
+            self.write_wrapped("_list", node_id, self.write_items, node.value, self.write_node)
+        elif isinstance(node, DictNode):
+            self.write_wrapped(
+                "_dict",
+                node_id,
+                self.write_dict,
+                node.value,
+                self.write_node,
+                force=any(key in node.value for key in DICT_RESERVED_KEYS),
+            )
+        else:
+            self.write_object(node.constructor, node.args, node_id, self.write_node)
+
+    def write_wrapped(self, name, node_id, write, *args, force=False):
+        """
+        Writes a value in its compact form, or in its verbose form (wrapped in
+        a dict under the given key) if it has an ID or ``force`` is set.
+        """
+        if node_id is None and not force:
+            write(*args)
+            return
+
+        self.write('{"%s":' % name)
+        write(*args)
+        if node_id is not None:
+            self.write(',"_id":%d' % node_id)
+        self.write("}")
+
+    def write_items(self, items, write_item):
+        self.write("[")
+        for i, item in enumerate(items):
+            if i:
+                self.write(",")
+            write_item(item)
+        self.write("]")
+
+    def write_dict(self, items, write_item):
+        self.write("{")
+        for i, (key, val) in enumerate(items.items()):
+            if i:
+                self.write(",")
+            self.write_string(str(key))
+            self.write(":")
+            write_item(val)
+        self.write("}")
+
+    def write_object(self, constructor, args, node_id, write_item):
+        # Objects always use the verbose representation
+        self.write('{"_type":')
+        self.write_string(constructor)
+        self.write(',"_args":')
+        self.write_items(args, write_item)
+        if node_id is not None:
+            self.write(',"_id":%d' % node_id)
+        self.write("}")
+
+
+class PackingWriter(NodeWriter):
+    """
+    Packs values with telepath and writes them as JSON in one go, without
+    building telepath's node tree or the packed data.
+
+    Telepath replaces repeated values with references, so it needs to know
+    which values appear more than once before it can write the first
+    occurrence. This is found with a scan that only records the identity of
+    container values. Adapters are only called once, during the scan, and
+    their results are reused when writing.
+    """
+
+    def __init__(self, js_context, backend, **kwargs):
+        super().__init__(backend, **kwargs)
+        self.js_context = js_context
+        self.registry = js_context.registry
+
+        # Used for values with adapters that implement build_node themselves.
+        # This is also where IDs are allocated from, so IDs of any references
+        # inside those values can't clash with ours
+        self.value_context = ValueContext(js_context)
+
+        # id(value) -> number of occurrences, for values that may be referenced
+        self.counts = {}
+
+        # id(value) -> value, so the IDs of values aren't recycled until we're done
+        self.values = {}
+
+        # id(value) -> (kind, value) for values that are expensive to classify
+        self.classified = {}
+
+        # id(value) -> the telepath ID assigned to a repeated value
+        self.ids = {}
+
+    def add_media(self, *args, **kwargs):
+        self.js_context.add_media(*args, **kwargs)
+
+    def classify(self, obj):
+        """
+        Works out how to pack a value, mirroring ValueContext._build_new_node.
+
+        Returns a tuple of (kind, value), where kind is one of "value",
+        "string", "list", "dict", "object" or "node".
+        """
+        try:
+            return self.classified[id(obj)]
+        except KeyError:
+            pass
+
+        adapter = self.registry.find_adapter(type(obj))
+        if adapter is None:
+            if isinstance(obj, Promise):
+                return ("string", str(obj))
+
+            if isinstance(obj, (list, tuple)):
+                return ("list", obj)
+
+            try:
+                items = iter(obj)
+            except TypeError:
+                raise UnpackableTypeError("don't know how to pack object: %r" % obj)
+
+            return ("list", list(items))
+
+        build_node = type(adapter).build_node
+        if build_node is StringAdapter.build_node:
+            return ("string", obj)
+        elif build_node is DictAdapter.build_node:
+            return ("dict", obj)
+        elif build_node is BaseAdapter.build_node:
+            return ("value", obj)
+        elif build_node is Adapter.build_node:
+            return ("object", adapter.pack(obj, self))
+        else:
+            # A custom build_node implementation, let telepath handle this value
+            return ("node", self.value_context.build_node(obj))
+
+    def scan(self, obj):
+        """
+        Counts the occurrences of every value that could be referenced.
+        """
+        key = id(obj)
+        if key in self.counts:
+            self.counts[key] += 1
+            return
+
+        kind, value = self.classify(obj)
+        if kind == "node":
+            # Telepath keeps track of references within these values. If
+            # this value has been seen before, let telepath know it's repeated
+            # so it assigns it an ID and writes a reference to it after the
+            # first occurrence
+            if key in self.values:
+                self.value_context.build_node(obj)
+
+            self.values[key] = obj
+            self.classified[key] = (kind, value)
+            return
+
+        if kind == "value" or (kind == "string" and len(value) < STRING_REF_MIN_LENGTH):
+            # These are never replaced with references
+            return
+
+        self.counts[key] = 1
+        self.values[key] = obj
+        if kind in ("string", "list", "object"):
+            self.classified[key] = (kind, value)
+
+        if kind == "list":
+            for item in value:
+                self.scan(item)
+        elif kind == "dict":
+            for item in value.values():
+                self.scan(item)
+        elif kind == "object":
+            for arg in value[1]:
+                self.scan(arg)
+
+    def write_packed(self, obj):
+        key = id(obj)
+        node_id = None
+        if self.counts.get(key, 0) > 1:
+            if key in self.ids:
+                self.write('{"_ref":%d}' % self.ids[key])
+                return
+
+            node_id = self.ids[key] = self.value_context.next_id
+            self.value_context.next_id += 1
+
+        kind, value = self.classify(obj)
+        if kind == "node":
+            self.write_node(value)
+            return
+
+        # Any further occurrences of this value are written as references, so
+        # we don't need to keep it
+        self.classified.pop(key, None)
+
+        if kind in ("value", "string"):
+            self.write_wrapped("_val", node_id, self.write_value, value)
+        elif kind == "list":
+            self.write_wrapped("_list", node_id, self.write_items, value, self.write_packed)
+        elif kind == "dict":
+            self.write_wrapped(
+                "_dict",
+                node_id,
+                self.write_dict,
+                value,
+                self.write_packed,
+                force=any(str(name) in DICT_RESERVED_KEYS for name in value.keys()),
+            )
+        else:
+            constructor, args = value
+            self.write_object(constructor, args, node_id, self.write_packed)
+
+    def pack(self, obj):
+        self.scan(obj)
+        self.write_packed(obj)
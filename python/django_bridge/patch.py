@@ -0,0 +1,63 @@
+def escape_pointer(key):
+    """
+    Escapes a key for use in a JSON Pointer (RFC 6901).
+    """
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def is_same_type(a, b):
+    # Note: bools are ints in Python, but not in JSON
+    return type(a) is type(b) or (
+        isinstance(a, (int, float))
+        and isinstance(b, (int, float))
+        and not isinstance(a, bool)
+        and not isinstance(b, bool)
+    )
+
+
+def make_patch(old, new, path=""):
+    """
+    Returns a list of JSON Patch (RFC 6902) operations that turn the JSON
+    value ``old`` into ``new``.
+
+    Only the "add", "remove" and "replace" operations are used. Items are
+    compared by position in lists, so inserting an item near the start of a
+    list replaces every item after it.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        operations = []
+        for key, value in old.items():
+            if key not in new:
+                operations.append(
+                    {"op": "remove", "path": f"{path}/{escape_pointer(key)}"}
+                )
+
+        for key, value in new.items():
+            key_path = f"{path}/{escape_pointer(key)}"
+            if key in old:
+                operations.extend(make_patch(old[key], value, key_path))
+            else:
+                operations.append({"op": "add", "path": key_path, "value": value})
+
+        return operations
+
+    if isinstance(old, list) and isinstance(new, list):
+        operations = []
+        for index, (old_item, new_item) in enumerate(zip(old, new)):
+            operations.extend(make_patch(old_item, new_item, f"{path}/{index}"))
+
+        # Remove from the end so the indexes of the remaining items don't change
+        for index in range(len(old) - 1, len(new) - 1, -1):
+            operations.append({"op": "remove", "path": f"{path}/{index}"})
+
+        for index in range(len(old), len(new)):
+            operations.append(
+                {"op": "add", "path": f"{path}/{index}", "value": new[index]}
+            )
+
+        return operations
+
+    if is_same_type(old, new) and old == new:
+        return []
+
+    return [{"op": "replace", "path": path, "value": new}]
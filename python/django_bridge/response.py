@@ -1,19 +1,84 @@
-import json
+import hashlib
 import warnings
 
+from asgiref.sync import sync_to_async
+
 from django.contrib import messages
+from django.core.cache import caches
 from django.core.exceptions import ImproperlyConfigured
-from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import render
 from django.templatetags.static import static
-from django.utils.cache import patch_cache_control
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+    set_response_etag,
+)
+from django.utils.functional import SimpleLazyObject
 from django.utils.html import conditional_escape
-
-from .conf import DjangoBridgeConfig
+from django.utils.safestring import mark_safe
+
+from .adapters.registry import Prepacked
+from .conf import get_config
+from .context_providers import (
+    acall_async_providers,
+    call_providers,
+    select_providers,
+)
+from .live import get_live_url
+from .manifest import ViteManifest
 from .metadata import Metadata
+from .packing import packing_request
+from .patch import make_patch
+from .subrequests import (
+    build_subrequest,
+    dispatch_subrequest,
+    get_local_path,
+    is_bridge_view,
+)
+from .timing import measure
+
+# The request headers that Django Bridge responses vary on
+VARY_HEADERS = [
+    "X-Requested-With",
+    "X-DjangoBridge-Context-Loaded",
+    "X-DjangoBridge-Form-Schemas",
+    "X-DjangoBridge-Props-Version",
+    "X-DjangoBridge-Only",
+    "X-DjangoBridge-View",
+    "X-DjangoBridge-Purpose",
+]
+
+
+def is_prefetch(request):
+    """
+    Returns True if the request was made to prefetch a page before the user
+    navigates to it.
+
+    The response may never be shown, so views should skip any work with side
+    effects (such as recording a page view) for these requests.
+    """
+    return (
+        request.method in ("GET", "HEAD")
+        and request.headers.get("X-DjangoBridge-Purpose") == "prefetch"
+    )
+
+
+def has_pending_messages(request):
+    """
+    Returns True if there are messages waiting to be shown to the user.
+
+    This doesn't consume the messages.
+    """
+    return len(messages.get_messages(request)) > 0
 
 
 def get_messages(request):
+    if is_prefetch(request):
+        # Leave the messages in storage for the next page the user sees
+        return []
+
     default_level_tag = messages.DEFAULT_TAGS[messages.SUCCESS]
     return [
         {
@@ -34,6 +99,7 @@ class BaseResponse(HttpResponse):
     """
 
     action = None
+    _request = None
 
     def __init__(self, data, *, status=None):
         super().__init__(status=status)
@@ -42,17 +108,55 @@ class BaseResponse(HttpResponse):
             **data,
         }
 
+    async def aprepare(self, config):
+        """
+        Performs any async work needed to render the response.
+
+        Called on the event loop by aprocess_response() before the response
+        is rendered in a thread.
+        """
+        pass
+
+    def get_data(self, config):
+        """
+        Returns the response data before it's packed.
+        """
+        return self.data
+
     def get_response_data(self, config):
         """
         Returns response data adapted and ready for JSON serialization.
         """
-        return config.pack(self.data)
+        with packing_request(self._request):
+            data = self.get_data(config)
+            with measure("pack", "Pack"):
+                return config.pack(data)
+
+    def get_response_content(self, config, *, html_safe=False):
+        """
+        Returns response data packed and serialized to JSON bytes.
+        """
+        with packing_request(self._request):
+            return config.pack_json(self.get_data(config), html_safe=html_safe)
 
     def as_jsonresponse(self, config):
-        response = JsonResponse(self.get_response_data(config), status=self.status_code)
+        response = HttpResponse(
+            self.get_response_content(config),
+            content_type="application/json",
+            status=self.status_code,
+        )
         response["X-DjangoBridge-Action"] = self.action
         response.cookies = self.cookies
 
+        if config.cacheable_responses:
+            # Allow browsers to cache the response, but only for requests
+            # made by Django Bridge, and make them check it's still fresh with
+            # the ETag every time
+            patch_vary_headers(response, VARY_HEADERS)
+            set_response_etag(response)
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+
         # Make sure that Django Bridge responses are never cached by browsers
         # We need to do this because Django Bridge responses are given on the same URLs that
         # users would otherwise get HTML responses on if they visited those URLs
@@ -65,6 +169,129 @@ class BaseResponse(HttpResponse):
         return response
 
 
+def get_view_assets(config, view):
+    """
+    Returns the ChunkAssets of the chunk that implements the given view.
+
+    This is only available in production, when VIEW_CHUNKS is set and the
+    chunk is in the manifest. Otherwise, None is returned.
+    """
+    if not config.vite_bundle_dir or view is None:
+        return None
+
+    chunk = config.get_view_chunk(view)
+    manifest = ViteManifest.load(config.vite_bundle_dir)
+    if chunk is None or chunk not in manifest.data:
+        return None
+
+    return manifest.get_chunk_assets(chunk)
+
+
+def get_bootstrap_assets(config, view=None):
+    """
+    Returns the URLs of the frontend assets to load on full page loads.
+
+    If the chunk that implements ``view`` is known, it's preloaded along with
+    the entry point.
+
+    Note that the CSS and module preload paths are passed through the static
+    template tag by the bootstrap template.
+    """
+    vite_react_refresh_runtime = None
+    modulepreload = []
+
+    if config.vite_bundle_dir:
+        # Production - Use asset manifest to find URLs to bundled JS/CSS
+        # The manifest is cached and only reloaded when the file changes
+        assets = ViteManifest.load(config.vite_bundle_dir).get_chunk_assets(
+            config.entry_point
+        )
+
+        js = [static(src) for src in assets.js]
+        css = assets.css
+        modulepreload = assets.preload
+
+        view_assets = get_view_assets(config, view)
+        if view_assets is not None:
+            css = css + [src for src in view_assets.css if src not in css]
+            modulepreload = modulepreload + [
+                src
+                for src in view_assets.js + view_assets.preload
+                if src not in modulepreload and src not in assets.js
+            ]
+
+    elif config.vite_devserver_url:
+        # Development - Fetch JS/CSS from Vite server
+        js = [
+            f"{config.vite_devserver_url}/@vite/client",
+            f"{config.vite_devserver_url}/{config.entry_point}",
+        ]
+        css = []
+        if config.framework == "react":
+            vite_react_refresh_runtime = config.vite_devserver_url + "/@react-refresh"
+
+    else:
+        raise ImproperlyConfigured(
+            "DJANGO_BRIDGE['VITE_BUNDLE_DIR'] (production) or DJANGO_BRIDGE['VITE_DEVSERVER_URL'] (development) must be set"
+        )
+
+    return {
+        "js": js,
+        "css": css,
+        "modulepreload": modulepreload,
+        "vite_react_refresh_runtime": vite_react_refresh_runtime,
+    }
+
+
+def get_early_hint_links(config, view=None):
+    """
+    Returns Link header values that preload the frontend assets.
+
+    These are sent in a 103 Early Hints response by EarlyHintsMiddleware and
+    in the Link header of full page loads.
+    """
+    assets = get_bootstrap_assets(config, view)
+
+    return (
+        [f"<{static(src)}>; rel=preload; as=style" for src in assets["css"]]
+        + [f"<{src}>; rel=modulepreload" for src in assets["js"]]
+        + [f"<{static(src)}>; rel=modulepreload" for src in assets["modulepreload"]]
+    )
+
+
+class Lazy:
+    """
+    Marks a prop as lazy.
+
+    Lazy props are only computed if they are sent to the client, so they are
+    skipped when the client only asks for some other props.
+
+    For example:
+
+        Response(request, "Dashboard", {"stats": Lazy(get_stats)})
+    """
+
+    def __init__(self, func):
+        self.func = func
+
+    def __call__(self):
+        return self.func()
+
+
+class Deferred(Lazy):
+    """
+    Marks a prop as deferred.
+
+    Deferred props are left out of the response, so the view can be rendered
+    before they are computed. The client then fetches all the deferred props
+    of the view in a single follow-up request.
+
+    For example:
+
+        Response(request, "Dashboard", {"stats": Deferred(get_stats)})
+    """
+
+
 class Response(BaseResponse):
     """
     Instructs the client to render a view (React component) with the given context.
@@ -82,6 +309,8 @@ class Response(BaseResponse):
         title="",
         metadata: Metadata | None = None,
         status=None,
+        frame_cache_max_age=None,
+        channels=None,
     ):
         if metadata is None:
             if title:
@@ -100,72 +329,265 @@ class Response(BaseResponse):
         self.props = props
         self.overlay = overlay
         self.metadata = metadata
-        self.messages = get_messages(request)
+        self.frame_cache_max_age = frame_cache_max_age
+        self.channels = channels or []
+        with measure("messages", "Messages"):
+            self.messages = get_messages(request)
+        self._async_context = None
+
+    async def aprepare(self, config):
+        with measure("async-context", "Async context providers"):
+            self._async_context = await acall_async_providers(
+                self._request,
+                select_providers(self._request, config.context_providers),
+            )
 
-    def get_response_data(self, config):
-        context = {
-            name: provider(self._request)
-            for name, provider in config.context_providers.items()
-        }
-        return config.pack(
-            {
-                "action": self.action,
-                "view": self.view,
-                "overlay": self.overlay,
-                "metadata": self.metadata,
-                "props": self.props,
-                "context": context,
-                "messages": self.messages,
-            }
-        )
+    def get_context(self, config):
+        """
+        Returns the value of each global context provider for this response.
 
-    def as_htmlresponse(self, config):
+        Lazy providers are skipped if the client already has their value.
         """
-        Wrap response data in our bootstrap template to load the frontend bundle.
+        with measure("context", "Context providers"):
+            return call_providers(
+                self._request,
+                select_providers(self._request, config.context_providers),
+                self._async_context,
+                executor=config.context_provider_executor,
+                timeout_executor=config.context_provider_timeout_executor,
+            )
+
+    def get_frame_cache_max_age(self, config):
         """
-        vite_react_refresh_runtime = None
+        Returns the number of seconds the client may keep the rendered frame
+        for showing instantly on back/forward navigation, or 0 if it mustn't.
+        """
+        if self.frame_cache_max_age is not None:
+            return self.frame_cache_max_age
 
-        if config.vite_bundle_dir:
-            # Production - Use asset manifest to find URLs to bundled JS/CSS
-            asset_manifest = json.loads(
-                (config.vite_bundle_dir / ".vite/manifest.json").read_text()
-            )
+        return config.frame_cache_max_age
 
-            js = [
-                static(asset_manifest[config.entry_point]["file"]),
-            ]
-            css = asset_manifest[config.entry_point].get("css", [])
+    def get_only_props(self):
+        """
+        Returns the names of the props the client asked for with the
+        X-DjangoBridge-Only header, or None if it wants all of them.
 
-        elif config.vite_devserver_url:
-            # Development - Fetch JS/CSS from Vite server
-            js = [
-                f"{config.vite_devserver_url}/@vite/client",
-                f"{config.vite_devserver_url}/{config.entry_point}",
-            ]
-            css = []
-            if config.framework == "react":
-                vite_react_refresh_runtime = (
-                    config.vite_devserver_url + "/@react-refresh"
+        This only applies if the client is reloading the same view, as the
+        props of other views can't be merged into the ones it has.
+        """
+        only = self._request.headers.get("X-DjangoBridge-Only")
+        if not only or self._request.headers.get("X-DjangoBridge-View") != self.view:
+            return None
+
+        return {name.strip() for name in only.split(",") if name.strip()}
+
+    def get_props(self, only=None):
+        """
+        Returns the props to send to the client.
+
+        Lazy props are only called if they are sent, so any expensive props
+        can be skipped when they are not needed. Deferred props are only sent
+        if they are asked for.
+        """
+        if not isinstance(self.props, dict):
+            return self.props
+
+        with measure("props", "Lazy props"):
+            return {
+                name: value() if isinstance(value, Lazy) else value
+                for name, value in self.props.items()
+                if (
+                    name in only
+                    if only is not None
+                    else not isinstance(value, Deferred)
                 )
+            }
+
+    def get_deferred_props(self):
+        """
+        Returns the names of the props that are deferred.
+        """
+        if not isinstance(self.props, dict):
+            return []
+
+        return [
+            name for name, value in self.props.items() if isinstance(value, Deferred)
+        ]
+
+    def get_props_data(self, config):
+        """
+        Returns the props part of the response data.
+
+        If the client asked for some of the props, only those are sent and
+        the response is marked as partial.
 
+        Otherwise, all props except deferred ones are sent, along with the
+        names of the deferred props for the client to fetch.
+        """
+        only = self.get_only_props()
+        if only is not None:
+            return {"props": self.get_props(only), "partial": True}
+
+        props = self.get_props()
+        if config.props_diff_cache is None:
+            data = {"props": props}
         else:
-            raise ImproperlyConfigured(
-                "DJANGO_BRIDGE['VITE_BUNDLE_DIR'] (production) or DJANGO_BRIDGE['VITE_DEVSERVER_URL'] (development) must be set"
+            data = self.get_versioned_props_data(config, props)
+
+        deferred = self.get_deferred_props()
+        if deferred:
+            data["deferred"] = deferred
+
+        return data
+
+    def get_versioned_props_data(self, config, props):
+        """
+        Returns the props part of the response data when PROPS_DIFF_CACHE is
+        set.
+
+        The props are packed up front and given a version. When the client
+        sends the version of the props it has, only a JSON patch from those
+        props is sent.
+
+        The packed props are only stored in the cache when they are likely to
+        be refreshed: when the client sent a version (so it is refreshing
+        them) or when the view has live channels.
+        """
+        with measure("pack-props", "Pack props"):
+            packed_props = config.pack(props)
+            version = hashlib.sha256(
+                config.json_backend.dumps(packed_props)
+            ).hexdigest()
+
+        cache = caches[config.props_diff_cache]
+        client_version = self._request.headers.get("X-DjangoBridge-Props-Version")
+        if client_version == version:
+            # Keep the props cached for as long as the client is refreshing
+            cache.touch(f"django_bridge:props:{version}", config.props_diff_timeout)
+            return {"props": None, "propsPatch": [], "propsVersion": version}
+
+        if client_version or self.channels:
+            cache.set(
+                f"django_bridge:props:{version}",
+                packed_props,
+                config.props_diff_timeout,
             )
 
-        response_data = self.get_response_data(config)
-        response = render(
-            self._request,
-            config.bootstrap_template,
-            {
-                "metadata": response_data.get("metadata"),
-                "initial_response": response_data,
-                "js": js,
-                "css": css,
-                "vite_react_refresh_runtime": vite_react_refresh_runtime,
-            },
+        if client_version:
+            client_props = cache.get(f"django_bridge:props:{client_version}")
+            if client_props is not None:
+                with measure("props-diff", "Props diff"):
+                    patch = make_patch(client_props, packed_props)
+
+                return {
+                    "props": None,
+                    "propsPatch": Prepacked(patch),
+                    "propsVersion": version,
+                }
+
+        return {"props": Prepacked(packed_props), "propsVersion": version}
+
+    def get_assets_data(self, config):
+        """
+        Returns the URLs of the code for the view, so the client can start
+        fetching it while the response is being handled.
+        """
+        view_assets = get_view_assets(config, self.view)
+        if view_assets is None:
+            return {}
+
+        return {
+            "assets": {
+                "js": [static(src) for src in view_assets.js + view_assets.preload],
+                "css": [static(src) for src in view_assets.css],
+            }
+        }
+
+    def get_live_data(self, config):
+        """
+        Returns the URL of the stream the client subscribes to for updates
+        to the props, if the view has any channels.
+        """
+        if not self.channels:
+            return {}
+
+        return {
+            "live": get_live_url(
+                config, self.channels, getattr(self._request, "user", None)
+            )
+        }
+
+    def get_data(self, config):
+        return {
+            "action": self.action,
+            "view": self.view,
+            "overlay": self.overlay,
+            "metadata": self.metadata,
+            **self.get_props_data(config),
+            "context": self.get_context(config),
+            "messages": self.messages,
+            **self.get_assets_data(config),
+            **self.get_live_data(config),
+        }
+
+    def as_htmlresponse(self, config):
+        """
+        Wrap response data in our bootstrap template to load the frontend bundle.
+        """
+        assets = {**get_bootstrap_assets(config, self.view), "js_preload": []}
+
+        if config.stream_html:
+            # The initial response is built before the response is returned,
+            # so middleware sees any cookies or session changes made by the
+            # context providers and errors are reported with a proper status
+            initial_response_json = self.get_response_content(
+                config, html_safe=True
+            ).decode()
+
+            # Send the <head> as its own chunk, with the entry point preloaded,
+            # so the browser can fetch the frontend bundle while it receives
+            # the rest of the page
+            shell = config.bootstrap_shells.get(
+                config.bootstrap_template, {**assets, "js_preload": assets["js"]}
+            )
+            response = StreamingHttpResponse(
+                shell.iter_render(
+                    self.metadata["title"], lambda: initial_response_json
+                ),
+                status=self.status_code,
+            )
+            if self.cookies:
+                response.cookies = self.cookies
+
+            return response
+
+        initial_response_json = mark_safe(
+            self.get_response_content(config, html_safe=True).decode()
         )
 
+        if config.precompile_bootstrap_template:
+            # Only the title and initial response are filled in per request
+            with measure("template", "Bootstrap shell"):
+                shell = config.bootstrap_shells.get(config.bootstrap_template, assets)
+                response = HttpResponse(
+                    shell.render(self.metadata["title"], initial_response_json)
+                )
+        else:
+            with measure("template", "Bootstrap template"):
+                response = render(
+                    self._request,
+                    config.bootstrap_template,
+                    {
+                        "metadata": self.metadata,
+                        # Only packed again if a custom template uses it
+                        "initial_response": SimpleLazyObject(
+                            lambda: self.get_response_data(config)
+                        ),
+                        "initial_response_json": initial_response_json,
+                        **assets,
+                    },
+                )
+
         response.status_code = self.status_code
         if self.cookies:
             response.cookies = self.cookies
@@ -200,6 +622,7 @@ class CloseOverlayResponse(BaseResponse):
     action = "close-overlay"
 
     def __init__(self, request):
+        self._request = request
         self.messages = get_messages(request)
         super().__init__(
             {
@@ -208,9 +631,67 @@ class CloseOverlayResponse(BaseResponse):
         )
 
 
+def bridge_view(view_func):
+    """
+    Marks a function view as always returning a Django Bridge response, so
+    redirects to it can be followed on the server (see FOLLOW_REDIRECTS).
+
+    DjangoBridgeView subclasses don't need this.
+    """
+    view_func.django_bridge_view = True
+    return view_func
+
+
+def should_follow_redirect(request, response, config):
+    """
+    Returns True if the given response is a redirect that should be followed
+    on the server.
+    """
+    return (
+        config.follow_redirects
+        and request.method == "POST"
+        and request.META.get("HTTP_X_REQUESTED_WITH") == "DjangoBridge"
+        and not isinstance(response, StreamingHttpResponse)
+        and response.status_code == 302
+    )
+
+
+def follow_redirect(request, response, config):
+    """
+    Renders the view that the given redirect points to in-process, so the
+    client doesn't need to fetch it separately.
+
+    The path of the view is sent in the X-DjangoBridge-Path header. Returns
+    None if the redirect points to another site, or to a URL that isn't
+    handled by a Django Bridge view. Views are checked before they are
+    called, so views that aren't followed are only called once, when the
+    client fetches them.
+    """
+    path = get_local_path(request, response["Location"])
+    if path is None or not is_bridge_view(request, path):
+        return None
+
+    subrequest = build_subrequest(request, path)
+    followed_response = process_response(
+        subrequest, dispatch_subrequest(request, subrequest), config
+    )
+    if "X-DjangoBridge-Action" not in followed_response:
+        return None
+
+    followed_response["X-DjangoBridge-Path"] = path
+
+    # Keep any cookies set by the view that redirected (for example, the
+    # session cookie after logging in)
+    for name, morsel in response.cookies.items():
+        if name not in followed_response.cookies:
+            followed_response.cookies[name] = morsel
+
+    return followed_response
+
+
 def process_response(request, response, config=None):
     if config is None:
-        config = DjangoBridgeConfig.from_settings()
+        config = get_config()
 
     if isinstance(response, StreamingHttpResponse):
         return response
@@ -224,17 +705,111 @@ def process_response(request, response, config=None):
         # Convert redirect responses to a RedirectResponse
         # This allows the client code to handle the redirect
         if response.status_code == 302:
+            if should_follow_redirect(request, response, config):
+                followed_response = follow_redirect(request, response, config)
+                if followed_response is not None:
+                    return followed_response
+
             response = RedirectResponse(response["Location"])
 
     if isinstance(response, BaseResponse):
         # If the request was made by Django Bridge
         # (using `fetch()`, rather than a regular browser request)
         if request.META.get("HTTP_X_REQUESTED_WITH") == "DjangoBridge":
-            return response.as_jsonresponse(config)
+            json_response = response.as_jsonresponse(config)
+
+            if is_prefetch(request):
+                # How long the client may keep the response before using it
+                json_response["X-DjangoBridge-Prefetch-TTL"] = str(config.prefetch_ttl)
+
+                # The messages were left out of the response, so tell the
+                # client not to use it if there are any waiting to be shown
+                if has_pending_messages(request):
+                    json_response["X-DjangoBridge-Pending-Messages"] = "1"
+
+            if isinstance(response, Response) and request.method == "GET":
+                frame_cache_max_age = response.get_frame_cache_max_age(config)
+                if frame_cache_max_age:
+                    json_response["X-DjangoBridge-Frame-Cache-Max-Age"] = str(
+                        frame_cache_max_age
+                    )
+
+            if config.cacheable_responses and request.method in ("GET", "HEAD"):
+                # Returns a 304 Not Modified if the client's copy is current
+                return get_conditional_response(
+                    request, etag=json_response["ETag"], response=json_response
+                )
+
+            return json_response
 
         # Regular browser request
         # Wrap the response in our bootstrap template to load the React SPA
         # and render the response data.
-        return response.as_htmlresponse(config)
+        html_response = response.as_htmlresponse(config)
+
+        if config.early_hints:
+            # Some CDNs send 103 Early Hints for pages based on this
+            html_response["Link"] = ", ".join(
+                get_early_hint_links(config, getattr(response, "view", None))
+            )
+
+        if config.cacheable_responses:
+            # Make sure browsers don't use cached JSON responses for this
+            patch_vary_headers(html_response, VARY_HEADERS)
+
+        return html_response
 
     return response
+
+
+async def aiter_in_thread(iterator):
+    """
+    Iterates over a sync iterator from async code, getting each item in a
+    thread.
+    """
+    iterator = iter(iterator)
+    done = object()
+
+    while True:
+        item = await sync_to_async(next)(iterator, done)
+        if item is done:
+            return
+
+        yield item
+
+
+async def aprocess_response(request, response, config=None):
+    """
+    Async version of process_response.
+
+    Async context providers are awaited on the event loop, then the response
+    is packed and rendered in a thread as props may contain lazy querysets.
+    Redirects that are followed are also handled in a thread.
+    """
+    if config is None:
+        config = get_config()
+
+    if isinstance(response, BaseResponse):
+        await response.aprepare(config)
+        processed_response = await sync_to_async(process_response)(
+            request, response, config
+        )
+
+        if (
+            isinstance(processed_response, StreamingHttpResponse)
+            and not processed_response.is_async
+        ):
+            # Otherwise, Django would consume the whole response before
+            # sending any of it
+            processed_response.streaming_content = aiter_in_thread(
+                processed_response.streaming_content
+            )
+
+        return processed_response
+
+    if should_follow_redirect(request, response, config):
+        # The view that the redirect points to is called in a thread, as it
+        # may use the database
+        return await sync_to_async(process_response)(request, response, config)
+
+    return process_response(request, response, config)
@@ -0,0 +1,114 @@
+import re
+import threading
+import uuid
+from collections import OrderedDict
+
+from django.template.loader import render_to_string
+from django.utils.html import conditional_escape
+from django.utils.translation import get_language
+
+# Rendered into the template in place of the values that change on every
+# request, so they can be found and replaced afterwards
+TITLE_PLACEHOLDER = f"__django_bridge_title_{uuid.uuid4().hex}__"
+INITIAL_RESPONSE_PLACEHOLDER = f"__django_bridge_initial_response_{uuid.uuid4().hex}__"
+
+PLACEHOLDER_RE = re.compile(
+    f"({re.escape(TITLE_PLACEHOLDER)}|{re.escape(INITIAL_RESPONSE_PLACEHOLDER)})"
+)
+
+
+class BootstrapShell:
+    """
+    A pre-rendered bootstrap template.
+
+    The template is rendered once with placeholders for the page title and
+    the initial response, then split into segments of static HTML around
+    them. Rendering a page then just joins the segments with the values for
+    the request.
+    """
+
+    def __init__(self, parts):
+        # A list of strings, alternating between static HTML and placeholders
+        self.parts = parts
+
+    @classmethod
+    def compile(cls, template_name, context):
+        html = render_to_string(
+            template_name,
+            {
+                **context,
+                "metadata": {"title": TITLE_PLACEHOLDER},
+                "initial_response_json": INITIAL_RESPONSE_PLACEHOLDER,
+            },
+        )
+        return cls(PLACEHOLDER_RE.split(html))
+
+    def iter_render(self, title, get_initial_response_json):
+        """
+        Yields the HTML of the page in chunks.
+
+        Everything before the initial response is yielded before
+        ``get_initial_response_json`` is called, so it can be sent to the
+        browser while the initial response is being built.
+        """
+        title = conditional_escape(title)
+        initial_response_json = None
+        buffer = []
+
+        for part in self.parts:
+            if part == TITLE_PLACEHOLDER:
+                buffer.append(title)
+            elif part == INITIAL_RESPONSE_PLACEHOLDER:
+                if initial_response_json is None:
+                    yield "".join(buffer)
+                    buffer = []
+                    initial_response_json = get_initial_response_json()
+
+                buffer.append(initial_response_json)
+            else:
+                buffer.append(part)
+
+        yield "".join(buffer)
+
+    def render(self, title, initial_response_json):
+        return "".join(self.iter_render(title, lambda: initial_response_json))
+
+
+class BootstrapShellCache:
+    """
+    Keeps one BootstrapShell per template, language and set of assets.
+
+    The assets are part of the key, so shells are compiled again whenever
+    the Vite manifest changes. Only the most recently used ``max_size``
+    shells are kept, so shells for old versions of the manifest are dropped.
+    """
+
+    def __init__(self, max_size=32):
+        self.max_size = max_size
+        self.shells = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, template_name, context):
+        key = (
+            template_name,
+            get_language(),
+            tuple(
+                (name, tuple(value) if isinstance(value, list) else value)
+                for name, value in sorted(context.items())
+            ),
+        )
+
+        with self.lock:
+            shell = self.shells.get(key)
+            if shell is not None:
+                self.shells.move_to_end(key)
+                return shell
+
+        shell = BootstrapShell.compile(template_name, context)
+
+        with self.lock:
+            self.shells[key] = shell
+            while len(self.shells) > self.max_size:
+                self.shells.popitem(last=False)
+
+        return shell
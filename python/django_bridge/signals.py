@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent by DjangoBridgeMiddleware after each response is built when
+# SERVER_TIMING is enabled.
+# Arguments: request, response, timings
+response_timed = Signal()
@@ -0,0 +1,97 @@
+import threading
+import time
+
+
+class Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Makes sure that only one call with each key is in progress at a time.
+
+    Callers that make a call while another call with the same key is in
+    progress wait for it and share its result instead of making their own.
+    Results can also be kept for a short time, so calls that are made just
+    after another one has finished share its result too.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Key -> Call
+        self.calls = {}
+        # Key -> (expiry time, value)
+        self.results = {}
+
+    def get_result(self, key, now):
+        try:
+            expires_at, value = self.results[key]
+        except KeyError:
+            return False, None
+
+        if expires_at <= now:
+            del self.results[key]
+            return False, None
+
+        return True, value
+
+    def set_result(self, key, value, now, timeout):
+        # Remove any expired results so they don't build up
+        for expired_key in [
+            key for key, (expires_at, _) in self.results.items() if expires_at <= now
+        ]:
+            del self.results[expired_key]
+
+        self.results[key] = (now + timeout, value)
+
+    def do(self, key, func, *, timeout=0, wait_timeout=None):
+        """
+        Returns the result of ``func()``, sharing it with any other calls
+        with the same key that are made while it's in progress or within
+        ``timeout`` seconds of it finishing.
+
+        If ``func()`` raises an exception, it's raised in all of the callers
+        that are waiting for it. Callers that have waited for more than
+        ``wait_timeout`` seconds give up and call ``func()`` themselves.
+        """
+        with self.lock:
+            found, value = self.get_result(key, time.monotonic())
+            if found:
+                return value
+
+            call = self.calls.get(key)
+            if call is None:
+                call = self.calls[key] = Call()
+                is_leader = True
+            else:
+                is_leader = False
+
+        if not is_leader:
+            if not call.done.wait(wait_timeout):
+                return func()
+
+            if call.error is not None:
+                raise call.error
+
+            return call.value
+
+        try:
+            call.value = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+                if call.error is None and timeout:
+                    self.set_result(key, call.value, time.monotonic(), timeout)
+
+            call.done.set()
+
+        return call.value
+
+
+calls = SingleFlight()
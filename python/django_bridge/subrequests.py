@@ -0,0 +1,200 @@
+import functools
+from urllib.parse import urlsplit
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.exception import response_for_exception
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from django.utils.module_loading import import_string
+
+# Request attributes set by middleware that are shared with subrequests
+# Middleware isn't run for subrequests (apart from process_view()), so any
+# attributes that views rely on must be added here
+SHARED_ATTRIBUTES = ["session", "user", "auser", "urlconf"]
+
+# Headers of the original request that don't apply to subrequests
+EXCLUDED_META = [
+    "CONTENT_LENGTH",
+    "CONTENT_TYPE",
+    "HTTP_IF_MODIFIED_SINCE",
+    "HTTP_IF_NONE_MATCH",
+    "HTTP_X_DJANGOBRIDGE_ONLY",
+    "HTTP_X_DJANGOBRIDGE_PROPS_VERSION",
+    "HTTP_X_DJANGOBRIDGE_PURPOSE",
+    "HTTP_X_DJANGOBRIDGE_VIEW",
+]
+
+
+def get_path_info(request, path):
+    script_name = request.META.get("SCRIPT_NAME", "")
+    return path.removeprefix(script_name.rstrip("/")) or "/"
+
+
+def get_local_path(request, url):
+    """
+    Returns the path (with the query string) of the given URL if it's on this
+    site and is handled by a Django view, otherwise None.
+    """
+    parts = urlsplit(url)
+    if parts.scheme and parts.scheme != request.scheme:
+        return None
+
+    if parts.netloc and parts.netloc != request.get_host():
+        return None
+
+    if not parts.path.startswith("/"):
+        return None
+
+    try:
+        resolve(
+            get_path_info(request, parts.path), getattr(request, "urlconf", None)
+        )
+    except Resolver404:
+        return None
+
+    return parts.path + (f"?{parts.query}" if parts.query else "")
+
+
+class Subrequest(HttpRequest):
+    """
+    A request made on behalf of another request.
+
+    The scheme is taken from the original request, as the subrequest
+    doesn't have the server's environ (for example, wsgi.url_scheme).
+    """
+
+    def __init__(self, request):
+        super().__init__()
+        self.parent_scheme = request.scheme
+
+    def _get_scheme(self):
+        return self.parent_scheme
+
+
+def is_bridge_view(request, path):
+    """
+    Returns True if the given path (from get_local_path()) is handled by a
+    Django Bridge view.
+
+    These are DjangoBridgeView subclasses, and function views decorated with
+    ``bridge_view``.
+    """
+    path_info = get_path_info(request, path.partition("?")[0])
+    match = resolve(path_info, getattr(request, "urlconf", None))
+    view = getattr(match.func, "view_class", match.func)
+    return getattr(view, "django_bridge_view", False)
+
+
+def build_subrequest(request, path, headers=None, shared_attributes=None):
+    """
+    Builds a Django Bridge GET request for the given path, on behalf of the
+    given request.
+
+    The subrequest has the same headers (apart from EXCLUDED_META) as the
+    original request, and the attributes in ``shared_attributes`` (defaults
+    to SHARED_ATTRIBUTES), such as the session and user. Messages are shared
+    until a response has shown them.
+    """
+    if shared_attributes is None:
+        shared_attributes = SHARED_ATTRIBUTES
+
+    path, _, query_string = path.partition("?")
+    path_info = get_path_info(request, path)
+
+    subrequest = Subrequest(request)
+    subrequest.method = "GET"
+    subrequest.path = path
+    subrequest.path_info = path_info
+    subrequest.GET = QueryDict(query_string)
+    subrequest.COOKIES = request.COOKIES
+    subrequest.META = {
+        name: value
+        for name, value in request.META.items()
+        if name not in EXCLUDED_META
+    }
+    subrequest.META.update(
+        REQUEST_METHOD="GET",
+        PATH_INFO=path_info,
+        QUERY_STRING=query_string,
+        HTTP_X_REQUESTED_WITH="DjangoBridge",
+    )
+
+    for name, value in (headers or {}).items():
+        subrequest.META["HTTP_" + name.upper().replace("-", "_")] = value
+
+    for name in shared_attributes:
+        if hasattr(request, name):
+            setattr(subrequest, name, getattr(request, name))
+
+    storage = getattr(request, "_messages", None)
+    if storage is not None and not storage.used:
+        subrequest._messages = storage
+
+    return subrequest
+
+
+def _get_response(request):
+    return None
+
+
+@functools.lru_cache
+def _load_view_middleware(middleware_paths):
+    methods = []
+    for middleware_path in middleware_paths:
+        try:
+            middleware = import_string(middleware_path)(_get_response)
+        except MiddlewareNotUsed:
+            continue
+
+        if hasattr(middleware, "process_view"):
+            process_view = middleware.process_view
+            if iscoroutinefunction(process_view):
+                process_view = async_to_sync(process_view)
+
+            methods.append(process_view)
+
+    return methods
+
+
+def get_view_middleware():
+    """
+    Returns the process_view() methods of the middleware in MIDDLEWARE.
+    """
+    return _load_view_middleware(tuple(settings.MIDDLEWARE))
+
+
+def dispatch_subrequest(request, subrequest):
+    """
+    Calls the view of the given subrequest and returns its response.
+
+    The process_view() method of each middleware is called first, so checks
+    made there (such as LoginRequiredMiddleware) apply to subrequests too.
+    Other middleware methods are not run for the subrequest, other than
+    what has already been run for the original request.
+    """
+    try:
+        match = resolve(subrequest.path_info, getattr(subrequest, "urlconf", None))
+        subrequest.resolver_match = match
+
+        for process_view in get_view_middleware():
+            response = process_view(subrequest, match.func, match.args, match.kwargs)
+            if response is not None:
+                break
+        else:
+            if iscoroutinefunction(match.func):
+                response = async_to_sync(match.func)(
+                    subrequest, *match.args, **match.kwargs
+                )
+            else:
+                response = match.func(subrequest, *match.args, **match.kwargs)
+    except Exception as e:
+        response = response_for_exception(subrequest, e)
+
+    # Any views that used the CSRF token need its cookie to be set
+    if subrequest.META.get("CSRF_COOKIE_NEEDS_UPDATE"):
+        request.META["CSRF_COOKIE"] = subrequest.META["CSRF_COOKIE"]
+        request.META["CSRF_COOKIE_NEEDS_UPDATE"] = True
+
+    return response
@@ -0,0 +1,146 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+
+from .asgi import EarlyHintsMiddleware
+
+PAGE_LOAD_SCOPE = {
+    "type": "http",
+    "method": "GET",
+    # Served by a DjangoBridgeView
+    "path": "/stats/",
+    "headers": [(b"accept", b"text/html,application/xhtml+xml")],
+    "extensions": {"http.response.early_hint": {}},
+}
+
+
+@override_settings(
+    DJANGO_BRIDGE={
+        "VITE_DEVSERVER_URL": "http://localhost:5173/static",
+        "EARLY_HINTS": True,
+    }
+)
+class TestEarlyHintsMiddleware(SimpleTestCase):
+    async def call(self, scope, **kwargs):
+        messages = []
+        app_called = False
+
+        async def app(scope, receive, send):
+            nonlocal app_called
+            app_called = True
+
+        async def send(message):
+            messages.append(message)
+
+        await EarlyHintsMiddleware(app, **kwargs)(scope, None, send)
+        self.assertTrue(app_called)
+        return messages
+
+    async def test_early_hints_are_sent(self):
+        messages = await self.call(PAGE_LOAD_SCOPE)
+        self.assertEqual(
+            messages,
+            [
+                {
+                    "type": "http.response.early_hint",
+                    "links": [
+                        b"<http://localhost:5173/static/@vite/client>; rel=modulepreload",
+                        b"<http://localhost:5173/static/src/main.tsx>; rel=modulepreload",
+                    ],
+                }
+            ],
+        )
+
+    async def test_not_sent_for_unknown_paths(self):
+        messages = await self.call({**PAGE_LOAD_SCOPE, "path": "/does-not-exist/"})
+        self.assertEqual(messages, [])
+
+    async def test_function_views(self):
+        # Function views can't be told apart from other views, so they only
+        # get hints if they're under one of the path prefixes
+        scope = {**PAGE_LOAD_SCOPE, "path": "/counter/1/"}
+        self.assertEqual(await self.call(scope), [])
+        self.assertEqual(await self.call(scope, path_prefixes=["/admin/"]), [])
+        self.assertEqual(len(await self.call(scope, path_prefixes=["/counter/"])), 1)
+
+    async def test_root_path(self):
+        messages = await self.call(
+            {**PAGE_LOAD_SCOPE, "path": "/app/stats/", "root_path": "/app"}
+        )
+        self.assertEqual(len(messages), 1)
+
+    async def test_not_sent_for_django_bridge_requests(self):
+        messages = await self.call(
+            {
+                **PAGE_LOAD_SCOPE,
+                "headers": [
+                    (b"accept", b"*/*"),
+                    (b"x-requested-with", b"DjangoBridge"),
+                ],
+            }
+        )
+        self.assertEqual(messages, [])
+
+    async def test_not_sent_if_unsupported(self):
+        messages = await self.call({**PAGE_LOAD_SCOPE, "extensions": {}})
+        self.assertEqual(messages, [])
+
+    @override_settings(
+        DJANGO_BRIDGE={"VITE_DEVSERVER_URL": "http://localhost:5173/static"}
+    )
+    async def test_disabled_by_default(self):
+        messages = await self.call(PAGE_LOAD_SCOPE)
+        self.assertEqual(messages, [])
+
+
+class TestEarlyHintsMiddlewareWithManifest(SimpleTestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+
+        manifest_path = Path(self.tempdir.name) / ".vite/manifest.json"
+        manifest_path.parent.mkdir()
+        manifest_path.write_text(
+            json.dumps(
+                {
+                    "src/main.tsx": {
+                        "file": "assets/main.js",
+                        "src": "src/main.tsx",
+                        "isEntry": True,
+                        "imports": ["_vendor.js"],
+                        "css": ["assets/main.css"],
+                    },
+                    "_vendor.js": {"file": "assets/vendor.js"},
+                }
+            )
+        )
+
+    async def test_early_hints_are_sent(self):
+        async def app(scope, receive, send):
+            pass
+
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        with self.settings(
+            DJANGO_BRIDGE={"VITE_BUNDLE_DIR": self.tempdir.name, "EARLY_HINTS": True}
+        ):
+            await EarlyHintsMiddleware(app)(PAGE_LOAD_SCOPE, None, send)
+
+        self.assertEqual(
+            messages,
+            [
+                {
+                    "type": "http.response.early_hint",
+                    "links": [
+                        b"</static/assets/main.css>; rel=preload; as=style",
+                        b"</static/assets/main.js>; rel=modulepreload",
+                        b"</static/assets/vendor.js>; rel=modulepreload",
+                    ],
+                }
+            ],
+        )
@@ -0,0 +1,194 @@
+import datetime
+import json
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.forms import CharField, Form
+from django.test import SimpleTestCase
+from django.utils.safestring import mark_safe
+from django.utils.translation import gettext_lazy
+
+from telepath import Adapter
+
+from .adapters.registry import CustomAdapterRegistry, registry
+from .json_backends import (
+    JSONBackend,
+    MsgspecJSONBackend,
+    OrjsonJSONBackend,
+    StreamingJSONBackend,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+DATA = {
+    "html": mark_safe("<b>Hello & welcome</b>"),
+    "lazy": gettext_lazy("Hello"),
+    "decimal": Decimal("1.5"),
+    "date": datetime.date(2024, 1, 1),
+    "list": [1, 2.5, None, True],
+}
+
+EXPECTED = {
+    "html": "<b>Hello & welcome</b>",
+    "lazy": "Hello",
+    "decimal": "1.5",
+    "date": "2024-01-01",
+    "list": [1, 2.5, None, True],
+}
+
+
+class TestForm(Form):
+    name = CharField()
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class PointAdapter(Adapter):
+    js_constructor = "Point"
+
+    def js_args(self, point):
+        return [point.x, point.y]
+
+    def build_node(self, obj, context):
+        # Implementing build_node leaves building the node to telepath
+        return super().build_node(obj, context)
+
+
+def unpack_refs(data):
+    """
+    Replaces telepath references with the values they point to, so packed
+    data can be compared regardless of how IDs were allocated.
+    """
+    values = {}
+
+    def scan(value):
+        if isinstance(value, dict):
+            if "_id" in value:
+                values[value["_id"]] = value
+            for item in value.values():
+                scan(item)
+        elif isinstance(value, list):
+            for item in value:
+                scan(item)
+
+    def resolve(value):
+        if isinstance(value, dict):
+            if "_ref" in value:
+                return resolve(values[value["_ref"]])
+            return {
+                key: resolve(item) for key, item in value.items() if key != "_id"
+            }
+        elif isinstance(value, list):
+            return [resolve(item) for item in value]
+        return value
+
+    scan(data)
+    return resolve(data)
+
+
+class JSONBackendTestMixin:
+    backend_class = None
+
+    def setUp(self):
+        self.backend = self.backend_class()
+
+    def test_dumps(self):
+        content = self.backend.dumps(DATA)
+        self.assertIsInstance(content, bytes)
+        self.assertEqual(json.loads(content), EXPECTED)
+
+    def test_dumps_html_safe(self):
+        content = self.backend.dumps_html_safe(DATA)
+        self.assertNotIn(b"<", content)
+        self.assertNotIn(b">", content)
+        self.assertNotIn(b"&", content)
+        self.assertEqual(json.loads(content), EXPECTED)
+
+
+class TestJSONBackend(JSONBackendTestMixin, SimpleTestCase):
+    backend_class = JSONBackend
+
+
+class TestStreamingJSONBackend(JSONBackendTestMixin, SimpleTestCase):
+    backend_class = StreamingJSONBackend
+
+    def build_data(self):
+        shared_dict = {"name": "shared"}
+        shared_list = [1, 2, 3]
+        long_string = "a string that is long enough to be referenced"
+        form = TestForm()
+        data = {
+            "dict": shared_dict,
+            "again": shared_dict,
+            "lists": [shared_list, (shared_list, shared_list), (i for i in range(3))],
+            "strings": [long_string, long_string, "short", "short"],
+            "lazy": gettext_lazy("Hello"),
+            "reserved": {"_type": "not a type", "html": "<script>"},
+            "reserved_again": [],
+            "datetime": datetime.datetime(2024, 1, 1, 12, 30),
+            "numbers": [1, -2, 1.5, float("nan"), True, None],
+            "unicode": "caf\u00e9 \u2603",
+            "forms": [form, form],
+        }
+        data["reserved_again"].append(data["reserved"])
+        return data
+
+    def test_pack_and_dumps(self):
+        for html_safe in [False, True]:
+            with self.subTest(html_safe=html_safe):
+                expected = JSONBackend().pack_and_dumps(
+                    self.build_data(), registry.js_context_class(), html_safe=html_safe
+                )
+                content = self.backend.pack_and_dumps(
+                    self.build_data(), registry.js_context_class(), html_safe=html_safe
+                )
+                self.assertEqual(
+                    unpack_refs(json.loads(content)), unpack_refs(json.loads(expected))
+                )
+                self.assertEqual(b"<" in content, not html_safe)
+
+    def test_repeated_values_with_custom_nodes(self):
+        point_registry = CustomAdapterRegistry()
+        point_registry.register(PointAdapter(), Point)
+        point = Point(1, 2)
+
+        content = self.backend.pack_and_dumps(
+            [point, point], point_registry.js_context_class()
+        )
+        self.assertEqual(
+            json.loads(content),
+            [
+                {"_type": "Point", "_args": [1, 2], "_id": 0},
+                {"_ref": 0},
+            ],
+        )
+
+    def test_pack_and_dumps_in_chunks(self):
+        self.backend.chunk_size = 16
+        data = [{"value": i} for i in range(100)]
+
+        content = self.backend.pack_and_dumps(data, registry.js_context_class())
+        self.assertEqual(json.loads(content), data)
+
+
+@skipUnless(orjson, "orjson is not installed")
+class TestOrjsonJSONBackend(JSONBackendTestMixin, SimpleTestCase):
+    backend_class = OrjsonJSONBackend
+
+
+@skipUnless(msgspec, "msgspec is not installed")
+class TestMsgspecJSONBackend(JSONBackendTestMixin, SimpleTestCase):
+    backend_class = MsgspecJSONBackend
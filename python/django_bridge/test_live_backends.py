@@ -0,0 +1,53 @@
+import asyncio
+import threading
+
+from django.test import SimpleTestCase
+
+from .live_backends import LocMemLiveBackend
+
+
+class TestLocMemLiveBackend(SimpleTestCase):
+    def setUp(self):
+        self.backend = LocMemLiveBackend()
+
+    async def test_publish(self):
+        subscription = self.backend.subscribe(["orders", "products"])
+
+        self.backend.publish("orders", '{"channel":"orders"}')
+        self.backend.publish("customers", '{"channel":"customers"}')
+        self.backend.publish("products", '{"channel":"products"}')
+
+        self.assertEqual(await anext(subscription), '{"channel":"orders"}')
+        self.assertEqual(await anext(subscription), '{"channel":"products"}')
+        self.assertTrue(subscription.queue.empty())
+
+    async def test_publish_from_another_thread(self):
+        subscription = self.backend.subscribe(["orders"])
+
+        thread = threading.Thread(
+            target=self.backend.publish, args=["orders", '{"channel":"orders"}']
+        )
+        thread.start()
+        thread.join()
+
+        message = await asyncio.wait_for(anext(subscription), 1)
+        self.assertEqual(message, '{"channel":"orders"}')
+
+    async def test_oldest_messages_are_dropped(self):
+        self.backend.max_queue_size = 2
+        subscription = self.backend.subscribe(["orders"])
+
+        for number in range(3):
+            self.backend.publish("orders", f'{{"number":{number}}}')
+
+        self.assertEqual(await anext(subscription), '{"number":1}')
+        self.assertEqual(await anext(subscription), '{"number":2}')
+        self.assertTrue(subscription.queue.empty())
+
+    async def test_close(self):
+        subscription = self.backend.subscribe(["orders"])
+        subscription.close()
+
+        self.backend.publish("orders", '{"channel":"orders"}')
+        self.assertTrue(subscription.queue.empty())
+        self.assertEqual(self.backend.subscriptions, {})
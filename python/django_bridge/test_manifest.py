@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from .manifest import ManifestCache, ViteManifest
+
+MANIFEST = {
+    "src/main.tsx": {
+        "file": "assets/main.js",
+        "src": "src/main.tsx",
+        "isEntry": True,
+        "imports": ["_shared.js"],
+        "dynamicImports": ["src/views/Home.tsx"],
+        "css": ["assets/main.css"],
+    },
+    "_shared.js": {
+        "file": "assets/shared.js",
+        "imports": ["_vendor.js"],
+        "css": ["assets/shared.css"],
+    },
+    "_vendor.js": {
+        "file": "assets/vendor.js",
+        "imports": ["_shared.js"],
+    },
+    "src/views/Home.tsx": {
+        "file": "assets/Home.js",
+        "src": "src/views/Home.tsx",
+        "isDynamicEntry": True,
+        "imports": ["_shared.js"],
+        "css": ["assets/Home.css"],
+    },
+}
+
+
+class TestViteManifest(SimpleTestCase):
+    def test_get_chunk_assets(self):
+        assets = ViteManifest(MANIFEST).get_chunk_assets("src/main.tsx")
+        self.assertEqual(assets.js, ["assets/main.js"])
+        self.assertEqual(assets.css, ["assets/main.css", "assets/shared.css"])
+        self.assertEqual(assets.preload, ["assets/shared.js", "assets/vendor.js"])
+
+    def test_get_chunk_assets_with_dynamic_imports(self):
+        assets = ViteManifest(MANIFEST).get_chunk_assets(
+            "src/main.tsx", include_dynamic_imports=True
+        )
+        self.assertEqual(
+            assets.css, ["assets/main.css", "assets/shared.css", "assets/Home.css"]
+        )
+        self.assertEqual(
+            assets.preload, ["assets/shared.js", "assets/vendor.js", "assets/Home.js"]
+        )
+
+
+class TestManifestCache(SimpleTestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tempdir.name) / "manifest.json"
+        self.path.write_text(json.dumps(MANIFEST))
+        self.cache = ManifestCache()
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_manifest_is_reused_while_unchanged(self):
+        manifest = self.cache.get(self.path)
+        self.assertIs(self.cache.get(self.path), manifest)
+
+    def test_manifest_is_reloaded_when_changed(self):
+        manifest = self.cache.get(self.path)
+
+        self.path.write_text(json.dumps({"src/main.tsx": {"file": "assets/new.js"}}))
+        os.utime(self.path, ns=(0, 0))
+
+        new_manifest = self.cache.get(self.path)
+        self.assertIsNot(new_manifest, manifest)
+        self.assertEqual(
+            new_manifest.get_chunk_assets("src/main.tsx").js, ["assets/new.js"]
+        )
@@ -0,0 +1,56 @@
+from django.test import SimpleTestCase
+
+from .patch import make_patch
+
+
+class TestMakePatch(SimpleTestCase):
+    def test_unchanged(self):
+        value = {"a": [1, {"b": "c"}], "d": None}
+        self.assertEqual(make_patch(value, {"a": [1, {"b": "c"}], "d": None}), [])
+
+    def test_replace_value(self):
+        self.assertEqual(
+            make_patch({"count": 1, "name": "foo"}, {"count": 2, "name": "foo"}),
+            [{"op": "replace", "path": "/count", "value": 2}],
+        )
+
+    def test_replace_root(self):
+        self.assertEqual(
+            make_patch([1], {"a": 1}), [{"op": "replace", "path": "", "value": {"a": 1}}]
+        )
+
+    def test_bool_and_int_are_different(self):
+        self.assertEqual(
+            make_patch({"a": 1}, {"a": True}),
+            [{"op": "replace", "path": "/a", "value": True}],
+        )
+        self.assertEqual(make_patch({"a": 1}, {"a": 1.0}), [])
+
+    def test_add_and_remove_keys(self):
+        self.assertEqual(
+            make_patch({"a": 1, "b/c": 2}, {"a": 1, "d~": 3}),
+            [
+                {"op": "remove", "path": "/b~1c"},
+                {"op": "add", "path": "/d~0", "value": 3},
+            ],
+        )
+
+    def test_list_grows(self):
+        self.assertEqual(
+            make_patch({"items": [1, 2]}, {"items": [1, 3, 4, 5]}),
+            [
+                {"op": "replace", "path": "/items/1", "value": 3},
+                {"op": "add", "path": "/items/2", "value": 4},
+                {"op": "add", "path": "/items/3", "value": 5},
+            ],
+        )
+
+    def test_list_shrinks(self):
+        self.assertEqual(
+            make_patch([{"a": 1}, 2, 3, 4], [{"a": 2}, 2]),
+            [
+                {"op": "replace", "path": "/0/a", "value": 2},
+                {"op": "remove", "path": "/3"},
+                {"op": "remove", "path": "/2"},
+            ],
+        )
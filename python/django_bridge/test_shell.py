@@ -0,0 +1,70 @@
+from django.test import SimpleTestCase, override_settings
+from django.utils import translation
+from django.utils.safestring import mark_safe
+
+from .shell import BootstrapShellCache
+
+ASSETS = {
+    "js": ["/static/assets/main.js"],
+    "css": ["assets/main.css"],
+    "modulepreload": ["assets/vendor.js"],
+    "vite_react_refresh_runtime": None,
+}
+
+
+class TestBootstrapShell(SimpleTestCase):
+    def setUp(self):
+        self.cache = BootstrapShellCache()
+
+    def test_render(self):
+        shell = self.cache.get("django_bridge/bootstrap.html", ASSETS)
+        html = shell.render(
+            "Home & <away>", mark_safe('{"action":"render","view":"Home"}')
+        )
+
+        self.assertIn("<title>Home &amp; &lt;away&gt;</title>", html)
+        self.assertIn(
+            '<script id="initial-response" type="application/json">'
+            '{"action":"render","view":"Home"}</script>',
+            html,
+        )
+        self.assertIn('<link href="/static/assets/main.css" rel="stylesheet" />', html)
+        self.assertIn(
+            '<link href="/static/assets/vendor.js" rel="modulepreload" />', html
+        )
+        self.assertIn('<html lang="en-us">', html)
+
+    def test_shell_is_reused(self):
+        shell = self.cache.get("django_bridge/bootstrap.html", ASSETS)
+        self.assertIs(self.cache.get("django_bridge/bootstrap.html", ASSETS), shell)
+
+    def test_shell_varies_on_assets(self):
+        shell = self.cache.get("django_bridge/bootstrap.html", ASSETS)
+        new_shell = self.cache.get(
+            "django_bridge/bootstrap.html", {**ASSETS, "js": ["/static/assets/new.js"]}
+        )
+        self.assertIsNot(new_shell, shell)
+        self.assertIn("/static/assets/new.js", new_shell.render("", ""))
+
+    def test_least_recently_used_shells_are_dropped(self):
+        cache = BootstrapShellCache(max_size=2)
+        old_assets = {**ASSETS, "js": ["/static/assets/old.js"]}
+        new_assets = {**ASSETS, "js": ["/static/assets/new.js"]}
+
+        shell = cache.get("django_bridge/bootstrap.html", ASSETS)
+        old_shell = cache.get("django_bridge/bootstrap.html", old_assets)
+        cache.get("django_bridge/bootstrap.html", ASSETS)
+        cache.get("django_bridge/bootstrap.html", new_assets)
+
+        self.assertEqual(len(cache.shells), 2)
+        self.assertIs(cache.get("django_bridge/bootstrap.html", ASSETS), shell)
+        self.assertIsNot(
+            cache.get("django_bridge/bootstrap.html", old_assets), old_shell
+        )
+
+    @override_settings(LANGUAGES=[("en", "English"), ("fr", "French")])
+    def test_shell_varies_on_language(self):
+        with translation.override("fr"):
+            html = self.cache.get("django_bridge/bootstrap.html", ASSETS).render("", "")
+
+        self.assertIn('<html lang="fr">', html)
@@ -0,0 +1,121 @@
+import threading
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from .singleflight import SingleFlight
+
+
+class TestSingleFlight(SimpleTestCase):
+    def setUp(self):
+        self.calls = SingleFlight()
+
+    def test_concurrent_calls_are_coalesced(self):
+        started = threading.Event()
+        release = threading.Event()
+        func_calls = []
+
+        def func():
+            func_calls.append(1)
+            started.set()
+            release.wait()
+            return "result"
+
+        results = []
+
+        def call():
+            results.append(self.calls.do("key", func))
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        started.wait()
+
+        waiters = [threading.Thread(target=call) for i in range(3)]
+        for waiter in waiters:
+            waiter.start()
+
+        # Give the waiters time to start waiting for the leader's call
+        time.sleep(0.1)
+
+        release.set()
+        for thread in [leader, *waiters]:
+            thread.join()
+
+        self.assertEqual(results, ["result"] * 4)
+        self.assertEqual(len(func_calls), 1)
+        self.assertEqual(self.calls.calls, {})
+
+    def test_errors_are_raised_in_waiters(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def func():
+            started.set()
+            release.wait()
+            raise ValueError("Failed")
+
+        errors = []
+
+        def call():
+            try:
+                self.calls.do("key", func)
+            except ValueError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for i in range(2)]
+        threads[0].start()
+        started.wait()
+        threads[1].start()
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(errors), 2)
+        self.assertEqual(self.calls.results, {})
+
+    def test_waiters_give_up_after_wait_timeout(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_func():
+            started.set()
+            release.wait()
+            return "leader"
+
+        leader = threading.Thread(target=self.calls.do, args=["key", slow_func])
+        leader.start()
+        started.wait()
+
+        try:
+            result = self.calls.do("key", lambda: "waiter", wait_timeout=0.1)
+        finally:
+            release.set()
+            leader.join()
+
+        self.assertEqual(result, "waiter")
+
+    def test_results_are_kept_for_timeout(self):
+        func = mock.Mock(side_effect=["first", "second"])
+
+        with mock.patch("time.monotonic", return_value=100):
+            self.assertEqual(self.calls.do("key", func, timeout=1), "first")
+
+        with mock.patch("time.monotonic", return_value=100.5):
+            self.assertEqual(self.calls.do("key", func, timeout=1), "first")
+
+        with mock.patch("time.monotonic", return_value=101):
+            self.assertEqual(self.calls.do("key", func, timeout=1), "second")
+
+        self.assertEqual(func.call_count, 2)
+
+    def test_results_are_not_kept_without_timeout(self):
+        func = mock.Mock(side_effect=["first", "second"])
+
+        self.assertEqual(self.calls.do("key", func), "first")
+        self.assertEqual(self.calls.do("key", func), "second")
+
+    def test_keys(self):
+        self.assertEqual(self.calls.do("a", lambda: "a", timeout=1), "a")
+        self.assertEqual(self.calls.do("b", lambda: "b", timeout=1), "b")
+        self.assertEqual(self.calls.do("a", lambda: "c", timeout=1), "a")
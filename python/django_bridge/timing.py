@@ -0,0 +1,97 @@
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_timings = ContextVar("django_bridge_timings", default=None)
+
+# Matches the characters that aren't allowed in a Server-Timing metric name
+# (an HTTP token, see RFC 9110)
+_NON_TOKEN_RE = re.compile(r"[^A-Za-z0-9!#$%&'*+\-.^_`|~]")
+
+
+class Timings:
+    """
+    Records how long each phase of building a response took.
+
+    Durations are in milliseconds.
+    """
+
+    def __init__(self):
+        # A list of (name, duration, description) tuples, in the order they
+        # finished
+        self.entries = []
+
+    def add(self, name, duration, description=None):
+        self.entries.append((name, duration, description))
+
+    @contextmanager
+    def measure(self, name, description=None):
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - started_at) * 1000, description)
+
+    def as_dict(self):
+        """
+        Returns the total duration of each phase, keyed by name.
+        """
+        durations = {}
+        for name, duration, description in self.entries:
+            durations[name] = durations.get(name, 0) + duration
+
+        return durations
+
+    def as_header(self):
+        """
+        Returns the timings formatted as a Server-Timing header value.
+
+        Characters that aren't valid in a metric name are replaced with
+        underscores. The description is left as it is.
+        """
+        metrics = []
+        for name, duration, description in self.entries:
+            name = _NON_TOKEN_RE.sub("_", name) or "_"
+            metric = f"{name};dur={duration:.1f}"
+            if description:
+                description = description.replace("\\", "\\\\").replace('"', '\\"')
+                metric += f';desc="{description}"'
+
+            metrics.append(metric)
+
+        return ", ".join(metrics)
+
+
+@contextmanager
+def collect_timings():
+    """
+    Records the timings of everything measured within the block.
+    """
+    timings = Timings()
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+def get_timings():
+    """
+    Returns the Timings currently being recorded, if any.
+    """
+    return _timings.get()
+
+
+@contextmanager
+def measure(name, description=None):
+    """
+    Measures the duration of the block, if timings are being recorded.
+    """
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+
+    with timings.measure(name, description):
+        yield
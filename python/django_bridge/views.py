@@ -1,16 +1,50 @@
+import asyncio
+import hashlib
+import json
+import operator
 import warnings
+from functools import partial, reduce
+
+from django.core import signing
+from django.core.cache import caches
+from django.core.exceptions import (
+    ImproperlyConfigured,
+    PermissionDenied,
+    ValidationError,
+)
+from django.core.handlers.exception import response_for_exception
+from django.db.models import Q
+from django.http import (
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseForbidden,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.utils.cache import patch_cache_control
+from django.utils.translation import get_language
 from django.views.generic.base import ContextMixin, View
 
-from .response import Response
+from .adapters.registry import Prepacked
+from .conf import get_config
+from .response import Lazy, Response, process_response
+from .live import get_live_channels
 from .metadata import Metadata
+from .singleflight import calls
+from .subrequests import SHARED_ATTRIBUTES, build_subrequest, dispatch_subrequest
+
 
 class DjangoBridgeMixin:
     """A mixin that can be used to render a view with a React component."""
 
+    # Lets redirects to this view be followed on the server
+    django_bridge_view = True
+
     title = None
     metadata = None
     view_name = None
     overlay = False
+    channels = None
     response_class = Response
 
     def get_title(self):
@@ -26,6 +60,9 @@ class DjangoBridgeMixin:
             return Metadata(title=self.get_title())
         return self.metadata
 
+    def get_channels(self):
+        return self.channels
+
     def render_to_response(self, props):
         """
         Return a response, using the `response_class` for this view, with a
@@ -39,6 +76,7 @@ class DjangoBridgeMixin:
             props,
             overlay=self.overlay,
             metadata=self.get_metadata(),
+            channels=self.get_channels(),
         )
 
 
@@ -53,3 +91,441 @@ class DjangoBridgeView(DjangoBridgeMixin, ContextMixin, View):
     def get(self, request, *args, **kwargs):
         context = self.get_context_data(**kwargs)
         return self.render_to_response(context)
+
+
+class PackedPropsMixin:
+    """
+    Base class for mixins for DjangoBridgeView that reuse the packed props of
+    a view between requests.
+
+    Props are packed without a request, so they can't be deferred or lazy.
+    """
+
+    def get_packed_props(self, **kwargs):
+        props = self.get_context_data(**kwargs)
+        for name, value in props.items():
+            if isinstance(value, Lazy):
+                raise ImproperlyConfigured(
+                    f"{self.__class__.__name__} can't use deferred or lazy props "
+                    f"(found '{name}')"
+                )
+
+        return get_config().pack(props)
+
+    def get(self, request, *args, **kwargs):
+        return self.render_to_response(Prepacked(self.get_packed_props(**kwargs)))
+
+
+class SingleFlightMixin(PackedPropsMixin):
+    """
+    A mixin for DjangoBridgeView that computes the props of identical
+    requests that are made at the same time only once.
+
+    Requests are identical if they have the same path, query string and
+    vary key (see get_singleflight_vary_key()). The first request builds and
+    packs the props, and any identical requests that arrive while it's doing
+    so wait for it and share the packed props. They are also shared with
+    identical requests made within ``singleflight_timeout`` seconds of them
+    being packed. Requests that have waited for more than
+    ``singleflight_wait_timeout`` seconds build the props themselves.
+
+    Messages and context providers are still computed for each request.
+    The props must not vary on anything that isn't part of the key (the
+    language is part of the key).
+    """
+
+    singleflight_timeout = 1
+    singleflight_wait_timeout = 10
+
+    def get_singleflight_vary_key(self):
+        """
+        Returns a value that the props vary on, other than the path and the
+        query string. For example, return ``self.request.user.pk`` if the
+        props are different for each user.
+        """
+        return None
+
+    def get_singleflight_key(self):
+        return (
+            type(self).__module__,
+            type(self).__qualname__,
+            self.request.get_full_path(),
+            get_language(),
+            self.get_singleflight_vary_key(),
+        )
+
+    def get_packed_props(self, **kwargs):
+        return calls.do(
+            self.get_singleflight_key(),
+            partial(super().get_packed_props, **kwargs),
+            timeout=self.singleflight_timeout,
+            wait_timeout=self.singleflight_wait_timeout,
+        )
+
+
+class CachedPropsMixin(PackedPropsMixin):
+    """
+    A mixin for DjangoBridgeView that caches the packed props of the view in
+    Django's cache framework.
+
+    Props are cached for each path, query string, language and vary key
+    (see get_cache_vary_key()). Changing ``cache_version`` invalidates all
+    of the cached props of the view. Messages and context providers are
+    still computed for each request.
+    """
+
+    cache_alias = "default"
+    cache_timeout = 300
+    cache_version = None
+
+    def get_cache_vary_key(self):
+        """
+        Returns a value that the props vary on, other than the path, the
+        query string and the language. For example, return
+        ``self.request.user.pk`` if the props are different for each user.
+        """
+        return None
+
+    def get_cache_key(self):
+        key = repr(
+            (
+                type(self).__module__,
+                type(self).__qualname__,
+                self.request.get_full_path(),
+                get_language(),
+                self.get_cache_vary_key(),
+            )
+        )
+        return f"django_bridge:view:{hashlib.sha256(key.encode()).hexdigest()}"
+
+    def get_packed_props(self, **kwargs):
+        cache = caches[self.cache_alias]
+        cache_key = self.get_cache_key()
+
+        packed_props = cache.get(cache_key, version=self.cache_version)
+        if packed_props is None:
+            packed_props = super().get_packed_props(**kwargs)
+            cache.set(
+                cache_key,
+                packed_props,
+                self.cache_timeout,
+                version=self.cache_version,
+            )
+
+        return packed_props
+
+
+class RemoteChoicesView(View):
+    """
+    Returns the choices of a RemoteSelect widget as JSON, one page at a time.
+
+    Choices are taken from either ``queryset`` or ``choices`` (a list of
+    ``(value, label)`` tuples). The following query parameters are supported:
+
+    q: Only return choices that match this search term.
+    page: The page number to return, starting at 1.
+    value: Only return the choices with these values. This is used to fetch
+        the labels of the selected choices.
+
+    The response contains a ``results`` list of ``{"value", "label"}``
+    objects, and ``more`` which is true if there is a next page.
+
+    Anyone can fetch the choices by default. Override has_permission() to
+    restrict who can see them.
+    """
+
+    queryset = None
+    choices = None
+    search_fields = []
+    value_field = "pk"
+    paginate_by = 20
+
+    def has_permission(self):
+        """
+        Returns True if the current user is allowed to see the choices.
+        """
+        return True
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.has_permission():
+            raise PermissionDenied
+
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_queryset(self):
+        if self.queryset is None:
+            return None
+
+        queryset = self.queryset.all()
+        if not queryset.ordered:
+            # Pages must be stable
+            queryset = queryset.order_by(self.value_field)
+
+        return queryset
+
+    def get_choices(self):
+        return self.choices
+
+    def get_search_lookup(self, field_name):
+        # Same prefixes as ModelAdmin.search_fields
+        if field_name.startswith("^"):
+            return f"{field_name[1:]}__istartswith"
+        elif field_name.startswith("="):
+            return f"{field_name[1:]}__iexact"
+
+        return f"{field_name}__icontains"
+
+    def filter_queryset(self, queryset, search_term, values):
+        if values is not None:
+            return queryset.filter(**{f"{self.value_field}__in": values})
+
+        if search_term:
+            if not self.search_fields:
+                raise ImproperlyConfigured(
+                    f"{self.__class__.__name__} must define search_fields to "
+                    "search a queryset"
+                )
+
+            queryset = queryset.filter(
+                reduce(
+                    operator.or_,
+                    (
+                        Q(**{self.get_search_lookup(field_name): search_term})
+                        for field_name in self.search_fields
+                    ),
+                )
+            )
+
+        return queryset
+
+    def filter_choices(self, choices, search_term, values):
+        if values is not None:
+            return [choice for choice in choices if str(choice[0]) in values]
+
+        if search_term:
+            search_term = search_term.casefold()
+            choices = [
+                choice for choice in choices if search_term in str(choice[1]).casefold()
+            ]
+
+        return choices
+
+    def get_value(self, obj):
+        if self.value_field == "pk":
+            return obj.pk
+
+        return getattr(obj, self.value_field)
+
+    def get_label(self, obj):
+        return str(obj)
+
+    def get_page(self, request):
+        try:
+            return max(int(request.GET.get("page", 1)), 1)
+        except ValueError:
+            return 1
+
+    def get(self, request, *args, **kwargs):
+        search_term = request.GET.get("q", "").strip()
+        values = request.GET.getlist("value") or None
+        page = self.get_page(request)
+
+        # Fetch one extra choice to find out if there's a next page. This
+        # avoids counting all the choices, which is slow on large tables
+        start = (page - 1) * self.paginate_by
+        stop = start + self.paginate_by + 1
+
+        queryset = self.get_queryset()
+        if queryset is not None:
+            try:
+                objects = list(
+                    self.filter_queryset(queryset, search_term, values)[start:stop]
+                )
+            except (ValueError, ValidationError):
+                # Invalid values
+                objects = []
+
+            choices = [(self.get_value(obj), self.get_label(obj)) for obj in objects]
+        else:
+            choices = self.get_choices()
+            if choices is None:
+                raise ImproperlyConfigured(
+                    f"{self.__class__.__name__} must define either queryset or choices"
+                )
+
+            choices = self.filter_choices(list(choices), search_term, values)[
+                start:stop
+            ]
+
+        return JsonResponse(
+            {
+                "results": [
+                    {"value": value, "label": str(label)}
+                    for value, label in choices[: self.paginate_by]
+                ],
+                "more": len(choices) > self.paginate_by,
+            }
+        )
+
+
+class BatchView(View):
+    """
+    Handles several Django Bridge GET requests in one round trip.
+
+    The request body is a JSON object with a ``requests`` list, where each
+    item has a ``path`` and, optionally, ``headers`` to send with it (only
+    ``X-DjangoBridge-*`` headers are allowed). Each request is dispatched to
+    its view in-process, sharing the other headers of the batch request and
+    the request attributes in ``shared_attributes`` (the session and user by
+    default).
+
+    Only the process_view() method of each middleware is called for the
+    batched requests. Attributes that other middleware sets on the request
+    (for example, the current tenant) must be added to ``shared_attributes``
+    for views to see them.
+
+    The response contains a ``responses`` list with the ``status``,
+    ``headers`` and ``body`` of each response. The body is null if the
+    response isn't a Django Bridge response.
+
+    Batched views can have side effects (such as showing messages), so
+    this view is CSRF protected. Requests must also be JSON and have the
+    ``X-Requested-With: DjangoBridge`` header, which browsers don't allow
+    other sites to send without a CORS preflight.
+    """
+
+    http_method_names = ["post"]
+    max_requests = 10
+    shared_attributes = SHARED_ATTRIBUTES
+
+    def parse_requests(self, request):
+        try:
+            items = json.loads(request.body)["requests"]
+        except (ValueError, KeyError, TypeError):
+            return None
+
+        if not isinstance(items, list) or len(items) > self.max_requests:
+            return None
+
+        for item in items:
+            if not isinstance(item, dict) or not isinstance(item.get("path"), str):
+                return None
+
+            if not item["path"].startswith("/"):
+                return None
+
+            headers = item.setdefault("headers", {})
+            if not isinstance(headers, dict) or not all(
+                isinstance(value, str) and name.lower().startswith("x-djangobridge-")
+                for name, value in headers.items()
+            ):
+                return None
+
+        return items
+
+    def post(self, request, *args, **kwargs):
+        if (
+            request.content_type != "application/json"
+            or request.headers.get("X-Requested-With") != "DjangoBridge"
+        ):
+            return HttpResponseBadRequest()
+
+        items = self.parse_requests(request)
+        if items is None:
+            return HttpResponseBadRequest()
+
+        config = get_config()
+        response = HttpResponse(content_type="application/json")
+
+        parts = []
+        for item in items:
+            subrequest = build_subrequest(
+                request, item["path"], item["headers"], self.shared_attributes
+            )
+            try:
+                subresponse = process_response(
+                    subrequest, dispatch_subrequest(request, subrequest), config
+                )
+            except Exception as e:
+                # Only fail this request, rather than the whole batch
+                subresponse = response_for_exception(subrequest, e)
+            response.cookies.update(subresponse.cookies)
+
+            is_bridge_response = "X-DjangoBridge-Action" in subresponse
+            headers = {
+                name: value
+                for name, value in subresponse.items()
+                if name.lower().startswith("x-djangobridge-")
+            }
+            parts.append(
+                b'{"status":%d,"headers":%s,"body":%s}'
+                % (
+                    subresponse.status_code,
+                    config.json_backend.dumps(headers),
+                    subresponse.content if is_bridge_response else b"null",
+                )
+            )
+
+        # The bodies of the responses are already JSON, so they are embedded
+        # as they are rather than being decoded and encoded again
+        response.content = b'{"responses":[' + b",".join(parts) + b"]}"
+        patch_cache_control(response, no_store=True)
+        return response
+
+
+class LiveStreamView(View):
+    """
+    Streams the messages published to the channels of a view to the client
+    as server-sent events.
+
+    The channels are given in a signed ``token`` query parameter, so clients
+    can only subscribe to the channels of views they have been sent. Tokens
+    can only be used by the user they were sent to, and expire after
+    LIVE_TOKEN_MAX_AGE seconds. This view is async, so it must be served with
+    ASGI to avoid holding a worker for every open stream.
+    """
+
+    http_method_names = ["get"]
+
+    # Seconds between comments sent to keep idle connections open
+    keepalive_interval = 15
+
+    # Milliseconds the client waits before reconnecting to a dropped stream
+    retry = 5000
+
+    async def get(self, request, *args, **kwargs):
+        config = get_config()
+        user = await request.auser() if hasattr(request, "auser") else None
+
+        try:
+            channels = get_live_channels(
+                request.GET.get("token", ""), user, config.live_token_max_age
+            )
+        except signing.BadSignature:
+            return HttpResponseForbidden()
+
+        response = StreamingHttpResponse(
+            self.stream(config.live_backend, channels),
+            content_type="text/event-stream",
+        )
+        patch_cache_control(response, no_cache=True)
+        # Stop nginx from buffering the events
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def stream(self, backend, channels):
+        subscription = backend.subscribe(channels)
+        try:
+            yield f"retry: {self.retry}\n\n".encode()
+
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        anext(subscription), self.keepalive_interval
+                    )
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                else:
+                    yield f"data: {message}\n\n".encode()
+        finally:
+            subscription.close()
@@ -0,0 +1,10 @@
+from django.http import HttpResponseForbidden
+from django.utils.deprecation import MiddlewareMixin
+
+from .views import balance
+
+
+class ForbidBalanceMiddleware(MiddlewareMixin):
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if view_func is balance:
+            return HttpResponseForbidden()
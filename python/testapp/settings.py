@@ -49,6 +49,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "django_bridge.middleware.DjangoBridgeMiddleware",
 ]
 
 ROOT_URLCONF = "testapp.urls"
@@ -133,3 +134,13 @@ STATIC_ROOT = BASE_DIR / "test-static"
 STATIC_URL = "/static/"
 
 MEDIA_ROOT = BASE_DIR / "test-media"
+
+
+# Django Bridge settings
+
+DJANGO_BRIDGE = {
+    "VITE_DEVSERVER_URL": "http://localhost:5173/static",
+    "CONTEXT_PROVIDERS": {
+        "csrf_token": "django.middleware.csrf.get_token",
+    },
+}
@@ -0,0 +1,186 @@
+import json
+
+from django.conf import settings
+from django.test import Client, RequestFactory, TestCase, override_settings
+
+from django_bridge.subrequests import build_subrequest
+
+
+class TestBatchView(TestCase):
+    def batch(self, requests, **headers):
+        return self.client.post(
+            "/batch/",
+            json.dumps({"requests": requests}),
+            content_type="application/json",
+            headers={"X-Requested-With": "DjangoBridge", **headers},
+        )
+
+    def test_batch(self):
+        response = self.batch([{"path": "/"}, {"path": "/counter/3/"}])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+        first, second = response.json()["responses"]
+        self.assertEqual(first["status"], 200)
+        self.assertEqual(first["headers"]["X-DjangoBridge-Action"], "render")
+        self.assertEqual(first["body"]["view"], "Home")
+        self.assertEqual(second["body"]["view"], "Counter")
+        self.assertEqual(
+            second["body"]["props"], {"count": 3, "message": "Hello world!"}
+        )
+
+    def test_query_string(self):
+        response = self.batch([{"path": "/choices/colours/?q=re"}])
+        # Not a Django Bridge response
+        self.assertEqual(response.json()["responses"][0]["body"], None)
+
+    def test_headers(self):
+        response = self.batch(
+            [
+                {
+                    "path": "/dashboard/",
+                    "headers": {
+                        "X-DjangoBridge-Only": "stats",
+                        "X-DjangoBridge-View": "Dashboard",
+                    },
+                },
+                {"path": "/dashboard/"},
+            ]
+        )
+
+        partial, full = response.json()["responses"]
+        self.assertTrue(partial["body"]["partial"])
+        self.assertEqual(set(partial["body"]["props"]), {"stats"})
+        self.assertEqual(set(full["body"]["props"]), {"title", "stats", "alerts"})
+
+    def test_session_is_shared(self):
+        self.client.get("/add-message/")
+
+        response = self.batch([{"path": "/"}, {"path": "/counter/1/"}])
+
+        first, second = response.json()["responses"]
+        self.assertEqual(
+            first["body"]["messages"], [{"level": "success", "html": "Saved"}]
+        )
+        self.assertEqual(second["body"]["messages"], [])
+
+        # The messages were consumed
+        response = self.batch([{"path": "/"}])
+        self.assertEqual(response.json()["responses"][0]["body"]["messages"], [])
+
+    def test_redirect(self):
+        response = self.batch([{"path": "/old-home/"}])
+        self.assertEqual(
+            response.json()["responses"][0]["body"],
+            {"action": "redirect", "path": "/"},
+        )
+
+    def test_not_found(self):
+        response = self.batch([{"path": "/does-not-exist/"}])
+        self.assertEqual(
+            response.json()["responses"][0],
+            {"status": 404, "headers": {}, "body": None},
+        )
+
+    @override_settings(
+        MIDDLEWARE=settings.MIDDLEWARE + ["testapp.middleware.ForbidBalanceMiddleware"]
+    )
+    def test_process_view_middleware(self):
+        response = self.batch([{"path": "/balance/"}, {"path": "/"}])
+
+        forbidden, home = response.json()["responses"]
+        self.assertEqual(forbidden["status"], 403)
+        self.assertEqual(home["status"], 200)
+
+    def test_error_in_one_request(self):
+        self.client.raise_request_exception = False
+        response = self.batch([{"path": "/unpackable/"}, {"path": "/"}])
+        self.assertEqual(response.status_code, 200)
+
+        error, home = response.json()["responses"]
+        self.assertEqual(error["status"], 500)
+        self.assertEqual(home["body"]["view"], "Home")
+
+    def test_shared_attributes(self):
+        request = RequestFactory().get("/batch/")
+        request.user = "user"
+        request.tenant = "tenant"
+
+        subrequest = build_subrequest(request, "/")
+        self.assertEqual(subrequest.user, "user")
+        self.assertFalse(hasattr(subrequest, "tenant"))
+
+        subrequest = build_subrequest(request, "/", shared_attributes=["tenant"])
+        self.assertEqual(subrequest.tenant, "tenant")
+        self.assertFalse(hasattr(subrequest, "user"))
+
+    def test_scheme(self):
+        request = RequestFactory().get("/batch/", secure=True)
+
+        subrequest = build_subrequest(request, "/counter/1/")
+        self.assertTrue(subrequest.is_secure())
+        self.assertEqual(
+            subrequest.build_absolute_uri(), "https://testserver/counter/1/"
+        )
+
+    @override_settings(SECURE_PROXY_SSL_HEADER=("HTTP_X_FORWARDED_PROTO", "https"))
+    def test_scheme_behind_proxy(self):
+        request = RequestFactory().get("/batch/", HTTP_X_FORWARDED_PROTO="https")
+
+        subrequest = build_subrequest(request, "/counter/1/")
+        self.assertTrue(subrequest.is_secure())
+
+    def test_invalid_requests(self):
+        for requests in [
+            None,
+            [{}],
+            [{"path": "https://example.com/"}],
+            [{"path": "/", "headers": {"Cookie": "sessionid=abc"}}],
+            [{"path": "/"}] * 11,
+        ]:
+            with self.subTest(requests=requests):
+                self.assertEqual(self.batch(requests).status_code, 400)
+
+    def test_csrf_protected(self):
+        client = Client(enforce_csrf_checks=True)
+        client.get("/")
+        body = json.dumps({"requests": [{"path": "/"}]})
+
+        response = client.post(
+            "/batch/",
+            body,
+            content_type="application/json",
+            headers={"X-Requested-With": "DjangoBridge"},
+        )
+        self.assertEqual(response.status_code, 403)
+
+        response = client.post(
+            "/batch/",
+            body,
+            content_type="application/json",
+            headers={
+                "X-Requested-With": "DjangoBridge",
+                "X-CSRFToken": client.cookies[settings.CSRF_COOKIE_NAME].value,
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_cross_site_form_rejected(self):
+        # What a <form enctype="text/plain"> on another site could send
+        response = self.client.post(
+            "/batch/",
+            json.dumps({"requests": [{"path": "/"}]}),
+            content_type="text/plain",
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(
+            "/batch/",
+            json.dumps({"requests": [{"path": "/"}]}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_not_allowed(self):
+        response = self.client.get("/batch/")
+        self.assertEqual(response.status_code, 405)
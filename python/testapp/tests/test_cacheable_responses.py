@@ -0,0 +1,51 @@
+from django.test import TestCase, override_settings
+
+
+@override_settings(
+    DJANGO_BRIDGE={
+        "VITE_DEVSERVER_URL": "http://localhost:5173/static",
+        "CACHEABLE_RESPONSES": True,
+    }
+)
+class TestCacheableResponses(TestCase):
+    def test_json_response(self):
+        response = self.client.get("/", HTTP_X_REQUESTED_WITH="DjangoBridge")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertIn("X-Requested-With", response["Vary"])
+        self.assertIn("no-cache", response["Cache-Control"])
+        self.assertIn("private", response["Cache-Control"])
+        self.assertNotIn("no-store", response["Cache-Control"])
+
+    def test_not_modified(self):
+        response = self.client.get("/", HTTP_X_REQUESTED_WITH="DjangoBridge")
+
+        response = self.client.get(
+            "/",
+            HTTP_X_REQUESTED_WITH="DjangoBridge",
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_modified(self):
+        response = self.client.get(
+            "/",
+            HTTP_X_REQUESTED_WITH="DjangoBridge",
+            HTTP_IF_NONE_MATCH='"outdated"',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["props"], {"message": "Hello world!"})
+
+    def test_html_response_varies(self):
+        response = self.client.get("/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("X-Requested-With", response["Vary"])
+
+    @override_settings(
+        DJANGO_BRIDGE={"VITE_DEVSERVER_URL": "http://localhost:5173/static"}
+    )
+    def test_disabled_by_default(self):
+        response = self.client.get("/", HTTP_X_REQUESTED_WITH="DjangoBridge")
+        self.assertNotIn("ETag", response)
+        self.assertIn("no-store", response["Cache-Control"])
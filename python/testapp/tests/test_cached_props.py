@@ -0,0 +1,70 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+
+from testapp.views import CatalogueView
+
+
+class TestCachedPropsMixin(TestCase):
+    def setUp(self):
+        cache.clear()
+        CatalogueView.builds = 0
+
+    def get(self, path):
+        return self.client.get(path, headers={"X-Requested-With": "DjangoBridge"})
+
+    def test_props_are_cached(self):
+        response = self.get("/catalogue/")
+        self.assertEqual(response.json()["props"], {"products": 0})
+
+        User.objects.create(username="admin")
+
+        response = self.get("/catalogue/")
+        self.assertEqual(response.json()["props"], {"products": 0})
+        self.assertEqual(CatalogueView.builds, 1)
+
+    def test_full_page_load_uses_cached_props(self):
+        self.get("/catalogue/")
+        User.objects.create(username="admin")
+
+        response = self.client.get("/catalogue/")
+        self.assertContains(response, '"props":{"products":0}')
+        self.assertEqual(CatalogueView.builds, 1)
+
+    def test_query_string_is_part_of_key(self):
+        self.get("/catalogue/")
+        User.objects.create(username="admin")
+
+        response = self.get("/catalogue/?page=2")
+        self.assertEqual(response.json()["props"], {"products": 1})
+        self.assertEqual(CatalogueView.builds, 2)
+
+    def test_vary_key(self):
+        self.get("/catalogue/")
+        user = User.objects.create(username="admin")
+        self.client.force_login(user)
+
+        response = self.get("/catalogue/")
+        self.assertEqual(response.json()["props"], {"products": 1})
+        self.assertEqual(CatalogueView.builds, 2)
+
+    def test_cache_version(self):
+        self.get("/catalogue/")
+        User.objects.create(username="admin")
+
+        CatalogueView.cache_version = 2
+        try:
+            response = self.get("/catalogue/")
+        finally:
+            CatalogueView.cache_version = None
+
+        self.assertEqual(response.json()["props"], {"products": 1})
+
+    def test_messages_are_not_cached(self):
+        self.get("/catalogue/")
+        self.client.get("/add-message/")
+
+        response = self.get("/catalogue/")
+        self.assertEqual(
+            response.json()["messages"], [{"level": "success", "html": "Saved"}]
+        )
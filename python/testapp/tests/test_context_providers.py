@@ -0,0 +1,165 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.test import RequestFactory, TestCase, override_settings
+
+from django_bridge.context_providers import (
+    BoundedExecutor,
+    ContextProvider,
+    call_providers,
+    context_provider,
+)
+
+
+def sync_provider(request):
+    return "sync"
+
+
+async def async_provider(request):
+    await asyncio.sleep(0)
+    return "async"
+
+
+@context_provider(lazy=True)
+def lazy_provider(request):
+    return "lazy"
+
+
+@context_provider(timeout=0.01, fallback="fallback")
+def slow_provider(request):
+    time.sleep(0.5)
+    return "slow"
+
+
+@context_provider(timeout=0.01, fallback="fallback")
+async def slow_async_provider(request):
+    await asyncio.sleep(0.5)
+    return "slow"
+
+
+@override_settings(
+    DJANGO_BRIDGE={
+        "VITE_DEVSERVER_URL": "http://localhost:5173/static",
+        "CONTEXT_PROVIDERS": {
+            "a": "testapp.tests.test_context_providers.async_provider",
+            "b": "testapp.tests.test_context_providers.sync_provider",
+        },
+    }
+)
+class TestAsyncContextProviders(TestCase):
+    def test_sync_request(self):
+        response = self.client.get("/", HTTP_X_REQUESTED_WITH="DjangoBridge")
+        self.assertEqual(response.json()["context"], {"a": "async", "b": "sync"})
+
+    async def test_async_request(self):
+        response = await self.async_client.get(
+            "/", headers={"X-Requested-With": "DjangoBridge"}
+        )
+        self.assertEqual(response.json()["context"], {"a": "async", "b": "sync"})
+        self.assertEqual(list(response.json()["context"].keys()), ["a", "b"])
+
+
+@override_settings(
+    DJANGO_BRIDGE={
+        "VITE_DEVSERVER_URL": "http://localhost:5173/static",
+        "CONTEXT_PROVIDERS": {
+            "lazy": "testapp.tests.test_context_providers.lazy_provider",
+            "sync": "testapp.tests.test_context_providers.sync_provider",
+        },
+    }
+)
+class TestLazyContextProviders(TestCase):
+    def test_lazy_provider_is_called_if_not_loaded(self):
+        response = self.client.get(
+            "/",
+            HTTP_X_REQUESTED_WITH="DjangoBridge",
+            HTTP_X_DJANGOBRIDGE_CONTEXT_LOADED="sync",
+        )
+        self.assertEqual(response.json()["context"], {"lazy": "lazy", "sync": "sync"})
+
+    def test_lazy_provider_is_skipped_if_loaded(self):
+        response = self.client.get(
+            "/",
+            HTTP_X_REQUESTED_WITH="DjangoBridge",
+            HTTP_X_DJANGOBRIDGE_CONTEXT_LOADED="lazy,sync",
+        )
+        self.assertEqual(response.json()["context"], {"sync": "sync"})
+
+
+@override_settings(
+    DJANGO_BRIDGE={
+        "VITE_DEVSERVER_URL": "http://localhost:5173/static",
+        "CONTEXT_PROVIDERS": {
+            "sync": "testapp.tests.test_context_providers.sync_provider",
+            "slow": "testapp.tests.test_context_providers.slow_provider",
+            "slow_async": "testapp.tests.test_context_providers.slow_async_provider",
+        },
+        "CONTEXT_PROVIDER_THREADS": 2,
+    }
+)
+class TestContextProviderTimeouts(TestCase):
+    def test_fallback_is_used_on_timeout(self):
+        response = self.client.get("/", HTTP_X_REQUESTED_WITH="DjangoBridge")
+        self.assertEqual(
+            response.json()["context"],
+            {"sync": "sync", "slow": "fallback", "slow_async": "fallback"},
+        )
+
+
+class TestCallProviders(TestCase):
+    def test_timed_out_providers_dont_hold_executor_threads(self):
+        request = RequestFactory().get("/")
+        providers = {
+            "slow": ContextProvider.wrap(slow_provider),
+            "sync": ContextProvider.wrap(sync_provider),
+        }
+        timeout_executor = BoundedExecutor(max_workers=1)
+        self.addCleanup(timeout_executor.shutdown, wait=False)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            started_at = time.monotonic()
+            for i in range(2):
+                self.assertEqual(
+                    call_providers(
+                        request,
+                        providers,
+                        executor=executor,
+                        timeout_executor=timeout_executor,
+                    ),
+                    {"slow": "fallback", "sync": "sync"},
+                )
+
+            # The slow provider would otherwise block the only thread
+            self.assertLess(time.monotonic() - started_at, 0.4)
+
+    def test_saturated_timeout_executor_uses_fallback(self):
+        request = RequestFactory().get("/")
+        calls = []
+
+        def hanging_provider(request):
+            calls.append(1)
+            time.sleep(0.5)
+            return "slow"
+
+        providers = {
+            "slow": ContextProvider(hanging_provider, timeout=0.01, fallback="fallback")
+        }
+        timeout_executor = BoundedExecutor(max_workers=1)
+        self.addCleanup(timeout_executor.shutdown, wait=False)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            for i in range(3):
+                self.assertEqual(
+                    call_providers(
+                        request,
+                        providers,
+                        executor=executor,
+                        timeout_executor=timeout_executor,
+                    ),
+                    {"slow": "fallback"},
+                )
+
+        # Only the first call got a thread, the others used the fallback
+        # straight away
+        self.assertEqual(len(calls), 1)
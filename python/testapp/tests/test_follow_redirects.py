@@ -0,0 +1,109 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from testapp.views import ColourChoicesView
+
+
+@override_settings(
+    DJANGO_BRIDGE={
+        "VITE_DEVSERVER_URL": "http://localhost:5173/static",
+        "FOLLOW_REDIRECTS": True,
+    }
+)
+class TestFollowRedirects(TestCase):
+    def post(self, path):
+        return self.client.post(path, headers={"X-Requested-With": "DjangoBridge"})
+
+    def test_follow_redirect(self):
+        response = self.post("/save/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-DjangoBridge-Action"], "render")
+        self.assertEqual(response["X-DjangoBridge-Path"], "/counter/1/?saved=1")
+
+        data = response.json()
+        self.assertEqual(data["view"], "Counter")
+        self.assertEqual(data["messages"], [{"level": "success", "html": "Saved"}])
+
+    def test_absolute_url(self):
+        response = self.post("/save/?next=http://testserver/profile/")
+        self.assertEqual(response["X-DjangoBridge-Path"], "/profile/")
+        self.assertEqual(response.json()["view"], "Profile")
+
+    async def test_async_follow_redirect(self):
+        # The followed view queries the database, which can't be done on the
+        # event loop
+        response = await self.async_client.post(
+            "/save/?next=/dashboard/", headers={"X-Requested-With": "DjangoBridge"}
+        )
+
+        self.assertEqual(response["X-DjangoBridge-Path"], "/dashboard/")
+        data = response.json()
+        self.assertEqual(data["props"]["stats"], {"users": 0})
+        self.assertEqual(data["messages"], [{"level": "success", "html": "Saved"}])
+
+    def test_secure_request(self):
+        response = self.client.post(
+            "/save/?next=https://testserver/profile/",
+            headers={"X-Requested-With": "DjangoBridge"},
+            secure=True,
+        )
+        self.assertEqual(response["X-DjangoBridge-Path"], "/profile/")
+        self.assertEqual(response.json()["view"], "Profile")
+
+    def test_redirect_to_another_site(self):
+        response = self.post("/save/?next=https://example.com/")
+        self.assertEqual(
+            response.json(), {"action": "redirect", "path": "https://example.com/"}
+        )
+
+    def test_redirect_to_unknown_path(self):
+        response = self.post("/save/?next=/does-not-exist/")
+        self.assertEqual(
+            response.json(), {"action": "redirect", "path": "/does-not-exist/"}
+        )
+
+    def test_redirect_to_non_bridge_view(self):
+        with mock.patch.object(
+            ColourChoicesView, "get", autospec=True, side_effect=ColourChoicesView.get
+        ) as get:
+            response = self.post("/save/?next=/choices/colours/")
+
+        self.assertNotIn("X-DjangoBridge-Path", response)
+        self.assertEqual(
+            response.json(), {"action": "redirect", "path": "/choices/colours/"}
+        )
+
+        # The view is only called when the client fetches it
+        get.assert_not_called()
+
+    def test_redirect_to_undecorated_function_view(self):
+        response = self.post("/save/?next=/balance/")
+        self.assertNotIn("X-DjangoBridge-Path", response)
+        self.assertEqual(response.json(), {"action": "redirect", "path": "/balance/"})
+
+    def test_redirect_chain(self):
+        # RedirectView isn't a Django Bridge view, so it isn't followed
+        response = self.post("/save/?next=/old-home/")
+        self.assertNotIn("X-DjangoBridge-Path", response)
+        self.assertEqual(response.json(), {"action": "redirect", "path": "/old-home/"})
+
+    def test_get_requests_not_followed(self):
+        response = self.client.get(
+            "/old-home/", headers={"X-Requested-With": "DjangoBridge"}
+        )
+        self.assertEqual(response.json(), {"action": "redirect", "path": "/"})
+
+    def test_full_page_requests_not_followed(self):
+        response = self.client.post("/save/")
+        self.assertEqual(response.status_code, 302)
+
+    @override_settings(
+        DJANGO_BRIDGE={"VITE_DEVSERVER_URL": "http://localhost:5173/static"}
+    )
+    def test_disabled_by_default(self):
+        response = self.post("/save/")
+        self.assertEqual(
+            response.json(), {"action": "redirect", "path": "/counter/1/?saved=1"}
+        )
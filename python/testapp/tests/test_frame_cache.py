@@ -0,0 +1,44 @@
+from django.test import TestCase, override_settings
+
+
+class TestFrameCache(TestCase):
+    def get(self, path):
+        return self.client.get(path, headers={"X-Requested-With": "DjangoBridge"})
+
+    def test_disabled_by_default(self):
+        response = self.get("/")
+        self.assertNotIn("X-DjangoBridge-Frame-Cache-Max-Age", response)
+
+    @override_settings(
+        DJANGO_BRIDGE={
+            "VITE_DEVSERVER_URL": "http://localhost:5173/static",
+            "FRAME_CACHE_MAX_AGE": 60,
+        }
+    )
+    def test_frame_cache_max_age(self):
+        response = self.get("/")
+        self.assertEqual(response["X-DjangoBridge-Frame-Cache-Max-Age"], "60")
+
+    def test_view_max_age(self):
+        response = self.get("/profile/")
+        self.assertEqual(response["X-DjangoBridge-Frame-Cache-Max-Age"], "120")
+
+    @override_settings(
+        DJANGO_BRIDGE={
+            "VITE_DEVSERVER_URL": "http://localhost:5173/static",
+            "FRAME_CACHE_MAX_AGE": 60,
+        }
+    )
+    def test_view_opts_out(self):
+        response = self.get("/balance/")
+        self.assertNotIn("X-DjangoBridge-Frame-Cache-Max-Age", response)
+
+    def test_not_sent_for_post_requests(self):
+        response = self.client.post(
+            "/profile/", headers={"X-Requested-With": "DjangoBridge"}
+        )
+        self.assertNotIn("X-DjangoBridge-Frame-Cache-Max-Age", response)
+
+    def test_not_sent_for_full_page_loads(self):
+        response = self.client.get("/profile/")
+        self.assertNotIn("X-DjangoBridge-Frame-Cache-Max-Age", response)
@@ -0,0 +1,104 @@
+import json
+import time
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+from django.contrib.auth.models import User
+from django.core import signing
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+
+from django_bridge.live import get_live_channels, get_live_token, publish
+
+
+@override_settings(
+    DJANGO_BRIDGE={
+        "VITE_DEVSERVER_URL": "http://localhost:5173/static",
+        "LIVE_STREAM_URL": "/live/",
+    }
+)
+class TestLive(TestCase):
+    def test_live_url(self):
+        response = self.client.get(
+            "/orders/", headers={"X-Requested-With": "DjangoBridge"}
+        )
+
+        url = urlsplit(response.json()["live"])
+        self.assertEqual(url.path, "/live/")
+        token = parse_qs(url.query)["token"][0]
+        self.assertEqual(get_live_channels(token), ["orders"])
+
+    def test_live_url_for_user(self):
+        user = User.objects.create(username="alice")
+        self.client.force_login(user)
+        response = self.client.get(
+            "/orders/", headers={"X-Requested-With": "DjangoBridge"}
+        )
+
+        token = parse_qs(urlsplit(response.json()["live"]).query)["token"][0]
+        self.assertEqual(get_live_channels(token, user), ["orders"])
+        with self.assertRaises(signing.BadSignature):
+            get_live_channels(token)
+
+    def test_no_channels(self):
+        response = self.client.get("/", headers={"X-Requested-With": "DjangoBridge"})
+        self.assertNotIn("live", response.json())
+
+    @override_settings(
+        DJANGO_BRIDGE={"VITE_DEVSERVER_URL": "http://localhost:5173/static"}
+    )
+    def test_live_stream_url_not_set(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self.client.get("/orders/", headers={"X-Requested-With": "DjangoBridge"})
+
+    async def get_stream(self, channels):
+        response = await self.async_client.get(
+            "/live/", {"token": get_live_token(channels)}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b"retry: 5000\n\n")
+        return stream
+
+    async def test_stream(self):
+        stream = await self.get_stream(["orders"])
+
+        publish("orders")
+        self.assertEqual(await anext(stream), b'data: {"channel":"orders"}\n\n')
+
+    async def test_stream_props(self):
+        stream = await self.get_stream(["orders"])
+
+        publish("orders", {"orders": ["Order 1"]})
+        event = await anext(stream)
+        self.assertTrue(event.startswith(b"data: "))
+        self.assertEqual(
+            json.loads(event[6:]),
+            {"channel": "orders", "props": {"orders": ["Order 1"]}},
+        )
+
+    async def test_token_for_another_user(self):
+        user = await User.objects.acreate(username="alice")
+        response = await self.async_client.get(
+            "/live/", {"token": get_live_token(["orders"], user)}
+        )
+        self.assertEqual(response.status_code, 403)
+
+        await self.async_client.aforce_login(user)
+        response = await self.async_client.get(
+            "/live/", {"token": get_live_token(["orders"], user)}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    async def test_expired_token(self):
+        token = get_live_token(["orders"])
+        with mock.patch("time.time", return_value=time.time() + 86401):
+            response = await self.async_client.get("/live/", {"token": token})
+
+        self.assertEqual(response.status_code, 403)
+
+    async def test_invalid_token(self):
+        response = await self.async_client.get("/live/", {"token": "invalid"})
+        self.assertEqual(response.status_code, 403)
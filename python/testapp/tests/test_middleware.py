@@ -0,0 +1,125 @@
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from django_bridge.conf import get_config
+
+
+class TestDjangoBridgeMiddleware(TestCase):
+    def test_json_response(self):
+        response = self.client.get("/", HTTP_X_REQUESTED_WITH="DjangoBridge")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-DjangoBridge-Action"], "render")
+
+        data = response.json()
+        self.assertEqual(data["view"], "Home")
+        self.assertEqual(data["props"], {"message": "Hello world!"})
+        self.assertIn("csrf_token", data["context"])
+
+    def test_html_response(self):
+        response = self.client.get("/")
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'id="initial-response"')
+        self.assertContains(response, "http://localhost:5173/static/@vite/client")
+
+
+class TestGetConfig(TestCase):
+    def test_config_is_reused(self):
+        self.assertIs(get_config(), get_config())
+
+    def test_config_is_reset_when_settings_change(self):
+        config = get_config()
+
+        with override_settings(
+            DJANGO_BRIDGE={"VITE_DEVSERVER_URL": "http://localhost:8080"}
+        ):
+            new_config = get_config()
+            self.assertIsNot(new_config, config)
+            self.assertEqual(new_config.vite_devserver_url, "http://localhost:8080")
+            self.assertEqual(new_config.context_providers, {})
+
+        self.assertEqual(get_config().vite_devserver_url, "http://localhost:5173/static")
+
+
+@override_settings(
+    DJANGO_BRIDGE={
+        "VITE_DEVSERVER_URL": "http://localhost:5173/static",
+        "PRECOMPILE_BOOTSTRAP_TEMPLATE": True,
+    }
+)
+class TestPrecompiledBootstrapTemplate(TestCase):
+    def test_html_response(self):
+        response = self.client.get("/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/html; charset=utf-8")
+        self.assertContains(response, 'id="initial-response"')
+        self.assertContains(response, '"props":{"message":"Hello world!"}')
+        self.assertContains(response, "http://localhost:5173/static/@vite/client")
+
+
+@override_settings(
+    DJANGO_BRIDGE={
+        "VITE_DEVSERVER_URL": "http://localhost:5173/static",
+        "STREAM_HTML": True,
+    }
+)
+class TestStreamedHTML(TestCase):
+    def test_html_response(self):
+        response = self.client.get("/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+
+        head, body = list(response.streaming_content)
+        self.assertIn(
+            b'<link href="http://localhost:5173/static/src/main.tsx" '
+            b'rel="modulepreload" />',
+            head,
+        )
+        self.assertTrue(
+            head.endswith(b'<script id="initial-response" type="application/json">')
+        )
+        self.assertIn(b'"props":{"message":"Hello world!"}', body)
+
+    @override_settings(
+        DJANGO_BRIDGE={
+            "VITE_DEVSERVER_URL": "http://localhost:5173/static",
+            "CONTEXT_PROVIDERS": {"csrf_token": "django.middleware.csrf.get_token"},
+            "STREAM_HTML": True,
+        }
+    )
+    def test_csrf_cookie_is_set(self):
+        response = self.client.get("/")
+        self.assertTrue(response.streaming)
+        self.assertIn(settings.CSRF_COOKIE_NAME, response.cookies)
+        self.assertIn(b'"csrf_token":"', b"".join(response.streaming_content))
+
+    def test_json_response_is_not_streamed(self):
+        response = self.client.get("/", HTTP_X_REQUESTED_WITH="DjangoBridge")
+        self.assertFalse(response.streaming)
+
+    async def test_async_html_response(self):
+        response = await self.async_client.get("/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertIn(b'"props":{"message":"Hello world!"}', content)
+
+
+@override_settings(
+    DJANGO_BRIDGE={
+        "VITE_DEVSERVER_URL": "http://localhost:5173/static",
+        "EARLY_HINTS": True,
+    }
+)
+class TestEarlyHints(TestCase):
+    def test_link_header(self):
+        response = self.client.get("/")
+        self.assertEqual(
+            response["Link"],
+            "<http://localhost:5173/static/@vite/client>; rel=modulepreload, "
+            "<http://localhost:5173/static/src/main.tsx>; rel=modulepreload",
+        )
+
+    def test_no_link_header_on_json_responses(self):
+        response = self.client.get("/", HTTP_X_REQUESTED_WITH="DjangoBridge")
+        self.assertNotIn("Link", response)
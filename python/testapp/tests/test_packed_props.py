@@ -0,0 +1,41 @@
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import RequestFactory, TestCase
+
+from django_bridge.response import Deferred, Lazy
+from django_bridge.singleflight import calls
+from testapp.views import CatalogueView, StatsView
+
+
+class TestPackedPropsMixin(TestCase):
+    def setUp(self):
+        cache.clear()
+        calls.results.clear()
+
+    def get_request(self, path):
+        request = RequestFactory().get(path)
+        request.user = AnonymousUser()
+        return request
+
+    def test_single_flight_rejects_lazy_props(self):
+        for marker in [Lazy, Deferred]:
+            with self.subTest(marker=marker):
+
+                class LazyStatsView(StatsView):
+                    def get_context_data(self, **kwargs):
+                        return {"users": marker(User.objects.count)}
+
+                with self.assertRaises(ImproperlyConfigured):
+                    LazyStatsView.as_view()(self.get_request("/stats/"))
+
+    def test_cached_props_rejects_lazy_props(self):
+        for marker in [Lazy, Deferred]:
+            with self.subTest(marker=marker):
+
+                class LazyCatalogueView(CatalogueView):
+                    def get_context_data(self, **kwargs):
+                        return {"products": marker(User.objects.count)}
+
+                with self.assertRaises(ImproperlyConfigured):
+                    LazyCatalogueView.as_view()(self.get_request("/catalogue/"))
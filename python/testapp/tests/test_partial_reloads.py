@@ -0,0 +1,78 @@
+from django.test import RequestFactory, TestCase
+
+from django_bridge.response import Response
+
+
+class TestPartialReloads(TestCase):
+    def get(self, **headers):
+        return self.client.get(
+            "/dashboard/", headers={"X-Requested-With": "DjangoBridge", **headers}
+        ).json()
+
+    def test_lazy_props_are_called(self):
+        data = self.get()
+        self.assertEqual(
+            data["props"],
+            {
+                "title": "Dashboard",
+                "stats": {"users": 0},
+                "alerts": ["Disk space low"],
+            },
+        )
+        self.assertNotIn("partial", data)
+
+    def test_other_callables_are_not_called(self):
+        request = RequestFactory().get("/")
+        response = Response(request, "Dashboard", {"format": str.upper})
+        self.assertIs(response.get_props()["format"], str.upper)
+
+    def test_only(self):
+        with self.assertNumQueries(0):
+            data = self.get(
+                **{"X-DjangoBridge-Only": "alerts", "X-DjangoBridge-View": "Dashboard"}
+            )
+
+        self.assertEqual(data["props"], {"alerts": ["Disk space low"]})
+        self.assertTrue(data["partial"])
+
+    def test_only_multiple(self):
+        data = self.get(
+            **{
+                "X-DjangoBridge-Only": "title, stats",
+                "X-DjangoBridge-View": "Dashboard",
+            }
+        )
+        self.assertEqual(data["props"], {"title": "Dashboard", "stats": {"users": 0}})
+
+    def test_only_is_ignored_for_other_views(self):
+        data = self.get(
+            **{"X-DjangoBridge-Only": "alerts", "X-DjangoBridge-View": "Home"}
+        )
+        self.assertEqual(len(data["props"]), 3)
+        self.assertNotIn("partial", data)
+
+
+class TestDeferredProps(TestCase):
+    def get(self, **headers):
+        return self.client.get(
+            "/report/", headers={"X-Requested-With": "DjangoBridge", **headers}
+        ).json()
+
+    def test_deferred_props_are_not_sent(self):
+        with self.assertNumQueries(0):
+            data = self.get()
+
+        self.assertEqual(data["props"], {"title": "Report"})
+        self.assertEqual(data["deferred"], ["total", "chart"])
+
+    def test_deferred_props_in_html_response(self):
+        response = self.client.get("/report/")
+        self.assertContains(response, '"deferred":["total","chart"]')
+
+    def test_fetch_deferred_props(self):
+        data = self.get(
+            **{"X-DjangoBridge-Only": "total,chart", "X-DjangoBridge-View": "Report"}
+        )
+        self.assertEqual(data["props"], {"total": 0, "chart": [0]})
+        self.assertTrue(data["partial"])
+        self.assertNotIn("deferred", data)
@@ -0,0 +1,53 @@
+from django.test import TestCase, override_settings
+
+
+class TestPrefetch(TestCase):
+    def get(self, path, **headers):
+        return self.client.get(
+            path, headers={"X-Requested-With": "DjangoBridge", **headers}
+        )
+
+    def test_prefetch_leaves_messages(self):
+        self.get("/add-message/")
+
+        response = self.get("/", **{"X-DjangoBridge-Purpose": "prefetch"})
+        self.assertEqual(response.json()["messages"], [])
+
+        response = self.get("/")
+        self.assertEqual(
+            response.json()["messages"], [{"level": "success", "html": "Saved"}]
+        )
+
+    def test_prefetch_pending_messages(self):
+        response = self.get("/", **{"X-DjangoBridge-Purpose": "prefetch"})
+        self.assertNotIn("X-DjangoBridge-Pending-Messages", response)
+
+        self.get("/add-message/")
+
+        response = self.get("/", **{"X-DjangoBridge-Purpose": "prefetch"})
+        self.assertEqual(response["X-DjangoBridge-Pending-Messages"], "1")
+
+        # The header doesn't consume the messages
+        response = self.get("/")
+        self.assertEqual(
+            response.json()["messages"], [{"level": "success", "html": "Saved"}]
+        )
+        self.assertNotIn("X-DjangoBridge-Pending-Messages", response)
+
+    def test_prefetch_ttl(self):
+        response = self.get("/", **{"X-DjangoBridge-Purpose": "prefetch"})
+        self.assertEqual(response["X-DjangoBridge-Prefetch-TTL"], "30")
+
+    @override_settings(
+        DJANGO_BRIDGE={
+            "VITE_DEVSERVER_URL": "http://localhost:5173/static",
+            "PREFETCH_TTL": 5,
+        }
+    )
+    def test_custom_prefetch_ttl(self):
+        response = self.get("/", **{"X-DjangoBridge-Purpose": "prefetch"})
+        self.assertEqual(response["X-DjangoBridge-Prefetch-TTL"], "5")
+
+    def test_not_prefetch(self):
+        response = self.get("/")
+        self.assertNotIn("X-DjangoBridge-Prefetch-TTL", response)
@@ -0,0 +1,74 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+
+@override_settings(
+    DJANGO_BRIDGE={
+        "VITE_DEVSERVER_URL": "http://localhost:5173/static",
+        "PROPS_DIFF_CACHE": "default",
+    }
+)
+class TestPropsDiff(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def get(self, path, props_version=None):
+        headers = {"X-Requested-With": "DjangoBridge"}
+        if props_version:
+            headers["X-DjangoBridge-Props-Version"] = props_version
+
+        return self.client.get(path, headers=headers).json()
+
+    def test_full_props_are_sent_with_version(self):
+        data = self.get("/counter/1/")
+        self.assertEqual(data["props"], {"count": 1, "message": "Hello world!"})
+        self.assertTrue(data["propsVersion"])
+        self.assertNotIn("propsPatch", data)
+
+    def test_unchanged(self):
+        version = self.get("/counter/1/")["propsVersion"]
+
+        data = self.get("/counter/1/", version)
+        self.assertIsNone(data["props"])
+        self.assertEqual(data["propsPatch"], [])
+        self.assertEqual(data["propsVersion"], version)
+
+    def test_props_are_only_cached_when_refreshed(self):
+        version = self.get("/counter/1/")["propsVersion"]
+        self.assertIsNone(cache.get(f"django_bridge:props:{version}"))
+
+        # The first refresh gets the full props as they weren't cached
+        data = self.get("/counter/1/", "unknown")
+        self.assertEqual(data["props"], {"count": 1, "message": "Hello world!"})
+        self.assertIsNotNone(cache.get(f"django_bridge:props:{version}"))
+
+    def test_unchanged_props_stay_cached(self):
+        version = self.get("/counter/1/", "unknown")["propsVersion"]
+
+        with mock.patch.object(cache, "touch") as touch:
+            self.get("/counter/1/", version)
+
+        touch.assert_called_once_with(f"django_bridge:props:{version}", 300)
+
+    def test_patch(self):
+        version = self.get("/counter/1/", "unknown")["propsVersion"]
+
+        data = self.get("/counter/2/", version)
+        self.assertIsNone(data["props"])
+        self.assertEqual(
+            data["propsPatch"], [{"op": "replace", "path": "/count", "value": 2}]
+        )
+        self.assertNotEqual(data["propsVersion"], version)
+
+    def test_unknown_version(self):
+        data = self.get("/counter/1/", "unknown")
+        self.assertEqual(data["props"], {"count": 1, "message": "Hello world!"})
+
+    @override_settings(
+        DJANGO_BRIDGE={"VITE_DEVSERVER_URL": "http://localhost:5173/static"}
+    )
+    def test_disabled_by_default(self):
+        data = self.get("/counter/1/")
+        self.assertNotIn("propsVersion", data)
@@ -0,0 +1,80 @@
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+
+
+class TestRemoteChoicesView(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create(username=username, email=f"{username}@example.com")
+            for username in ["alice", "bob", "carol", "dave"]
+        ]
+
+    def test_first_page(self):
+        response = self.client.get("/choices/users/")
+        self.assertEqual(
+            response.json(),
+            {
+                "results": [
+                    {"value": self.users[0].pk, "label": "alice"},
+                    {"value": self.users[1].pk, "label": "bob"},
+                ],
+                "more": True,
+            },
+        )
+
+    def test_last_page(self):
+        response = self.client.get("/choices/users/?page=2")
+        data = response.json()
+        self.assertEqual(
+            [choice["label"] for choice in data["results"]], ["carol", "dave"]
+        )
+        self.assertFalse(data["more"])
+
+    def test_search(self):
+        response = self.client.get("/choices/users/?q=CA")
+        data = response.json()
+        self.assertEqual([choice["label"] for choice in data["results"]], ["carol"])
+
+    def test_values(self):
+        response = self.client.get(
+            f"/choices/users/?value={self.users[3].pk}&value={self.users[1].pk}"
+        )
+        data = response.json()
+        self.assertEqual(
+            [choice["label"] for choice in data["results"]], ["bob", "dave"]
+        )
+
+    def test_invalid_values(self):
+        response = self.client.get("/choices/users/?value=foo")
+        self.assertEqual(response.json(), {"results": [], "more": False})
+
+    def test_choices(self):
+        response = self.client.get("/choices/colours/?q=re")
+        self.assertEqual(
+            response.json(),
+            {
+                "results": [
+                    {"value": "red", "label": "Red"},
+                    {"value": "green", "label": "Green"},
+                ],
+                "more": False,
+            },
+        )
+
+    def test_has_permission(self):
+        response = self.client.get("/choices/staff-users/")
+        self.assertEqual(response.status_code, 403)
+
+        staff = User.objects.create(username="staff", is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get("/choices/staff-users/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_search_without_search_fields(self):
+        response = self.client.get("/choices/unsearchable-users/")
+        self.assertEqual(len(response.json()["results"]), 4)
+
+        with self.assertRaises(ImproperlyConfigured):
+            self.client.get("/choices/unsearchable-users/?q=bob")
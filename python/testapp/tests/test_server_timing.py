@@ -0,0 +1,106 @@
+from django.test import TestCase, override_settings
+
+from django_bridge.signals import response_timed
+from django_bridge.timing import Timings
+
+
+@override_settings(
+    DJANGO_BRIDGE={
+        "VITE_DEVSERVER_URL": "http://localhost:5173/static",
+        "CONTEXT_PROVIDERS": {"csrf_token": "django.middleware.csrf.get_token"},
+        "SERVER_TIMING": True,
+    }
+)
+class TestServerTiming(TestCase):
+    def get_metric_names(self, response):
+        return [
+            metric.split(";")[0].strip()
+            for metric in response["Server-Timing"].split(",")
+        ]
+
+    def test_json_response(self):
+        response = self.client.get("/", HTTP_X_REQUESTED_WITH="DjangoBridge")
+        self.assertEqual(
+            self.get_metric_names(response),
+            [
+                "messages",
+                "view",
+                "props",
+                "context-csrf_token",
+                "context",
+                "pack",
+                "json",
+            ],
+        )
+
+    def test_html_response(self):
+        response = self.client.get("/")
+        self.assertEqual(
+            self.get_metric_names(response),
+            [
+                "messages",
+                "view",
+                "props",
+                "context-csrf_token",
+                "context",
+                "pack",
+                "json",
+                "template",
+            ],
+        )
+
+    async def test_async_response(self):
+        response = await self.async_client.get(
+            "/", headers={"X-Requested-With": "DjangoBridge"}
+        )
+        self.assertIn("async-context", self.get_metric_names(response))
+        self.assertIn("context-csrf_token", self.get_metric_names(response))
+
+    def test_signal(self):
+        received = []
+
+        def handler(*, request, response, timings, **kwargs):
+            received.append(timings.as_dict())
+
+        response_timed.connect(handler)
+        try:
+            self.client.get("/", HTTP_X_REQUESTED_WITH="DjangoBridge")
+        finally:
+            response_timed.disconnect(handler)
+
+        self.assertEqual(len(received), 1)
+        self.assertIn("view", received[0])
+        self.assertIn("pack", received[0])
+
+    @override_settings(
+        DJANGO_BRIDGE={
+            "VITE_DEVSERVER_URL": "http://localhost:5173/static",
+            "SERVER_TIMING": True,
+            "SERVER_TIMING_HEADER": False,
+        }
+    )
+    def test_header_disabled(self):
+        response = self.client.get("/", HTTP_X_REQUESTED_WITH="DjangoBridge")
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(
+        DJANGO_BRIDGE={"VITE_DEVSERVER_URL": "http://localhost:5173/static"}
+    )
+    def test_disabled_by_default(self):
+        response = self.client.get("/", HTTP_X_REQUESTED_WITH="DjangoBridge")
+        self.assertNotIn("Server-Timing", response)
+
+
+class TestTimings(TestCase):
+    def test_header_sanitizes_names(self):
+        timings = Timings()
+        timings.add("context-user name", 1, 'Context provider: user "name"')
+        timings.add("context-café;x=1", 2)
+        timings.add("context-site.settings", 3)
+
+        self.assertEqual(
+            timings.as_header(),
+            'context-user_name;dur=1.0;desc="Context provider: user \\"name\\"", '
+            "context-caf__x_1;dur=2.0, "
+            "context-site.settings;dur=3.0",
+        )
@@ -0,0 +1,55 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import translation
+
+from django_bridge.singleflight import calls
+from testapp.views import StatsView
+
+
+class TestSingleFlightMixin(TestCase):
+    def setUp(self):
+        calls.results.clear()
+        StatsView.builds = 0
+
+    def get(self, path):
+        return self.client.get(path, headers={"X-Requested-With": "DjangoBridge"})
+
+    def test_props_are_shared(self):
+        response = self.get("/stats/")
+        self.assertEqual(response.json()["props"], {"users": 0, "page": None})
+
+        User.objects.create(username="admin")
+
+        # The props from the first request are reused
+        response = self.get("/stats/")
+        self.assertEqual(response.json()["props"], {"users": 0, "page": None})
+        self.assertEqual(StatsView.builds, 1)
+
+    def test_query_string_is_part_of_key(self):
+        self.get("/stats/")
+        response = self.get("/stats/?page=2")
+
+        self.assertEqual(response.json()["props"], {"users": 0, "page": "2"})
+        self.assertEqual(StatsView.builds, 2)
+
+    @override_settings(LANGUAGES=[("en", "English"), ("fr", "French")])
+    def test_language_is_part_of_key(self):
+        self.get("/stats/")
+        with translation.override("fr"):
+            self.get("/stats/")
+
+        self.assertEqual(StatsView.builds, 2)
+
+    def test_messages_are_not_shared(self):
+        self.get("/stats/")
+        self.client.get("/add-message/")
+
+        response = self.get("/stats/")
+        self.assertEqual(
+            response.json()["messages"], [{"level": "success", "html": "Saved"}]
+        )
+
+    def test_full_page_load(self):
+        response = self.client.get("/stats/")
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '"props":{"users":0,"page":null}')
@@ -0,0 +1,96 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase, override_settings
+
+MANIFEST = {
+    "src/main.tsx": {
+        "file": "assets/main.js",
+        "src": "src/main.tsx",
+        "isEntry": True,
+        "imports": ["_shared.js"],
+        "dynamicImports": ["src/views/Home.tsx"],
+        "css": ["assets/main.css"],
+    },
+    "_shared.js": {
+        "file": "assets/shared.js",
+    },
+    "_charts.js": {
+        "file": "assets/charts.js",
+        "css": ["assets/charts.css"],
+    },
+    "src/views/Home.tsx": {
+        "file": "assets/Home.js",
+        "src": "src/views/Home.tsx",
+        "isDynamicEntry": True,
+        "imports": ["_shared.js", "_charts.js"],
+        "css": ["assets/Home.css"],
+    },
+}
+
+
+class TestViewChunks(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tempdir = tempfile.TemporaryDirectory()
+        bundle_dir = Path(cls.tempdir.name)
+        (bundle_dir / ".vite").mkdir()
+        (bundle_dir / ".vite/manifest.json").write_text(json.dumps(MANIFEST))
+
+        cls.enterClassContext(
+            override_settings(
+                DJANGO_BRIDGE={
+                    "VITE_BUNDLE_DIR": cls.tempdir.name,
+                    "VIEW_CHUNKS": "src/views/{view}.tsx",
+                    "EARLY_HINTS": True,
+                }
+            )
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.tempdir.cleanup()
+
+    def test_html_response_preloads_view_chunk(self):
+        response = self.client.get("/")
+        self.assertContains(
+            response, '<link href="/static/assets/Home.css" rel="stylesheet" />'
+        )
+        self.assertContains(
+            response, '<link href="/static/assets/Home.js" rel="modulepreload" />'
+        )
+        self.assertContains(
+            response, '<link href="/static/assets/charts.js" rel="modulepreload" />'
+        )
+
+        # Shared chunks are only preloaded once
+        self.assertContains(
+            response,
+            '<link href="/static/assets/shared.js" rel="modulepreload" />',
+            count=1,
+        )
+
+        self.assertIn("</static/assets/Home.js>; rel=modulepreload", response["Link"])
+
+    def test_json_response_includes_view_assets(self):
+        response = self.client.get("/", HTTP_X_REQUESTED_WITH="DjangoBridge")
+        self.assertEqual(
+            response.json()["assets"],
+            {
+                "js": [
+                    "/static/assets/Home.js",
+                    "/static/assets/shared.js",
+                    "/static/assets/charts.js",
+                ],
+                "css": ["/static/assets/Home.css", "/static/assets/charts.css"],
+            },
+        )
+
+    def test_unknown_view(self):
+        response = self.client.get(
+            "/counter/1/", HTTP_X_REQUESTED_WITH="DjangoBridge"
+        )
+        self.assertNotIn("assets", response.json())
@@ -1,6 +1,32 @@
 from django.contrib import admin
 from django.urls import path
+from django.views.generic import RedirectView
+
+from django_bridge.views import BatchView, LiveStreamView
+
+from . import views
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("", views.home, name="home"),
+    path("add-message/", views.add_message),
+    path("counter/<int:count>/", views.counter),
+    path("dashboard/", views.dashboard),
+    path("report/", views.report),
+    path("profile/", views.profile),
+    path("balance/", views.balance),
+    path("orders/", views.orders),
+    path("unpackable/", views.unpackable),
+    path("stats/", views.StatsView.as_view()),
+    path("catalogue/", views.CatalogueView.as_view()),
+    path("live/", LiveStreamView.as_view()),
+    path("save/", views.save),
+    path("old-home/", RedirectView.as_view(url="/")),
+    path("batch/", BatchView.as_view()),
+    path("choices/users/", views.UserChoicesView.as_view()),
+    path("choices/staff-users/", views.StaffUserChoicesView.as_view()),
+    path(
+        "choices/unsearchable-users/", views.UnsearchableUserChoicesView.as_view()
+    ),
+    path("choices/colours/", views.ColourChoicesView.as_view()),
 ]
@@ -0,0 +1,124 @@
+from django.contrib import messages
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.shortcuts import redirect
+
+from django_bridge.response import Deferred, Lazy, Response, bridge_view
+from django_bridge.views import (
+    CachedPropsMixin,
+    DjangoBridgeView,
+    RemoteChoicesView,
+    SingleFlightMixin,
+)
+
+
+@bridge_view
+def home(request):
+    return Response(request, "Home", {"message": "Hello world!"})
+
+
+def add_message(request):
+    messages.success(request, "Saved")
+    return HttpResponse(status=204)
+
+
+@bridge_view
+def counter(request, count):
+    return Response(request, "Counter", {"count": count, "message": "Hello world!"})
+
+
+@bridge_view
+def dashboard(request):
+    def get_stats():
+        return {"users": User.objects.count()}
+
+    def get_alerts():
+        return ["Disk space low"]
+
+    return Response(
+        request,
+        "Dashboard",
+        {"title": "Dashboard", "stats": Lazy(get_stats), "alerts": Lazy(get_alerts)},
+    )
+
+
+def report(request):
+    def get_chart():
+        return [User.objects.count()]
+
+    return Response(
+        request,
+        "Report",
+        {
+            "title": "Report",
+            "total": Deferred(lambda: User.objects.count()),
+            "chart": Deferred(get_chart),
+        },
+    )
+
+
+@bridge_view
+def profile(request):
+    return Response(
+        request, "Profile", {"username": "admin"}, frame_cache_max_age=120
+    )
+
+
+def balance(request):
+    # Always show the latest balance, even on back/forward navigation
+    return Response(request, "Balance", {"balance": 100}, frame_cache_max_age=0)
+
+
+def unpackable(request):
+    return Response(request, "Unpackable", {"value": object()})
+
+
+def orders(request):
+    return Response(request, "Orders", {"orders": []}, channels=["orders"])
+
+
+def save(request):
+    messages.success(request, "Saved")
+    return redirect(request.GET.get("next", "/counter/1/?saved=1"))
+
+
+class StatsView(SingleFlightMixin, DjangoBridgeView):
+    view_name = "Stats"
+    # The number of times the props have been built
+    builds = 0
+
+    def get_context_data(self, **kwargs):
+        StatsView.builds += 1
+        return {"users": User.objects.count(), "page": self.request.GET.get("page")}
+
+
+class CatalogueView(CachedPropsMixin, DjangoBridgeView):
+    view_name = "Catalogue"
+    # The number of times the props have been built
+    builds = 0
+
+    def get_cache_vary_key(self):
+        return self.request.user.is_authenticated
+
+    def get_context_data(self, **kwargs):
+        CatalogueView.builds += 1
+        return {"products": User.objects.count()}
+
+
+class UserChoicesView(RemoteChoicesView):
+    queryset = User.objects.all()
+    search_fields = ["^username", "email"]
+    paginate_by = 2
+
+
+class StaffUserChoicesView(UserChoicesView):
+    def has_permission(self):
+        return self.request.user.is_staff
+
+
+class UnsearchableUserChoicesView(RemoteChoicesView):
+    queryset = User.objects.all()
+
+
+class ColourChoicesView(RemoteChoicesView):
+    choices = [("red", "Red"), ("green", "Green"), ("blue", "Blue")]
@@ -0,0 +1,35 @@
+import { formSchemas } from "@django-bridge/react";
+import FormDef from "./Form";
+import FieldDef from "./Field";
+
+export default class CompiledFormDef extends FormDef {
+  constructor(
+    schemaHash: string,
+    schema: (FieldDef | null)[] | null,
+    values: unknown[],
+    errors: FormDef["errors"]
+  ) {
+    // The schema is only sent if we haven't received it before
+    if (schema) {
+      formSchemas.set(schemaHash, schema);
+    }
+
+    const fields = (formSchemas.get(schemaHash) as (FieldDef | null)[]).map(
+      (field, fieldIndex) =>
+        field
+          ? new FieldDef(
+              field.name,
+              field.label,
+              field.required,
+              field.disabled,
+              field.widget,
+              field.helpText,
+              values[fieldIndex] as string
+            )
+          : // Server rendered fields are sent in full with the values
+            (values[fieldIndex] as FieldDef)
+    );
+
+    super(fields, errors);
+  }
+}
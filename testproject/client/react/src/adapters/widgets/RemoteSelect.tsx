@@ -0,0 +1,36 @@
+import { ReactElement } from "react";
+import { WidgetDef } from "./base";
+import RemoteSelect from "../../components/RemoteSelect";
+
+export default class RemoteSelectDef implements WidgetDef {
+  url: string;
+
+  multiple: boolean;
+
+  className: string;
+
+  constructor(url: string, multiple: boolean, className: string) {
+    this.url = url;
+    this.multiple = multiple;
+    this.className = className;
+  }
+
+  render(
+    id: string,
+    name: string,
+    disabled: boolean,
+    value: string
+  ): ReactElement {
+    return (
+      <RemoteSelect
+        id={id}
+        name={name}
+        url={this.url}
+        multiple={this.multiple}
+        disabled={disabled}
+        className={this.className}
+        value={value}
+      />
+    );
+  }
+}
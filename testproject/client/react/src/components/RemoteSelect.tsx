@@ -0,0 +1,127 @@
+import { ReactElement, useEffect, useState } from "react";
+
+interface Choice {
+  value: string;
+  label: string;
+}
+
+interface ChoicesPage {
+  results: Choice[];
+  more: boolean;
+}
+
+async function fetchChoices(
+  url: string,
+  params: [string, string][]
+): Promise<ChoicesPage> {
+  const response = await fetch(
+    `${url}?${new URLSearchParams(params).toString()}`
+  );
+  return response.json();
+}
+
+export interface RemoteSelectProps {
+  id: string;
+  name: string;
+  url: string;
+  multiple: boolean;
+  disabled: boolean;
+  className: string;
+  value: string | string[] | null;
+}
+
+export default function RemoteSelect({
+  id,
+  name,
+  url,
+  multiple,
+  disabled,
+  className,
+  value,
+}: RemoteSelectProps): ReactElement {
+  const [selected, setSelected] = useState<Choice[]>([]);
+  const [choices, setChoices] = useState<Choice[]>([]);
+  const [search, setSearch] = useState("");
+  const [page, setPage] = useState(1);
+  const [more, setMore] = useState(false);
+
+  // Fetch the labels of the initially selected choices
+  useEffect(() => {
+    const values = (Array.isArray(value) ? value : [value]).filter(
+      (v) => v !== null && v !== ""
+    );
+    if (values.length > 0) {
+      fetchChoices(
+        url,
+        values.map((v) => ["value", `${v}`])
+      ).then((data) => setSelected(data.results));
+    }
+  }, [url, value]);
+
+  // Fetch the choices that match the search term
+  useEffect(() => {
+    fetchChoices(url, [
+      ["q", search],
+      ["page", `${page}`],
+    ]).then((data) => {
+      setChoices((current) =>
+        page === 1 ? data.results : [...current, ...data.results]
+      );
+      setMore(data.more);
+    });
+  }, [url, search, page]);
+
+  // Keep the selected choices in the list, even if they don't match the search
+  const options = [
+    ...selected,
+    ...choices.filter(
+      (choice) => !selected.some((s) => `${s.value}` === `${choice.value}`)
+    ),
+  ];
+
+  return (
+    <>
+      <input
+        type="search"
+        value={search}
+        disabled={disabled}
+        onChange={(e) => {
+          setSearch(e.target.value);
+          setPage(1);
+        }}
+      />
+      <select
+        id={id}
+        name={name}
+        multiple={multiple}
+        disabled={disabled}
+        className={className}
+        value={
+          multiple
+            ? selected.map((choice) => `${choice.value}`)
+            : `${selected[0]?.value ?? ""}`
+        }
+        onChange={(e) => {
+          const values = Array.from(e.target.selectedOptions).map(
+            (option) => option.value
+          );
+          setSelected(
+            options.filter((choice) => values.includes(`${choice.value}`))
+          );
+        }}
+      >
+        {!multiple && <option value="">---------</option>}
+        {options.map((choice) => (
+          <option key={choice.value} value={choice.value}>
+            {choice.label}
+          </option>
+        ))}
+      </select>
+      {more && (
+        <button type="button" onClick={() => setPage(page + 1)}>
+          Load more
+        </button>
+      )}
+    </>
+  );
+}
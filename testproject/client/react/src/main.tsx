@@ -7,10 +7,12 @@ import HomeView from "./views/Home";
 import NavigationView from "./views/Navigation";
 import { CSRFTokenContext } from "./contexts";
 import FormDef from "./adapters/Form";
+import CompiledFormDef from "./adapters/CompiledForm";
 import FieldDef from "./adapters/Field";
 import ServerRenderedFieldDef from "./adapters/ServerRenderedField";
 import TextInputDef from "./adapters/widgets/TextInput";
 import SelectDef from "./adapters/widgets/Select";
+import RemoteSelectDef from "./adapters/widgets/RemoteSelect";
 
 const config = new DjangoBridge.Config();
 
@@ -23,10 +25,12 @@ config.addContextProvider("csrf_token", CSRFTokenContext);
 
 // Add your adapters here
 config.addAdapter("forms.Form", FormDef);
+config.addAdapter("forms.CompiledForm", CompiledFormDef);
 config.addAdapter("forms.Field", FieldDef);
 config.addAdapter("forms.ServerRenderedField", ServerRenderedFieldDef);
 config.addAdapter("forms.TextInput", TextInputDef);
 config.addAdapter("forms.Select", SelectDef);
+config.addAdapter("forms.RemoteSelect", RemoteSelectDef);
 
 const rootElement = document.getElementById("root")!;
 const initialResponse = JSON.parse(